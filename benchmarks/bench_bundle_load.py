@@ -0,0 +1,95 @@
+"""Load time and parity of a saved artifacts bundle.
+
+    python -m waterpotability train --models rf xgb hybrid --save artifacts
+    python -m benchmarks.bench_bundle_load --artifacts artifacts --data water_potability.csv
+
+Loads every saved model (natively, and as compiled arrays where the bundle
+has them) in a fresh interpreter each, and reports the time to import the
+package, to load the bundle and to score the first sample, along with the
+frameworks the load pulled in. Then checks that compiled tree models and
+the NumPy scaler reproduce the fitted estimators on ``--data``; exits with
+status 1 on a mismatch.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import warnings
+
+import numpy as np
+
+from waterpotability.data import INPUT_COLS, load_dataset
+from waterpotability.persistence import load_artifacts, load_model, read_manifest
+from waterpotability.preprocessing import MinMaxTransform
+
+TOLERANCE = 1e-5
+
+FRAMEWORKS = ('sklearn', 'xgboost', 'tensorflow')
+
+
+def probe(artifacts, key, compiled):
+    # A fresh interpreter per load, so import costs are not hidden by earlier loads
+    code = f'''
+import json, sys, time
+start = time.perf_counter()
+from waterpotability.persistence import load_artifacts
+imported = time.perf_counter()
+imputer, scaler, model = load_artifacts({artifacts!r}, {key!r}, compiled={compiled})
+loaded = time.perf_counter()
+import numpy as np
+X = scaler.transform(np.full((1, {len(INPUT_COLS)}), 0.5, dtype=np.float32))
+# The SVMs have no probabilities, as in score and serve
+model.predict_proba(X) if hasattr(model, 'predict_proba') else model.predict(X)
+scored = time.perf_counter()
+print(json.dumps({{'import_ms': (imported - start) * 1e3, 'load_ms': (loaded - imported) * 1e3,
+                  'first_predict_ms': (scored - loaded) * 1e3,
+                  'frameworks': [m for m in {FRAMEWORKS!r} if m in sys.modules]}}))
+'''
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--artifacts', default='artifacts')
+    parser.add_argument('--data', default='water_potability.csv')
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    manifest = read_manifest(args.artifacts)
+    print(f"{'model':<14}{'import ms':>10}{'load ms':>10}{'1st predict ms':>16}  frameworks")
+    for key, entry in manifest['models'].items():
+        for compiled in ([False, True] if 'compiled' in entry else [False]):
+            t = probe(args.artifacts, key, compiled)
+            label = key + (' (compiled)' if compiled else '')
+            print(f"{label:<14}{t['import_ms']:>10.1f}{t['load_ms']:>10.1f}{t['first_predict_ms']:>16.1f}  "
+                  f"{', '.join(t['frameworks']) or '-'}")
+
+    from sklearn.preprocessing import MinMaxScaler
+
+    imputer, scaler, _ = load_artifacts(args.artifacts, next(iter(manifest['models'])))
+    raw = imputer.transform(load_dataset(args.data))[INPUT_COLS].to_numpy(np.float32)
+    failed = False
+    # The bundle's scaler was fitted on the full imputed dataset, as here
+    reference = MinMaxScaler().fit(raw)
+    X = scaler.transform(raw)
+    if not np.array_equal(X, reference.transform(raw)):
+        print('scaler mismatch: MinMaxTransform differs from MinMaxScaler')
+        failed = True
+    if not np.array_equal(X, MinMaxTransform.from_scaler(reference).transform(raw)):
+        print('scaler mismatch: saved scaler differs from a refit on --data')
+        failed = True
+    for key, entry in manifest['models'].items():
+        if 'compiled' not in entry:
+            continue
+        native = load_model(args.artifacts, key).predict_proba(X)[:, 1]
+        compiled = load_model(args.artifacts, key, compiled=True).predict_proba(X)[:, 1]
+        error = np.abs(native - compiled).max()
+        print(f'{key}: max |native - compiled| = {error:.2e}')
+        failed |= error > TOLERANCE
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Accuracy and speed of the streaming EDA statistics against pandas on the whole frame.
+
+    python -m benchmarks.bench_eda --data water_potability.csv
+    python -m benchmarks.bench_eda --rows 5000000 --chunksize 500000
+
+Writes ``--rows`` synthetic rows (``synthetic.SyntheticGenerator`` fitted to
+``--data``) to a temporary Parquet file, then computes the EDA tables once
+with pandas (load the file, ``describe()``, ``corr()`` for each of the two
+correlation plots) and once with ``eda.stats_from_file`` in blocks. Exits
+with status 1 when the correlations, means or standard deviations differ by
+more than ``TOLERANCE`` or a quartile is off by more than the sketch's rank
+error.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from waterpotability.data import load_dataset
+from waterpotability.eda import DEFAULT_EPSILON, stats_from_file
+from waterpotability.synthetic import SyntheticGenerator, write_synthetic
+
+TOLERANCE = 1e-6
+
+
+def _measure(compute):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = compute()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='water_potability.csv')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    args = parser.parse_args(argv)
+
+    generator = SyntheticGenerator().fit(load_dataset(args.data))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'history.parquet')
+        write_synthetic(generator, path, args.rows, args.chunksize)
+
+        def with_pandas():
+            frame = pd.read_parquet(path).astype(np.float64)
+            return frame, frame.describe(), frame.corr(), frame.corr()
+
+        (frame, summary, corr, _), pandas_time, pandas_peak = _measure(with_pandas)
+        stats, stream_time, stream_peak = _measure(
+            lambda: stats_from_file(path, chunksize=args.chunksize, cache_dir=None))
+
+        errors = {
+            'correlation': np.abs(stats.correlation() - corr).max().max(),
+            'mean / std': (np.abs(stats.mean() - summary.loc['mean']) / summary.loc['std']).max(),
+            'std (relative)': (np.abs(stats.std() - summary.loc['std']) / summary.loc['std']).max(),
+        }
+        # Rank error of the sketched quartiles, as a fraction of the non-null values
+        ranks = []
+        for q in (0.25, 0.5, 0.75):
+            estimate = stats.quantile(q)
+            for column in frame:
+                values = np.sort(frame[column].dropna().to_numpy())
+                # A tied value covers a range of ranks
+                low = np.searchsorted(values, estimate[column], side='left')
+                high = np.searchsorted(values, estimate[column], side='right')
+                ranks.append(max(0, low / len(values) - q, q - high / len(values)))
+
+    failed = False
+    print(f"{'statistic':<18}{'max error':>12}{'tolerance':>12}")
+    for name, error in errors.items():
+        failed |= error > TOLERANCE
+        print(f"{name:<18}{error:>12.2e}{TOLERANCE:>12.0e}{'' if error <= TOLERANCE else '  FAIL'}")
+    rank_error = max(ranks)
+    failed |= rank_error > DEFAULT_EPSILON
+    print(f"{'quartile rank':<18}{rank_error:>12.2e}{DEFAULT_EPSILON:>12.0e}"
+          f"{'' if rank_error <= DEFAULT_EPSILON else '  FAIL'}")
+
+    print(f'\n{"":<10}{"seconds":>9}{"peak MiB":>10}')
+    print(f'{"pandas":<10}{pandas_time:>9.2f}{pandas_peak:>10.0f}')
+    print(f'{"streaming":<10}{stream_time:>9.2f}{stream_peak:>10.0f}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
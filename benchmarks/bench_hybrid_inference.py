@@ -0,0 +1,76 @@
+"""Latency of the RF + DNN hybrid: sklearn + Keras versus the compiled NumPy artifact.
+
+    python -m benchmarks.bench_hybrid_inference --data water_potability.csv
+
+Trains the hybrid model (the forest comes from the on-disk cache when
+available), exports it, checks that both paths agree on the test split and
+reports per-call latency for single rows and for the whole test split.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+from waterpotability.data import load_dataset
+from waterpotability.distill import CompiledHybrid, export_hybrid
+from waterpotability.imputation import ClassMedianImputer
+from waterpotability.preprocessing import prepare
+from waterpotability.registry import get_model
+
+# Loading and scoring the artifact in a fresh interpreter must not pull these in
+HEAVY_MODULES = ('tensorflow', 'keras', 'sklearn')
+
+
+def latency(predict, X, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict(X)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def imported_modules(path):
+    code = ('import sys, numpy as np; from waterpotability.distill import CompiledHybrid; '
+            f'CompiledHybrid.load({path!r}).predict_proba(np.zeros((1, 9))); '
+            f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))')
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='water_potability.csv')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    data = prepare(ClassMedianImputer().fit_transform(load_dataset(args.data)))
+    model, (_, X_test, _, _) = get_model('hybrid').train(data)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hybrid.npz')
+        export_hybrid(model, path)
+        compiled = CompiledHybrid.load(path)
+        print(f'artifact size: {os.path.getsize(path) / 1e6:.2f} MB')
+        print(f'heavy modules imported by the artifact: {imported_modules(path) or "none"}')
+
+    diff = np.abs(compiled.predict_proba(X_test)[:, 1] - model.predict_proba(X_test)[:, 1])
+    agree = (compiled.predict(X_test) == model.predict(X_test)).mean()
+    print(f'parity on {len(X_test)} test rows: max |dp| = {diff.max():.2e}, label agreement = {agree:.4f}')
+
+    print(f'{"batch":>8} {"sklearn+keras ms":>17} {"numpy ms":>10} {"speedup":>8}')
+    for X in (X_test[:1], X_test):
+        original = latency(model.predict_proba, X, args.repeat) * 1e3
+        fast = latency(compiled.predict_proba, X, args.repeat) * 1e3
+        print(f'{len(X):>8} {original:>17.3f} {fast:>10.3f} {original / fast:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""Parity, latency and memory of the exported Keras models against ``model.predict``.
+
+    python -m benchmarks.bench_keras_export --data water_potability.csv
+    python -m benchmarks.bench_keras_export --models ann lstm_mlp --formats numpy tflite-int8
+
+Trains the ANN, the hybrid and the LSTM + MLP on the pipeline's split and
+exports each in every ``--formats`` (see ``waterpotability.export``). For
+each export it reports the largest probability difference from the Keras
+original on the test rows, the share of equal predictions, the test
+accuracy, the file size, single-row latency (p50/p99) and batch throughput.
+Then it loads and scores every model in a fresh interpreter, and reports
+the load time, peak RSS (Linux) and whether TensorFlow was imported; the
+``tflite`` formats import it only when no standalone TFLite interpreter is
+installed.
+
+Exits with status 1 when a float32 export differs by more than
+``TOLERANCE`` in probability, or an int8 export loses more than
+``ACCURACY_TOLERANCE`` in test accuracy.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+from waterpotability.data import load_dataset
+from waterpotability.export import FORMATS, export_model
+from waterpotability.pipeline import preprocess
+from waterpotability.registry import get_model
+
+TOLERANCE = 1e-5
+ACCURACY_TOLERANCE = 0.01
+MODELS = ('ann', 'hybrid', 'lstm_mlp')
+
+
+def _latency(model, X, calls=200):
+    times = []
+    for i in range(calls):
+        row = X[i % len(X)][None]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        times.append(time.perf_counter() - start)
+    return np.percentile(times, 50) * 1e3, np.percentile(times, 99) * 1e3
+
+
+def _throughput(model, X, rows=100_000):
+    batch = X[np.arange(rows) % len(X)]
+    start = time.perf_counter()
+    model.predict_proba(batch)
+    return rows / (time.perf_counter() - start)
+
+
+def probe(path, key, X):
+    # A fresh interpreter per model, so memory and imports are its own
+    code = f'''
+import json, sys, time
+import numpy as np
+start = time.perf_counter()
+path, key = {path!r}, {key!r}
+if path.endswith('.keras'):
+    from waterpotability.models import HybridModel, KerasBinaryClassifier
+    from tensorflow import keras
+    dnn = KerasBinaryClassifier(keras.models.load_model(path), timesteps=key == 'lstm_mlp')
+    if key == 'hybrid':
+        import joblib
+        model = HybridModel(joblib.load(path[:-len('.keras')] + '.joblib'), dnn)
+    else:
+        model = dnn
+else:
+    from waterpotability.export import load_exported
+    model = load_exported(path)
+loaded = time.perf_counter()
+model.predict_proba(np.load({X!r}))
+# VmHWM, unlike ru_maxrss, is not inherited from the parent across exec
+with open('/proc/self/status') as f:
+    peak = next(int(line.split()[1]) for line in f if line.startswith('VmHWM'))
+print(json.dumps({{'load_ms': (loaded - start) * 1e3, 'peak_rss_mib': peak / 1024,
+                  'tensorflow': 'tensorflow' in sys.modules}}))
+'''
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='water_potability.csv')
+    parser.add_argument('--models', nargs='+', choices=MODELS, default=list(MODELS))
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    data, _ = preprocess(load_dataset(args.data))
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        X_path = os.path.join(tmp, 'X_test.npy')
+        np.save(X_path, data.X_test)
+        print(f"{'model':<10}{'format':<13}{'max |dp|':>10}{'agree':>8}{'test acc':>10}{'KiB':>8}"
+              f"{'p50 ms':>8}{'p99 ms':>8}{'rows/s':>12}{'load ms':>9}{'RSS MiB':>9}  tensorflow")
+        for key in args.models:
+            model = get_model(key).train(data)[0]
+            original = os.path.join(tmp, key + '.keras')
+            files = {original: [original]}
+            if key == 'hybrid':
+                import joblib
+                files[original].append(os.path.join(tmp, key + '.joblib'))
+                joblib.dump(model.rf_model, files[original][1])
+                model.dnn_model.model.save(original)
+            else:
+                model.model.save(original)
+            reference = model.predict_proba(data.X_test)[:, 1]
+            accuracy = ((reference > 0.5) == data.y_test).mean()
+
+            runs = [('keras', model, original)]
+            for fmt in args.formats:
+                extension = '.tflite' if fmt.startswith('tflite') and key != 'hybrid' else '.npz'
+                path = os.path.join(tmp, f'{key}-{fmt}{extension}')
+                runs.append((fmt, export_model(model, path, fmt, calibration=data.X_train), path))
+
+            for fmt, exported, path in runs:
+                p = exported.predict_proba(data.X_test)[:, 1]
+                error = np.abs(p - reference).max()
+                agree = ((p > 0.5) == (reference > 0.5)).mean()
+                export_accuracy = ((p > 0.5) == data.y_test).mean()
+                if fmt.endswith('int8'):
+                    ok = accuracy - export_accuracy <= ACCURACY_TOLERANCE
+                else:
+                    ok = error <= TOLERANCE
+                failed |= not ok
+                size = sum(os.path.getsize(f) for f in files.get(path, [path]))
+                p50, p99 = _latency(exported, data.X_test)
+                t = probe(path, key, X_path)
+                print(f"{key:<10}{fmt:<13}{error:>10.1e}{agree:>8.3f}{export_accuracy:>10.4f}{size / 1024:>8.0f}"
+                      f"{p50:>8.3f}{p99:>8.3f}{_throughput(exported, data.X_test):>12,.0f}{t['load_ms']:>9.0f}"
+                      f"{t['peak_rss_mib']:>9.0f}  {'yes' if t['tensorflow'] else 'no'}{'' if ok else '  FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
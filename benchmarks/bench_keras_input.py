@@ -0,0 +1,83 @@
+"""Training time of the Keras models fed NumPy arrays in small batches against ``tf.data`` with early stopping.
+
+    python -m benchmarks.bench_keras_input --data water_potability.csv
+    python -m benchmarks.bench_keras_input --rows 200000 --batch-sizes 128 1024
+
+The ANN and the LSTM + MLP are trained on the pipeline's split (or on
+``--rows`` synthetic rows from ``synthetic.SyntheticGenerator``) the
+original way, NumPy arrays with ``batch_size=16`` for 50 epochs, and with
+``tfdata.fit_keras`` for each of ``--batch-sizes`` (learning rate scaled,
+early stopping on a validation fold). Reports epochs run, seconds/epoch,
+samples/sec, total time and test accuracy.
+"""
+
+import argparse
+import time
+import warnings
+
+from waterpotability.data import load_dataset
+from waterpotability.imputation import ClassMedianImputer
+from waterpotability.preprocessing import prepare
+from waterpotability.synthetic import SyntheticGenerator
+from waterpotability.tfdata import fit_keras, scaled_learning_rate, split_validation
+
+BASE_BATCH_SIZE = 16
+EPOCHS = 50
+
+
+def _build(kind, n_features, learning_rate):
+    from tensorflow.keras.layers import LSTM, Dense, Input
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.optimizers import Adam
+
+    if kind == 'ann':
+        layers = [Input(shape=(n_features,)), Dense(16, activation='relu'), Dense(8, activation='relu')]
+    else:
+        layers = [Input(shape=(1, n_features)), LSTM(64, activation='relu'), Dense(32, activation='relu'),
+                  Dense(16, activation='relu')]
+    model = Sequential(layers + [Dense(1, activation='sigmoid')])
+    model.compile(optimizer=Adam(learning_rate=learning_rate), loss='binary_crossentropy', metrics=['accuracy'])
+    return model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='water_potability.csv')
+    parser.add_argument('--rows', type=int, help='train on this many synthetic rows instead of the real data')
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[128, 512])
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    dataset = load_dataset(args.data)
+    if args.rows:
+        dataset = SyntheticGenerator().fit(dataset).sample(args.rows, random_state=0)
+    data = prepare(ClassMedianImputer().fit(dataset).transform(dataset))
+    X_fit, X_val, y_fit, y_val = split_validation(data.X_train, data.y_train)
+
+    print(f"{'model':<10}{'input':<22}{'epochs':>7}{'s/epoch':>9}{'samples/s':>12}{'total s':>9}{'test acc':>10}")
+    for kind in ('ann', 'lstm_mlp'):
+        def shaped(X):
+            return X.reshape((len(X), 1, X.shape[1])) if kind == 'lstm_mlp' else X
+
+        runs = [('numpy, batch 16', None)] + [(f'tf.data, batch {size}', size) for size in args.batch_sizes]
+        for label, batch_size in runs:
+            model = _build(kind, data.X.shape[1],
+                           scaled_learning_rate(0.001, batch_size or BASE_BATCH_SIZE, BASE_BATCH_SIZE))
+            start = time.perf_counter()
+            if batch_size is None:
+                model.fit(shaped(X_fit), y_fit, epochs=EPOCHS, batch_size=BASE_BATCH_SIZE, verbose=0,
+                          validation_data=(shaped(X_val), y_val))
+                epochs = EPOCHS
+            else:
+                history = fit_keras(model, shaped(X_fit), y_fit, shaped(X_val), y_val, epochs=EPOCHS,
+                                    batch_size=batch_size)
+                epochs = len(history['epoch_time'])
+            total = time.perf_counter() - start
+            p = model.predict(shaped(data.X_test), batch_size=4096, verbose=0).reshape(-1)
+            accuracy = ((p > 0.5) == data.y_test).mean()
+            print(f'{kind:<10}{label:<22}{epochs:>7}{total / epochs:>9.3f}{len(X_fit) * epochs / total:>12,.0f}'
+                  f'{total:>9.2f}{accuracy:>10.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Compare sketched medians with exact pandas medians on the imputed columns.
+
+    python -m benchmarks.bench_median_sketch --data water_potability.csv
+    python -m benchmarks.bench_median_sketch --rows 10000000 --epsilon 0.01 0.001
+
+Without ``--data`` the columns are drawn from skewed synthetic
+distributions. For each column and Potability class the script reports the
+exact median, the sketch estimate, its rank error (fraction of rows between
+the two) and the wall-clock time of both methods.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from waterpotability.data import NULL_COLS, TARGET
+from waterpotability.imputation import ClassMedianImputer
+
+
+def synthetic(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {col: rng.lognormal(mean=i + 1, sigma=0.5, size=rows).astype(np.float32)
+            for i, col in enumerate(NULL_COLS)}
+    data[TARGET] = (rng.random(rows) < 0.39).astype(np.int8)
+    return pd.DataFrame(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', help='CSV with the imputed columns and Potability')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='synthetic rows without --data')
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--epsilon', type=float, nargs='+', default=[0.01])
+    args = parser.parse_args(argv)
+
+    dataset = pd.read_csv(args.data) if args.data else synthetic(args.rows)
+    print(f'{len(dataset):,} rows')
+
+    start = time.perf_counter()
+    exact = ClassMedianImputer().fit(dataset)
+    exact_time = time.perf_counter() - start
+    print(f'exact pandas median: {exact_time:.3f}s')
+
+    for epsilon in args.epsilon:
+        imputer = ClassMedianImputer(method='sketch', epsilon=epsilon)
+        start = time.perf_counter()
+        for i in range(0, len(dataset), args.chunksize):
+            imputer.partial_fit(dataset.iloc[i:i + args.chunksize])
+        sketch_time = time.perf_counter() - start
+        retained = sum(s.size for s in imputer.sketches_.values())
+        print(f'\nsketch epsilon={epsilon}: {sketch_time:.3f}s, {retained:,} values retained')
+
+        rows = []
+        for col in NULL_COLS:
+            for k in (0, 1):
+                values = dataset.loc[dataset[TARGET] == k, col].dropna().to_numpy()
+                true, est = exact.class_medians_[col][k], imputer.class_medians_[col][k]
+                rank_error = abs((values < est).mean() - (values < true).mean())
+                rows.append({'column': col, 'class': k, 'exact': true, 'sketch': est,
+                             'rank_error': rank_error, 'relative_error': abs(est - true) / abs(true)})
+        print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
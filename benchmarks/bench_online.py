@@ -0,0 +1,89 @@
+"""Cost of an online update against retraining from scratch as new blocks arrive.
+
+    python -m benchmarks.bench_online --data water_potability.csv
+    python -m benchmarks.bench_online --history 1000000 --blocks 100 1000 10000
+
+Each model is first fitted on ``--history`` synthetic rows (from
+``synthetic.SyntheticGenerator`` fitted to ``--data``). For every block size
+in ``--blocks``, a fresh block of new rows is then learned either with
+``online.OnlineLearner.update`` or by refitting the imputer, scaler and model
+on history plus block. Both are scored on the same held-out synthetic test
+set.
+"""
+
+import argparse
+import copy
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from waterpotability.data import INPUT_COLS, TARGET, load_dataset
+from waterpotability.imputation import ClassMedianImputer
+from waterpotability.online import OnlineLearner
+from waterpotability.preprocessing import MinMaxTransform
+from waterpotability.synthetic import SyntheticGenerator
+
+
+def _models():
+    import xgboost as xgb
+    from sklearn.naive_bayes import GaussianNB
+
+    from waterpotability.models import ApproximateKernelSVM
+
+    return {
+        'nb': GaussianNB,
+        'svm_approx': ApproximateKernelSVM,
+        'xgb': lambda: xgb.XGBClassifier(n_estimators=100, max_depth=6, tree_method='hist', n_jobs=1),
+    }
+
+
+def _fit(make, frame):
+    from sklearn.preprocessing import MinMaxScaler
+
+    imputer = ClassMedianImputer(method='sketch').fit(frame)
+    frame = imputer.transform(frame)
+    scaler = MinMaxTransform.from_scaler(MinMaxScaler().fit(frame[INPUT_COLS].to_numpy()))
+    X = scaler.transform(frame[INPUT_COLS].to_numpy()).astype(np.float32)
+    return imputer, scaler, make().fit(X, frame[TARGET].to_numpy())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='water_potability.csv')
+    parser.add_argument('--history', type=int, default=200_000)
+    parser.add_argument('--blocks', nargs='+', type=int, default=[100, 1_000, 10_000])
+    parser.add_argument('--test-rows', type=int, default=20_000)
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    generator = SyntheticGenerator().fit(load_dataset(args.data))
+    history = generator.sample(args.history, random_state=0)
+    test = generator.sample(args.test_rows, random_state=1)
+
+    print(f"{'model':<12}{'block':>8}{'update s':>11}{'retrain s':>11}{'speedup':>9}"
+          f"{'update acc':>12}{'retrain acc':>13}")
+    for key, make in _models().items():
+        base = OnlineLearner(*_fit(make, history))
+        for i, size in enumerate(args.blocks):
+            block = generator.sample(size, random_state=[2, i])
+
+            learner = copy.deepcopy(base)
+            start = time.perf_counter()
+            learner.update(block)
+            update_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            retrained = OnlineLearner(*_fit(make, pd.concat([history, block], ignore_index=True)))
+            retrain_time = time.perf_counter() - start
+
+            y_test = test[TARGET].to_numpy()
+            update_acc = (learner.predict(test) == y_test).mean()
+            retrain_acc = (retrained.predict(test) == y_test).mean()
+            print(f'{key:<12}{size:>8,}{update_time:>11.3f}{retrain_time:>11.3f}'
+                  f'{retrain_time / update_time:>8.0f}x{update_acc:>12.4f}{retrain_acc:>13.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Time and memory of the chunked SMOTE against imblearn's SMOTE, and the test leak of oversampling first.
+
+    python -m benchmarks.bench_oversampling --data water_potability.csv
+    python -m benchmarks.bench_oversampling --sizes 10000 100000 1000000 --chunksize 100000
+
+For each size in ``--sizes``, a synthetic training set (from
+``synthetic.SyntheticGenerator`` fitted to ``--data``, imputed and scaled
+like the pipeline) is balanced by ``imblearn.over_sampling.SMOTE``,
+``balancing.ChunkedSMOTE`` and ``balancing.class_weights``, reporting wall
+time and peak memory allocated during the call (``tracemalloc``), and the
+share of the exact ``k`` nearest neighbours that ``balancing.ClusterIndex``
+finds (recall) for a sample of minority rows.
+
+Then, on the real data, a Random Forest is scored on the test split after
+oversampling the whole dataset before splitting (the original hybrid) and
+after oversampling the training rows only: the gap is the accuracy that
+synthetic neighbours of test rows leaked into the first.
+"""
+
+import argparse
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+from waterpotability.balancing import (AUTO_EXACT_ROWS, DEFAULT_K_NEIGHBORS, ChunkedSMOTE, ClusterIndex,
+                                      class_weights)
+from waterpotability.data import DEFAULT_CHUNKSIZE, INPUT_COLS, TARGET, load_dataset
+from waterpotability.imputation import ClassMedianImputer
+from waterpotability.preprocessing import prepare
+from waterpotability.synthetic import SyntheticGenerator
+
+
+def _measure(resample):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = resample()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def recall(X, sample=2_000, k=DEFAULT_K_NEIGHBORS):
+    """Mean share of the exact k nearest neighbours found by ``ClusterIndex``."""
+    from sklearn.neighbors import NearestNeighbors
+
+    rows = np.random.default_rng(0).choice(len(X), min(sample, len(X)), replace=False)
+    approximate = ClusterIndex().fit(X).neighbours(rows, k)
+    exact = NearestNeighbors().fit(X).kneighbors(X[rows], k + 1, return_distance=False)[:, 1:]
+    return np.mean([len(set(a) & set(b)) / k for a, b in zip(approximate, exact)])
+
+
+def leak(dataset):
+    """Test accuracy of a forest with SMOTE before and after the train/test split."""
+    from imblearn.over_sampling import SMOTE
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+
+    data = prepare(ClassMedianImputer().fit(dataset).transform(dataset))
+
+    def score(X_train, X_test, y_train, y_test):
+        forest = RandomForestClassifier(n_estimators=200, random_state=41, n_jobs=-1).fit(X_train, y_train)
+        return (forest.predict(X_test) == y_test).mean()
+
+    X_balanced, y_balanced = SMOTE(random_state=1).fit_resample(*data.original())
+    before = score(*train_test_split(X_balanced, y_balanced, test_size=0.25, random_state=1))
+    X_fit, y_fit = ChunkedSMOTE().fit_resample(data.X_train, data.y_train)
+    after = score(X_fit, data.X_test, y_fit, data.y_test)
+    return before, after
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='water_potability.csv')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    from imblearn.over_sampling import SMOTE
+    from sklearn.preprocessing import MinMaxScaler
+
+    dataset = load_dataset(args.data)
+    generator = SyntheticGenerator().fit(dataset)
+
+    print(f"{'rows':>10}  {'method':<22}{'seconds':>9}{'peak MiB':>10}{'balanced rows':>15}{'recall':>8}")
+    for n in args.sizes:
+        frame = generator.sample(n, random_state=0)
+        frame = ClassMedianImputer().fit(frame).transform(frame)
+        X = MinMaxScaler().fit_transform(frame[INPUT_COLS].to_numpy()).astype(np.float32)
+        y = frame[TARGET].to_numpy()
+        methods = {
+            'imblearn SMOTE': lambda: SMOTE(random_state=1).fit_resample(X, y),
+            'ChunkedSMOTE': lambda: ChunkedSMOTE(chunksize=args.chunksize).fit_resample(X, y),
+            'class weights': lambda: (X, y, class_weights(y)),
+        }
+        # ChunkedSMOTE only uses the approximate index for large classes
+        minority = X[y == np.argmin(np.bincount(y))]
+        approximate = f'{recall(minority):>8.3f}' if len(minority) > AUTO_EXACT_ROWS else ''
+        for name, resample in methods.items():
+            result, elapsed, peak = _measure(resample)
+            print(f'{n:>10,}  {name:<22}{elapsed:>9.3f}{peak:>10.1f}{len(result[1]):>15,}'
+                  f'{approximate if name == "ChunkedSMOTE" else ""}')
+
+    before, after = leak(dataset)
+    print(f'\nRandom Forest test accuracy, SMOTE before the split: {before:.4f}; '
+          f'on the training rows only: {after:.4f}')
+
+
+if __name__ == '__main__':
+    main()
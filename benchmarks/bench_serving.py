@@ -0,0 +1,110 @@
+"""Load generator for the HTTP prediction service.
+
+    python -m waterpotability serve --artifacts artifacts --model rf &
+    python -m benchmarks.bench_serving --url http://127.0.0.1:8000 --concurrency 64 --requests 20000
+
+Opens ``--concurrency`` keep-alive connections, each sending single-sample
+``POST /predict`` requests back to back, and reports client-side latency
+percentiles and throughput followed by the server's ``/metrics``. With
+``--artifacts`` and ``--model`` instead of ``--url`` the service is started
+in-process on a free port.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+from waterpotability.data import INPUT_COLS
+
+SAMPLE = dict(zip(INPUT_COLS, [7.08, 196.4, 22014.1, 7.12, 333.8, 426.2, 14.28, 66.4, 3.97]))
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f'{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                 f'Content-Length: {len(body)}\r\n\r\n'.encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    response = json.loads(await reader.readexactly(length))
+    if status != 200:
+        raise RuntimeError(f'{status}: {response}')
+    return response
+
+
+async def client(host, port, n, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = np.random.default_rng()
+    for _ in range(n):
+        sample = {k: v * rng.uniform(0.8, 1.2) for k, v in SAMPLE.items()}
+        start = time.perf_counter()
+        await request(reader, writer, 'POST', '/predict', sample)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def generate_load(host, port, concurrency, requests):
+    latencies = []
+    start = time.perf_counter()
+    # The first ``requests % concurrency`` clients send one request more
+    share, extra = divmod(requests, concurrency)
+    await asyncio.gather(*(client(host, port, share + (i < extra), latencies) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    reader, writer = await asyncio.open_connection(host, port)
+    metrics = await request(reader, writer, 'GET', '/metrics')
+    writer.close()
+    return np.asarray(latencies) * 1e3, elapsed, metrics
+
+
+async def run_in_process(args):
+    from waterpotability.serve import PredictionServer, Predictor
+
+    server = PredictionServer(Predictor.load(args.artifacts, args.model, args.compile),
+                              args.max_batch, args.batch_window_ms / 1e3)
+    ready = asyncio.Event()
+    task = asyncio.create_task(server.serve('127.0.0.1', args.port, ready))
+    await ready.wait()
+    try:
+        return await generate_load('127.0.0.1', args.port, args.concurrency, args.requests)
+    finally:
+        task.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='running service to load (default: start one in-process)')
+    parser.add_argument('--artifacts', help='artifacts directory for the in-process service')
+    parser.add_argument('--model', default='rf')
+    parser.add_argument('--compile', action='store_true')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--batch-window-ms', type=float, default=2.0)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    if args.url:
+        url = urlparse(args.url)
+        latencies, elapsed, metrics = asyncio.run(
+            generate_load(url.hostname, url.port, args.concurrency, args.requests))
+    elif args.artifacts:
+        latencies, elapsed, metrics = asyncio.run(run_in_process(args))
+    else:
+        parser.error('give --url or --artifacts')
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f'{len(latencies):,} requests in {elapsed:.2f}s: {len(latencies) / elapsed:,.0f} req/s, '
+          f'client p50 {p50:.2f} ms, p99 {p99:.2f} ms')
+    print('server metrics:', json.dumps(metrics, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Accuracy and fit time of the exact RBF SVC against the approximate kernel SVM as data grows.
+
+    python -m benchmarks.bench_svm_scaling --data water_potability.csv
+    python -m benchmarks.bench_svm_scaling --sizes 2457 20000 200000 2000000 --max-exact 50000
+
+Training sets of each size in ``--sizes`` are drawn from
+``synthetic.SyntheticGenerator`` fitted to ``--data`` (imputed and scaled
+like the pipeline), and every model is scored on the same held-out
+synthetic test set. The exact ``SVC`` is skipped above ``--max-exact``
+rows, where its fit time grows out of reach.
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from waterpotability.data import INPUT_COLS, TARGET, load_dataset
+from waterpotability.imputation import ClassMedianImputer
+from waterpotability.models import ApproximateKernelSVM
+from waterpotability.synthetic import SyntheticGenerator
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='water_potability.csv')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[2_457, 10_000, 50_000, 200_000, 1_000_000])
+    parser.add_argument('--max-exact', type=int, default=50_000)
+    parser.add_argument('--test-rows', type=int, default=20_000)
+    parser.add_argument('--n-components', type=int, default=300)
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    from sklearn.preprocessing import MinMaxScaler
+    from sklearn.svm import SVC
+
+    generator = SyntheticGenerator().fit(load_dataset(args.data))
+    train = generator.sample(max(args.sizes), random_state=0)
+    test = generator.sample(args.test_rows, random_state=1)
+    imputer = ClassMedianImputer().fit(train)
+    scaler = MinMaxScaler().fit(imputer.transform(train)[INPUT_COLS].to_numpy())
+
+    def features(frame):
+        return scaler.transform(imputer.transform(frame)[INPUT_COLS].to_numpy()).astype(np.float32)
+
+    X_all, y_all = features(train), train[TARGET].to_numpy()
+    X_test, y_test = features(test), test[TARGET].to_numpy()
+
+    models = {
+        'SVC (exact RBF)': lambda: SVC(kernel='rbf', random_state=41),
+        'Nystroem + SGD': lambda: ApproximateKernelSVM('nystroem', args.n_components),
+        'RBFSampler + SGD': lambda: ApproximateKernelSVM('rbf_sampler', args.n_components),
+    }
+    print(f"{'rows':>10}  {'model':<18}{'fit s':>10}{'test accuracy':>15}")
+    for n in sorted(args.sizes):
+        X, y = X_all[:n], y_all[:n]
+        for name, make in models.items():
+            if name.startswith('SVC') and n > args.max_exact:
+                print(f'{n:>10,}  {name:<18}{"skipped":>10}')
+                continue
+            start = time.perf_counter()
+            model = make().fit(X, y)
+            fit_time = time.perf_counter() - start
+            accuracy = (model.predict(X_test) == y_test).mean()
+            print(f'{n:>10,}  {name:<18}{fit_time:>10.2f}{accuracy:>15.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Fidelity and speed of the synthetic data generator.
+
+    python -m benchmarks.bench_synthetic --data water_potability.csv
+    python -m benchmarks.bench_synthetic --rows 10000000 --chunksize 1000000
+
+Fits ``synthetic.SyntheticGenerator`` to ``--data``, draws ``--rows`` rows
+and compares them with the real data: class balance, per-class missing
+rates, per-class quartiles (relative to the real interquartile range) and
+the Spearman correlation between features. Exits with status 1 when any
+difference exceeds its tolerance. Then reports rows/sec for sampling alone
+and for writing CSV and Parquet.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from waterpotability.data import INPUT_COLS, TARGET, load_dataset
+from waterpotability.synthetic import SyntheticGenerator, write_synthetic
+
+TOLERANCES = {'class balance': 0.01, 'missing rate': 0.01, 'quartile / IQR': 0.05, 'spearman correlation': 0.05}
+
+
+def fidelity(real, synthetic):
+    """Largest absolute difference per statistic between two labelled frames."""
+    errors = {'class balance': np.abs(real[TARGET].value_counts(normalize=True)
+                                      - synthetic[TARGET].value_counts(normalize=True)).max()}
+    missing, quartiles = [], []
+    for k in sorted(real[TARGET].unique()):
+        a = real.loc[real[TARGET] == k, INPUT_COLS]
+        b = synthetic.loc[synthetic[TARGET] == k, INPUT_COLS]
+        missing.append(np.abs(a.isna().mean() - b.isna().mean()).max())
+        qa, qb = a.quantile([0.25, 0.5, 0.75]), b.quantile([0.25, 0.5, 0.75])
+        quartiles.append((np.abs(qa - qb) / (qa.loc[0.75] - qa.loc[0.25])).max().max())
+    errors['missing rate'] = max(missing)
+    errors['quartile / IQR'] = max(quartiles)
+    errors['spearman correlation'] = np.abs(real[INPUT_COLS].corr(method='spearman')
+                                            - synthetic[INPUT_COLS].corr(method='spearman')).max().max()
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='water_potability.csv')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    args = parser.parse_args(argv)
+
+    real = load_dataset(args.data)
+    generator = SyntheticGenerator().fit(real)
+
+    start = time.perf_counter()
+    sample = pd.concat(generator.iter_samples(args.rows, args.chunksize), ignore_index=True)
+    sample_rate = args.rows / (time.perf_counter() - start)
+
+    failed = False
+    print(f"{'statistic':<22}{'max |real - synthetic|':>24}{'tolerance':>11}")
+    for name, error in fidelity(real, sample).items():
+        ok = error <= TOLERANCES[name]
+        failed |= not ok
+        print(f"{name:<22}{error:>24.4f}{TOLERANCES[name]:>11.2f}{'' if ok else '  FAIL'}")
+    del sample
+
+    print(f'\nsampling: {sample_rate:,.0f} rows/sec')
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext in ('.csv', '.parquet'):
+            path = os.path.join(tmp, 'synthetic' + ext)
+            start = time.perf_counter()
+            write_synthetic(generator, path, args.rows, args.chunksize)
+            elapsed = time.perf_counter() - start
+            print(f'writing {ext}: {args.rows / elapsed:,.0f} rows/sec, {os.path.getsize(path) / 2 ** 20:,.0f} MiB')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Parity and throughput of the compiled tree evaluator against sklearn and xgboost.
+
+    python -m benchmarks.bench_tree_inference --data water_potability.csv
+    python -m benchmarks.bench_tree_inference --models rf --max-batch 100000
+
+Trains the Random Forest and XGBoost models, compiles them with
+``trees.compile_model`` and checks that every backend reproduces
+``predict_proba`` on the test split (with some values blanked to NaN to
+exercise missing-value routing); exits with status 1 on a mismatch. Then
+reports rows/sec for batch sizes from 1 up to ``--max-batch``, drawing
+rows from the test split.
+"""
+
+import argparse
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from waterpotability.data import load_dataset
+from waterpotability.imputation import ClassMedianImputer
+from waterpotability.preprocessing import prepare
+from waterpotability.registry import get_model
+from waterpotability.trees import compile_model, numba_available
+
+TOLERANCE = 1e-5
+
+
+def throughput(predict, X, min_time=0.2):
+    predict(X)  # warm-up, e.g. numba compilation
+    calls, start = 0, time.perf_counter()
+    while True:
+        predict(X)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls * len(X) / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='water_potability.csv')
+    parser.add_argument('--models', nargs='+', default=['rf', 'xgb'], choices=['rf', 'dt', 'xgb'])
+    parser.add_argument('--max-batch', type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    data = prepare(ClassMedianImputer().fit_transform(load_dataset(args.data)))
+    X_test = data.X_test.copy()
+    X_nan = X_test.copy()
+    X_nan[::7, 0] = np.nan
+    X_nan[::5, 4] = np.nan
+
+    backends = ['numpy'] + (['numba'] if numba_available() else [])
+    rng = np.random.default_rng(0)
+    batches = [10 ** i for i in range(int(np.log10(args.max_batch)) + 1)]
+    failed = False
+    rows = []
+    for key in args.models:
+        model, _ = get_model(key).train(data)
+        compiled = compile_model(model)
+
+        for backend in backends:
+            for name, X in (('test', X_test), ('test with NaN', X_nan)):
+                diff = np.abs(compiled.predict_proba(X, backend)[:, 1] - model.predict_proba(X)[:, 1]).max()
+                ok = diff <= TOLERANCE
+                failed |= not ok
+                print(f'{key} {backend:>5} parity on {name}: max |dp| = {diff:.2e} {"ok" if ok else "MISMATCH"}')
+
+        for batch in batches:
+            X = X_test[rng.integers(len(X_test), size=batch)]
+            row = {'model': key, 'batch': batch, 'native': throughput(model.predict_proba, X)}
+            for backend in backends:
+                row[backend] = throughput(lambda X: compiled.predict_proba(X, backend), X)
+            rows.append(row)
+
+    print('\nrows/sec')
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f'{v:,.0f}'))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope='session')
+def rows():
+    """Small scaled feature rows and labels, like the pipeline's, without the dataset."""
+    rng = np.random.default_rng(0)
+    X = rng.random((400, 9))
+    y = (X[:, 0] + X[:, 4] + 0.3 * rng.standard_normal(400) > 1).astype(int)
+    return X, y
+
+
+@pytest.fixture(scope='session')
+def forest(rows):
+    from sklearn.ensemble import RandomForestClassifier
+
+    X, y = rows
+    X = X.copy()
+    # Nulls in training, so the trees learn a side for missing values
+    X[::7, 2] = np.nan
+    return RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0).fit(X, y)
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('tensorflow')
+
+from waterpotability.distill import CompiledHybrid
+from waterpotability.export import TFLiteClassifier, export_model, load_exported
+from waterpotability.mlp import NumpyMLP
+from waterpotability.models import HybridModel, KerasBinaryClassifier
+
+# Largest probability difference from Keras: float32 exports, then int8
+TOLERANCE = 1e-5
+INT8_TOLERANCE = 0.02
+
+
+def _fit(model, X, y):
+    from tensorflow.keras.optimizers import Adam
+
+    model.compile(optimizer=Adam(0.01), loss='binary_crossentropy')
+    # A few epochs, so the BatchNormalization statistics are not the identity
+    model.fit(X, y, epochs=3, batch_size=64, verbose=0)
+    return model
+
+
+@pytest.fixture(scope='module')
+def ann(rows):
+    from tensorflow.keras.layers import BatchNormalization, Dense, Dropout, Input
+    from tensorflow.keras.models import Sequential
+
+    X, y = rows
+    model = Sequential([Input(shape=(X.shape[1],)), Dense(16, activation='relu'), BatchNormalization(), Dropout(0.3),
+                        Dense(8, activation='relu'), BatchNormalization(), Dense(1, activation='sigmoid')])
+    return KerasBinaryClassifier(_fit(model, X, y))
+
+
+@pytest.fixture(scope='module')
+def lstm_mlp(rows):
+    from tensorflow.keras.layers import LSTM, Dense, Input
+    from tensorflow.keras.models import Sequential
+
+    X, y = rows
+    model = Sequential([Input(shape=(1, X.shape[1])), LSTM(16, activation='relu'), Dense(8, activation='relu'),
+                        Dense(1, activation='sigmoid')])
+    return KerasBinaryClassifier(_fit(model, X[:, None], y), timesteps=True)
+
+
+@pytest.fixture(scope='module')
+def hybrid(rows, forest):
+    from tensorflow.keras.layers import BatchNormalization, Dense, Input
+    from tensorflow.keras.models import Sequential
+
+    X, y = rows
+    model = Sequential([Input(shape=(2,)), Dense(8, activation='relu'), BatchNormalization(),
+                        Dense(1, activation='sigmoid')])
+    return HybridModel(forest, KerasBinaryClassifier(_fit(model, forest.predict_proba(X), y)))
+
+
+def _error(exported, model, X):
+    return np.abs(exported.predict_proba(X) - model.predict_proba(X)).max()
+
+
+@pytest.mark.parametrize('key', ['ann', 'lstm_mlp'])
+def test_numpy_mlp_matches_keras(request, rows, key):
+    model = request.getfixturevalue(key)
+    assert _error(NumpyMLP.from_keras(model.model), model, rows[0]) <= TOLERANCE
+
+
+@pytest.mark.parametrize('key', ['ann', 'lstm_mlp'])
+def test_tflite_matches_keras(request, rows, key):
+    from waterpotability.export import to_tflite
+
+    model = request.getfixturevalue(key)
+    exported = TFLiteClassifier(to_tflite(NumpyMLP.from_keras(model.model)))
+    assert _error(exported, model, rows[0]) <= TOLERANCE
+
+
+@pytest.mark.parametrize('key', ['ann', 'lstm_mlp'])
+@pytest.mark.parametrize('fmt', ['numpy-int8', 'tflite-int8'])
+def test_int8_exports_stay_close_to_keras(request, tmp_path, rows, key, fmt):
+    model = request.getfixturevalue(key)
+    X, _ = rows
+    path = tmp_path / (key + ('.tflite' if fmt == 'tflite-int8' else '.npz'))
+    exported = export_model(model, str(path), fmt, calibration=X)
+    assert _error(exported, model, X) <= INT8_TOLERANCE
+    np.testing.assert_array_equal(load_exported(str(path)).predict_proba(X), exported.predict_proba(X))
+
+
+@pytest.mark.parametrize('fmt', ['numpy', 'tflite'])
+def test_compiled_hybrid_matches_hybrid(tmp_path, rows, hybrid, fmt):
+    X, _ = rows
+    path = str(tmp_path / 'hybrid.npz')
+    exported = export_model(hybrid, path, fmt)
+    assert isinstance(load_exported(path), CompiledHybrid)
+    assert _error(load_exported(path), hybrid, X) <= TOLERANCE
+    assert _error(exported, hybrid, X) <= TOLERANCE
+
+
+def test_bundled_hybrid_matches_hybrid(tmp_path, rows, hybrid):
+    import pandas as pd
+    from sklearn.preprocessing import MinMaxScaler
+
+    from waterpotability.data import INPUT_COLS, TARGET
+    from waterpotability.imputation import ClassMedianImputer
+    from waterpotability.persistence import load_model, save_artifacts
+
+    X, y = rows
+    frame = pd.DataFrame(X, columns=INPUT_COLS).assign(**{TARGET: y})
+    save_artifacts(str(tmp_path), ClassMedianImputer().fit(frame), MinMaxScaler().fit(X), {'hybrid': hybrid})
+    loaded = load_model(str(tmp_path), 'hybrid')
+    assert isinstance(loaded, CompiledHybrid)
+    assert _error(loaded, hybrid, X) <= TOLERANCE
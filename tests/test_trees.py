@@ -0,0 +1,49 @@
+import numpy as np
+
+import pytest
+
+from waterpotability.trees import CompiledForest, numba_available
+
+TOLERANCE = 1e-6
+
+
+def test_compiled_forest_matches_predict_proba(rows, forest):
+    X, _ = rows
+    compiled = CompiledForest.from_sklearn(forest)
+    for backend in ('numpy', 'numba') if numba_available() else ('numpy',):
+        p = compiled.predict_proba(X, backend=backend)
+        assert np.abs(p - forest.predict_proba(X)).max() <= TOLERANCE
+
+
+def test_compiled_forest_routes_nulls_like_sklearn(rows, forest):
+    X, _ = rows
+    X = X.copy()
+    X[::3, 2] = np.nan
+    X[::5, 6] = np.nan
+    p = CompiledForest.from_sklearn(forest).predict_proba(X)
+    assert np.abs(p - forest.predict_proba(X)).max() <= TOLERANCE
+
+
+def test_compiled_forest_float32_input(rows, forest):
+    X = rows[0].astype(np.float32)
+    p = CompiledForest.from_sklearn(forest).predict_proba(X)
+    assert np.abs(p - forest.predict_proba(X)).max() <= TOLERANCE
+
+
+def test_compiled_forest_arrays_round_trip(rows, forest):
+    X, _ = rows
+    compiled = CompiledForest.from_sklearn(forest)
+    restored = CompiledForest.from_arrays(compiled.to_arrays('rf_'), 'rf_')
+    np.testing.assert_array_equal(restored.predict_proba(X), compiled.predict_proba(X))
+
+
+def test_compiled_xgboost_matches_predict_proba(rows):
+    xgb = pytest.importorskip('xgboost')
+
+    X, y = rows
+    X = X.copy()
+    X[::7, 2] = np.nan
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=4, random_state=0).fit(X, y)
+    X[::3, 6] = np.nan
+    p = CompiledForest.from_xgboost(model).predict_proba(X)
+    assert np.abs(p - model.predict_proba(X)).max() <= TOLERANCE
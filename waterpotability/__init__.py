@@ -0,0 +1,41 @@
+"""
+**WATER POTABILITY USING WATER QUALITY METRICS**
+
+Access to potable water is a fundamental human right, yet ensuring safe
+drinking water remains a challenge in many parts of the world. This package
+classifies water samples as potable (1) or non-potable (0) from nine
+physico-chemical measurements.
+
+The pipeline is split into stages that can be imported and run on their own:
+
+    load -> impute -> scale -> train -> evaluate
+
+Plotting and the heavy model frameworks (TensorFlow, xgboost, imblearn,
+matplotlib, seaborn) are only imported when a stage actually needs them.
+
+Dataset : "https://www.kaggle.com/datasets/adityakadiwal/water-potability/data"
+"""
+
+from .data import INPUT_COLS, TARGET, load_dataset
+from .imputation import ClassMedianImputer
+from .preprocessing import PreparedData, impute_missing, prepare, scale_features
+from .evaluation import evaluate_model, fit_and_evaluate
+from .registry import get_model, model_keys, register
+from .pipeline import run
+
+__all__ = [
+    'INPUT_COLS',
+    'TARGET',
+    'load_dataset',
+    'ClassMedianImputer',
+    'impute_missing',
+    'scale_features',
+    'PreparedData',
+    'prepare',
+    'evaluate_model',
+    'fit_and_evaluate',
+    'get_model',
+    'model_keys',
+    'register',
+    'run',
+]
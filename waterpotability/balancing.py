@@ -0,0 +1,188 @@
+"""Class balancing of training data: chunked SMOTE oversampling and class weights.
+
+``ChunkedSMOTE`` generates SMOTE samples (a random point on the segment
+between a minority row and one of its ``k_neighbors`` nearest minority
+neighbours) block by block. Neighbours are only queried for the rows drawn
+in each block, from a k-d tree over the minority rows or, for large
+classes, from the approximate ``ClusterIndex``. The balanced matrix is
+allocated once and filled in place, so no full neighbour table or
+intermediate copies are built.
+
+Oversampling must only see training rows: ``fit_resample`` is used as a
+step of an ``imblearn`` ``Pipeline``, which resamples the training part of
+every cross-validation fold and never the rows that are scored.
+``class_weights`` balances the classes without generating any rows.
+"""
+
+import numpy as np
+
+from .data import DEFAULT_CHUNKSIZE
+
+DEFAULT_K_NEIGHBORS = 5
+DEFAULT_N_PROBE = 3
+
+# algorithm='auto' switches from the exact k-d tree to ClusterIndex above
+# this many minority rows, where tree queries in 9 dimensions slow down
+AUTO_EXACT_ROWS = 20_000
+
+# k-means of ClusterIndex is fitted on at most this many rows per cell
+_ROWS_PER_CELL = 100
+
+BALANCE_METHODS = ('smote', 'class_weight', None)
+
+
+def class_weights(y):
+    """``{class: n / (n_classes * count)}``, as ``class_weight='balanced'`` in scikit-learn."""
+    classes, counts = np.unique(y, return_counts=True)
+    return {int(k): len(y) / (len(classes) * count) for k, count in zip(classes, counts)}
+
+
+class ClusterIndex:
+    """Approximate nearest neighbours in k-means cells (an inverted-file index).
+
+    The rows are split into about ``sqrt(n)`` cells by k-means fitted on a
+    sample. The neighbours of a row are searched exactly among the rows of
+    its own cell and of the ``n_probe - 1`` cells with the nearest centres,
+    so a query costs O(n_probe * sqrt(n)) instead of a tree descent that
+    degrades towards a scan in higher dimensions.
+    """
+
+    def __init__(self, n_probe=DEFAULT_N_PROBE, random_state=1):
+        self.n_probe = n_probe
+        self.random_state = random_state
+
+    def fit(self, X):
+        from sklearn.cluster import MiniBatchKMeans
+
+        self.X_ = np.asarray(X)
+        n_cells = max(1, int(np.sqrt(len(self.X_))))
+        rng = np.random.default_rng(self.random_state)
+        sample = self.X_[rng.choice(len(self.X_), min(len(self.X_), n_cells * _ROWS_PER_CELL), replace=False)]
+        kmeans = MiniBatchKMeans(n_cells, n_init=1, random_state=self.random_state).fit(sample)
+        self.labels_ = kmeans.predict(self.X_)
+        centres = kmeans.cluster_centers_
+        centre_distances = ((centres[:, None] - centres[None]) ** 2).sum(axis=2)
+        self.probes_ = np.argsort(centre_distances, axis=1)[:, :self.n_probe]
+        self.order_ = np.argsort(self.labels_, kind='stable')
+        self.bounds_ = np.searchsorted(self.labels_[self.order_], np.arange(n_cells + 1))
+        self.sq_norms_ = np.einsum('ij,ij->i', self.X_, self.X_)
+        return self
+
+    def neighbours(self, rows, n_neighbors):
+        """Indices of ``n_neighbors`` near neighbours of each of ``rows``, excluding the row itself.
+
+        A row whose probed cells hold fewer other rows repeats the ones found.
+        """
+        result = np.empty((len(rows), n_neighbors), dtype=np.intp)
+        cells = self.labels_[rows]
+        by_cell = np.argsort(cells, kind='stable')
+        starts = np.flatnonzero(np.r_[True, cells[by_cell][1:] != cells[by_cell][:-1]])
+        for start, end in zip(starts, np.r_[starts[1:], len(rows)]):
+            positions = by_cell[start:end]
+            query = rows[positions]
+            members = np.concatenate([self.order_[self.bounds_[c]:self.bounds_[c + 1]]
+                                      for c in self.probes_[self.labels_[query[0]]]])
+            # Squared distances up to the query's own norm, which is the same along a row
+            distances = self.sq_norms_[members] - 2 * (self.X_[query] @ self.X_[members].T)
+            distances[query[:, None] == members[None, :]] = np.inf
+            found = min(n_neighbors, len(members) - 1)
+            if found < 1:
+                result[positions] = query[:, None]
+                continue
+            nearest = np.argpartition(distances, found - 1, axis=1)[:, :found]
+            result[positions] = members[nearest[:, np.arange(n_neighbors) % found]]
+        return result
+
+
+class _TreeIndex:
+    # Exact neighbours from a NearestNeighbors index, with the same interface
+
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+
+    def fit(self, X):
+        from sklearn.neighbors import NearestNeighbors
+
+        self.X_ = X
+        self.index_ = NearestNeighbors(algorithm=self.algorithm).fit(X)
+        return self
+
+    def neighbours(self, rows, n_neighbors):
+        # The nearest neighbour of a row is the row itself
+        return self.index_.kneighbors(self.X_[rows], n_neighbors + 1, return_distance=False)[:, 1:]
+
+
+class ChunkedSMOTE:
+    """SMOTE oversampling of every minority class up to the majority count.
+
+    ``algorithm`` is the neighbour index: ``'cluster'`` (``ClusterIndex``),
+    a ``NearestNeighbors`` algorithm (``'kd_tree'``, ``'ball_tree'`` or
+    ``'brute'``), or ``'auto'`` for a k-d tree up to ``AUTO_EXACT_ROWS``
+    minority rows and ``ClusterIndex`` above. Synthetic rows are generated
+    ``chunksize`` at a time.
+    """
+
+    def __init__(self, k_neighbors=DEFAULT_K_NEIGHBORS, algorithm='auto', chunksize=DEFAULT_CHUNKSIZE,
+                 random_state=1):
+        self.k_neighbors = k_neighbors
+        self.algorithm = algorithm
+        self.chunksize = chunksize
+        self.random_state = random_state
+
+    def get_params(self, deep=True):
+        return {'k_neighbors': self.k_neighbors, 'algorithm': self.algorithm, 'chunksize': self.chunksize,
+                'random_state': self.random_state}
+
+    def set_params(self, **params):
+        for name, value in params.items():
+            setattr(self, name, value)
+        return self
+
+    def _index(self, X):
+        algorithm = self.algorithm
+        if algorithm == 'auto':
+            algorithm = 'kd_tree' if len(X) <= AUTO_EXACT_ROWS else 'cluster'
+        if algorithm == 'cluster':
+            return ClusterIndex(random_state=self.random_state).fit(X)
+        return _TreeIndex(algorithm).fit(X)
+
+    def iter_samples(self, X, y):
+        """Yield ``(X_new, y_new)`` blocks of synthetic rows that balance ``X``/``y``."""
+        rng = np.random.default_rng(self.random_state)
+        classes, counts = np.unique(y, return_counts=True)
+        for k, count in zip(classes, counts):
+            n_new = counts.max() - count
+            if n_new == 0:
+                continue
+            X_k = X[y == k]
+            n_neighbors = min(self.k_neighbors, len(X_k) - 1)
+            if n_neighbors < 1:
+                raise ValueError(f'class {k} has {len(X_k)} sample(s); SMOTE needs at least 2')
+            index = self._index(X_k)
+            for start in range(0, n_new, self.chunksize):
+                size = min(self.chunksize, n_new - start)
+                base = rng.integers(len(X_k), size=size)
+                neighbours = index.neighbours(base, n_neighbors)
+                other = neighbours[np.arange(size), rng.integers(n_neighbors, size=size)]
+                gap = rng.random((size, 1), dtype=np.float32).astype(X.dtype, copy=False)
+                X_new = X_k[other] - X_k[base]
+                X_new *= gap
+                X_new += X_k[base]
+                yield X_new, np.full(size, k, dtype=y.dtype)
+
+    def fit_resample(self, X, y):
+        """``X``/``y`` followed by the synthetic rows, in one preallocated array."""
+        X = np.asarray(X)
+        y = np.asarray(y)
+        counts = np.unique(y, return_counts=True)[1]
+        n_total = counts.max() * len(counts)
+        X_out = np.empty((n_total, X.shape[1]), dtype=X.dtype)
+        y_out = np.empty(n_total, dtype=y.dtype)
+        X_out[:len(X)] = X
+        y_out[:len(y)] = y
+        position = len(X)
+        for X_new, y_new in self.iter_samples(X, y):
+            X_out[position:position + len(X_new)] = X_new
+            y_out[position:position + len(y_new)] = y_new
+            position += len(X_new)
+        return X_out, y_out
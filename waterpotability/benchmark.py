@@ -0,0 +1,216 @@
+"""Reproducible benchmark of every registered model.
+
+``run_benchmark`` trains each model in a fresh process on the same
+prepared data and records its quality (train/test accuracy, precision,
+recall, F1) next to its cost: fit time, single-row predict latency
+(p50/p99), batch throughput and the peak resident memory of the process.
+A fresh process per model keeps the peak RSS of one model from hiding
+another's and starts every model from the same state.
+
+Results are written as JSON (with the environment they were measured in)
+or CSV, charted from the file with ``plot_results``, and two runs are
+compared with ``compare_results`` to flag regressions.
+"""
+
+import datetime
+import inspect
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from .cache import data_hash
+from .data import load_dataset
+from .evaluation import fit_and_evaluate
+from .imputation import ClassMedianImputer
+from .preprocessing import prepare
+from .registry import get_model, model_keys
+
+DEFAULT_LATENCY_CALLS = 100
+DEFAULT_BATCH_ROWS = 10_000
+
+# Absolute drop in a score, and relative worsening of a cost, tolerated by compare_results
+DEFAULT_SCORE_TOLERANCE = 0.01
+DEFAULT_COST_TOLERANCE = 0.20
+
+SCORES = ('test_accuracy', 'precision', 'recall', 'f1')
+# Cost metrics and whether higher is better
+COSTS = {
+    'fit_time': False,
+    'latency_p50_ms': False,
+    'latency_p99_ms': False,
+    'throughput_rows_per_s': True,
+    'peak_rss_mb': False,
+}
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB (``None`` where unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def measure_latency(model, X, calls=DEFAULT_LATENCY_CALLS):
+    """p50 and p99 wall-clock latency of ``model.predict`` on single rows, in milliseconds."""
+    model.predict(X[:1])  # warm-up
+    latencies = np.empty(calls)
+    for i in range(calls):
+        row = X[i % len(X):i % len(X) + 1]
+        start = time.perf_counter()
+        model.predict(row)
+        latencies[i] = time.perf_counter() - start
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+    return p50, p99
+
+
+def measure_throughput(model, X, rows=DEFAULT_BATCH_ROWS, min_time=0.5):
+    """Rows per second of ``model.predict`` on a batch of ``rows`` rows tiled from ``X``."""
+    batch = np.resize(X, (rows, X.shape[1]))
+    calls, start = 0, time.perf_counter()
+    while True:
+        model.predict(batch)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls * rows / elapsed
+
+
+def benchmark_model(key, path, latency_calls=DEFAULT_LATENCY_CALLS, batch_rows=DEFAULT_BATCH_ROWS,
+                    use_cache=False):
+    """Train, evaluate and time the registered model ``key`` on the dataset at ``path``.
+
+    Models whose train function takes a ``cache_dir`` are trained uncached
+    unless ``use_cache`` is set, so ``fit_time`` measures training.
+    """
+    import warnings
+    warnings.filterwarnings('ignore')
+
+    data = prepare(ClassMedianImputer().fit_transform(load_dataset(path)))
+    spec = get_model(key)
+    kwargs = {}
+    if not use_cache and 'cache_dir' in inspect.signature(spec.train).parameters:
+        kwargs['cache_dir'] = None
+    model, metrics = fit_and_evaluate(spec, data, **kwargs)
+    p50, p99 = measure_latency(model, data.X_test, latency_calls)
+    return {
+        'model': key,
+        'name': spec.name,
+        'train_accuracy': metrics['train_accuracy'],
+        'test_accuracy': metrics['test_accuracy'],
+        'precision': metrics['precision'],
+        'recall': metrics['recall'],
+        'f1': metrics['f1'],
+        'fit_time': metrics['fit_time'],
+        'predict_time': metrics['predict_time'],
+        'latency_p50_ms': p50,
+        'latency_p99_ms': p99,
+        'throughput_rows_per_s': measure_throughput(model, data.X_test, batch_rows),
+        'peak_rss_mb': peak_rss_mb(),
+        'confusion_matrix': metrics['confusion_matrix'].tolist(),
+    }
+
+
+def run_benchmark(path, models=None, latency_calls=DEFAULT_LATENCY_CALLS, batch_rows=DEFAULT_BATCH_ROWS,
+                  use_cache=False, callback=None):
+    """Benchmark ``models`` (all registered by default), each in a fresh process.
+
+    Returns the run as a dict: the environment, the dataset and one result
+    per model. ``callback(result)`` is called as each model finishes.
+    """
+    from .persistence import library_versions
+
+    models = models or model_keys()
+    results = []
+    for key in models:
+        # spawn: a clean interpreter per model, so peak RSS is the model's own
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            result = pool.submit(benchmark_model, key, path, latency_calls, batch_rows, use_cache).result()
+        results.append(result)
+        if callback:
+            callback(result)
+
+    dataset = load_dataset(path)
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'environment': {
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'versions': library_versions({get_model(key).framework for key in models}),
+        },
+        'dataset': {'path': os.path.abspath(path), 'rows': len(dataset), 'hash': data_hash(dataset.to_numpy())},
+        'settings': {'latency_calls': latency_calls, 'batch_rows': batch_rows, 'use_cache': use_cache},
+        'results': results,
+    }
+
+
+def save_results(run, path):
+    """Write a benchmark run to ``path``: ``.json`` keeps the whole run, ``.csv`` the results table."""
+    if path.endswith('.csv'):
+        pd.DataFrame(run['results']).drop(columns='confusion_matrix').to_csv(path, index=False)
+    else:
+        with open(path, 'w') as f:
+            json.dump(run, f, indent=2)
+
+
+def load_results(path):
+    """Read the results table of a run saved by ``save_results``, indexed by model key."""
+    if path.endswith('.csv'):
+        results = pd.read_csv(path)
+    else:
+        with open(path) as f:
+            results = pd.DataFrame(json.load(f)['results'])
+    return results.set_index('model')
+
+
+def compare_results(baseline, current, score_tolerance=DEFAULT_SCORE_TOLERANCE,
+                    cost_tolerance=DEFAULT_COST_TOLERANCE):
+    """Compare two results tables (see ``load_results``) model by model.
+
+    A score regresses when it drops by more than ``score_tolerance``
+    (absolute); a cost regresses when it worsens by more than
+    ``cost_tolerance`` (relative). Returns one row per model and metric
+    with the change and a ``regression`` flag.
+    """
+    rows = []
+    for key in baseline.index.intersection(current.index):
+        for metric in SCORES:
+            before, after = baseline.at[key, metric], current.at[key, metric]
+            change = after - before
+            rows.append((key, metric, before, after, change, change < -score_tolerance))
+        for metric, higher_is_better in COSTS.items():
+            before, after = baseline.at[key, metric], current.at[key, metric]
+            if pd.isna(before) or pd.isna(after) or not before:
+                continue
+            change = after / before - 1
+            worse = -change if higher_is_better else change
+            rows.append((key, metric, before, after, change, worse > cost_tolerance))
+    return pd.DataFrame(rows, columns=['model', 'metric', 'baseline', 'current', 'change', 'regression'])
+
+
+def plot_results(results, out_dir=None):
+    """Draw the comparison charts from a results table; saved as PNGs to ``out_dir`` if given."""
+    from . import plotting
+
+    def path(name):
+        return os.path.join(out_dir, name) if out_dir else None
+
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    names = list(results['name'])
+    plotting.plot_accuracy_comparison(names, results['train_accuracy'], results['test_accuracy'],
+                                      path=path('accuracy.png'))
+    plotting.plot_score_comparison(names, results['precision'], results['recall'], results['f1'],
+                                   path=path('scores.png'))
+    plotting.plot_cost_comparison(names, results, path=path('costs.png'))
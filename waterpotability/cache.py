@@ -0,0 +1,52 @@
+"""On-disk cache of fitted estimators, keyed by a hash of their inputs.
+
+A cache key combines the bytes of the training arrays with a description of
+the parameters, so reruns on the same data with the same settings load the
+fitted object instead of training again, and any change misses the cache.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.environ.get('WATERPOTABILITY_CACHE_DIR', '.waterpotability_cache')
+
+
+def data_hash(*arrays):
+    """SHA-256 over the shape, dtype and contents of ``arrays``."""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f'{array.shape}{array.dtype.str}'.encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+def cache_key(arrays, params):
+    """Key for a fit of ``params`` (any JSON-serialisable value) on ``arrays``."""
+    import sklearn
+
+    description = json.dumps({'params': params, 'sklearn': sklearn.__version__}, sort_keys=True, default=str)
+    return hashlib.sha256((data_hash(*arrays) + description).encode()).hexdigest()[:32]
+
+
+def cached_fit(name, key, fit, cache_dir=DEFAULT_CACHE_DIR):
+    """Return the object cached as ``name``/``key``, or call ``fit()`` and cache its result.
+
+    ``cache_dir=None`` disables caching.
+    """
+    import joblib
+
+    if cache_dir is None:
+        return fit()
+    path = os.path.join(cache_dir, f'{name}-{key}.joblib')
+    if os.path.exists(path):
+        return joblib.load(path)
+    result = fit()
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary name first so an interrupted dump is never loaded
+    joblib.dump(result, path + '.tmp')
+    os.replace(path + '.tmp', path)
+    return result
@@ -0,0 +1,111 @@
+"""Binary checkpoints of intermediate frames.
+
+Stages pass frames to each other in memory. A checkpoint is only written
+when asked for, in a binary format chosen by the file suffix:
+
+- ``.feather`` / ``.arrow``: Arrow IPC, memory-mapped on load (needs pyarrow)
+- ``.parquet``: compressed columnar (needs pyarrow)
+- ``.npy``: one float32 matrix of ``INPUT_COLS + [TARGET]``, memory-mapped
+  on load without copying the features
+
+The fitted imputer is stored next to the checkpoint as ``<path>.imputer.json``
+so a warm restart needs neither the CSV nor a refit. ``<path>.source.json``
+records what the checkpoint was made from (``checkpoint_source``): the CSV's
+path, size and modification time, and the imputer method. A checkpoint is
+only reused for the same source; if the CSV is gone, its path and the
+imputer method must still match.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .data import INPUT_COLS, TARGET
+from .imputation import ClassMedianImputer
+
+FORMATS = ('.feather', '.arrow', '.parquet', '.npy')
+
+
+def _format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"unsupported checkpoint format {ext!r}; use one of {', '.join(FORMATS)}")
+    return ext
+
+
+def _imputer_path(path):
+    return f'{path}.imputer.json'
+
+
+def _source_path(path):
+    return f'{path}.source.json'
+
+
+def checkpoint_source(data_path, imputer_method):
+    """What a checkpoint of the CSV at ``data_path`` imputed with ``imputer_method`` is made from."""
+    source = {'path': os.path.abspath(data_path), 'imputer_method': imputer_method}
+    if os.path.exists(data_path):
+        info = os.stat(data_path)
+        source.update(size=info.st_size, mtime_ns=info.st_mtime_ns)
+    return source
+
+
+def _same_source(saved, source):
+    # Size and modification time only count when the CSV is there to check
+    return all(saved.get(name) == value for name, value in source.items())
+
+
+def save_frame(dataset, path):
+    """Write ``dataset`` to the binary checkpoint at ``path``."""
+    ext = _format(path)
+    if ext == '.npy':
+        np.save(path, dataset[INPUT_COLS + [TARGET]].to_numpy(np.float32))
+    elif ext == '.parquet':
+        dataset.to_parquet(path, index=False)
+    else:
+        dataset.reset_index(drop=True).to_feather(path, compression='uncompressed')
+
+
+def load_frame(path):
+    """Read a checkpoint written by ``save_frame`` without parsing text."""
+    ext = _format(path)
+    if ext == '.npy':
+        # The features wrap the float32 memmap without copying; only the
+        # target is copied, back to the integer labels it was saved from
+        matrix = np.load(path, mmap_mode='r')
+        frame = pd.DataFrame(matrix[:, :-1], columns=INPUT_COLS, copy=False)
+        frame[TARGET] = matrix[:, -1].astype(np.int64)
+        return frame
+    if ext == '.parquet':
+        return pd.read_parquet(path)
+    import pyarrow.feather as feather
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+def save_checkpoint(dataset, imputer, path, source=None):
+    """Checkpoint the imputed frame and its fitted imputer, made from ``source`` (``checkpoint_source``)."""
+    save_frame(dataset, path)
+    imputer.save(_imputer_path(path))
+    with open(_source_path(path), 'w') as f:
+        json.dump(source, f)
+
+
+def load_checkpoint(path, source=None):
+    """Return ``(dataset, imputer)`` from ``save_checkpoint``, or None if absent.
+
+    With ``source``, also None when the checkpoint was made from another
+    source, or its source is unknown.
+    """
+    if not (os.path.exists(path) and os.path.exists(_imputer_path(path))):
+        return None
+    if source is not None:
+        try:
+            with open(_source_path(path)) as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return None
+        if not saved or not _same_source(saved, source):
+            return None
+    return load_frame(path), ClassMedianImputer.load(_imputer_path(path))
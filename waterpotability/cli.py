@@ -0,0 +1,264 @@
+"""Command line entry point: ``python -m waterpotability``."""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+from .data import DEFAULT_CHUNKSIZE, DEFAULT_DATASET_PATH
+from .registry import model_keys
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='waterpotability',
+                                     description='Water potability classification pipeline.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    train = sub.add_parser('train', help='train and evaluate the models')
+    train.add_argument('--data', default=DEFAULT_DATASET_PATH, help='path to water_potability.csv')
+    train.add_argument('--models', nargs='+', choices=model_keys(), metavar='MODEL',
+                       help='model keys to run (default: all)')
+    train.add_argument('--plot', action='store_true', help='show the EDA and evaluation plots')
+    train.add_argument('--checkpoint', metavar='PATH',
+                       help='binary checkpoint of the imputed data (.feather, .parquet or .npy); '
+                            'reused when it exists')
+    train.add_argument('--jobs', type=int, default=1, metavar='N',
+                       help='train independent models in N processes (0: one per CPU)')
+    train.add_argument('--export-hybrid', metavar='PATH',
+                       help='save the trained hybrid model as a pure-NumPy artifact (.npz)')
+    train.add_argument('--export-dir', metavar='DIR',
+                       help='export the trained ANN, hybrid and LSTM + MLP models for scoring without TensorFlow')
+    train.add_argument('--export-format', choices=['numpy', 'numpy-int8', 'tflite', 'tflite-int8'],
+                       default='numpy', help='format of --export-dir')
+    train.add_argument('--save', metavar='DIR', help='save the imputer, scaler and trained models for scoring')
+    train.add_argument('--imputer', choices=['exact', 'sketch'], default='exact',
+                       help='exact medians, or quantile sketches that update can refine with new samples')
+
+    cv = sub.add_parser('cv', help='evaluate the models with repeated stratified k-fold cross-validation')
+    cv.add_argument('--data', default=DEFAULT_DATASET_PATH, help='path to water_potability.csv')
+    cv.add_argument('--models', nargs='+', choices=model_keys(), metavar='MODEL',
+                    help='model keys to run (default: all)')
+    cv.add_argument('--folds', type=int, default=5, help='folds per repeat')
+    cv.add_argument('--repeats', type=int, default=2, help='repeats with different shuffles')
+    cv.add_argument('--jobs', type=int, default=1, metavar='N', help='evaluate folds in N processes (0: one per CPU)')
+    cv.add_argument('--out', metavar='PATH', help='save the per-fold results as CSV')
+
+    tune = sub.add_parser('tune', help='search the hyperparameters of the models, with memoized trials')
+    tune.add_argument('--data', default=DEFAULT_DATASET_PATH, help='path to water_potability.csv')
+    tune.add_argument('--models', nargs='+', choices=model_keys(), metavar='MODEL',
+                      help='model keys to tune (default: all)')
+    tune.add_argument('--trials', type=int, default=20, help='parameter settings sampled per model')
+    tune.add_argument('--folds', type=int, default=3, help='cross-validation folds per trial')
+    tune.add_argument('--metric', choices=['accuracy', 'precision', 'recall', 'f1'], default='accuracy')
+    tune.add_argument('--no-prune', action='store_true', help='evaluate every fold of every trial')
+    tune.add_argument('--jobs', type=int, default=0, metavar='N', help='worker processes (0: one per CPU)')
+    tune.add_argument('--out', metavar='PATH',
+                      help='save the best parameters per model as JSON (advisory: training does not read it)')
+
+    score = sub.add_parser('score', help='score a sample file with saved models')
+    score.add_argument('input', help='CSV or Parquet file with the nine input columns')
+    score.add_argument('output', help='CSV or Parquet file for predictions and probabilities')
+    score.add_argument('--artifacts', required=True, metavar='DIR', help='directory written by train --save')
+    score.add_argument('--model', required=True, choices=model_keys(), help='saved model to score with')
+    score.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='rows per batch')
+    score.add_argument('--jobs', type=int, default=1, metavar='N',
+                       help='split a CSV input by byte ranges across N processes (0: one per CPU)')
+
+    serve = sub.add_parser('serve', help='serve saved models over HTTP with micro-batching')
+    serve.add_argument('--artifacts', required=True, metavar='DIR', help='directory written by train --save')
+    serve.add_argument('--model', required=True, choices=model_keys(), help='saved model to serve')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--max-batch', type=int, default=256, help='largest micro-batch in samples')
+    serve.add_argument('--batch-window-ms', type=float, default=2.0,
+                       help='how long the first request of a batch waits for others')
+    serve.add_argument('--compile', action='store_true',
+                       help='score tree models (rf, dt, xgb) with their compiled arrays')
+
+    update = sub.add_parser('update', help='update a saved model with new labelled samples')
+    update.add_argument('input', help='CSV or Parquet file of new samples with Potability')
+    update.add_argument('--artifacts', required=True, metavar='DIR', help='directory written by train --save')
+    update.add_argument('--model', required=True, choices=['nb', 'svm_approx', 'ann', 'lstm_mlp', 'xgb'],
+                        help='saved model to update')
+    update.add_argument('--output', metavar='DIR', help='save the updated artifacts here (default: in place)')
+    update.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='rows per update')
+    update.add_argument('--update-scaler', action='store_true',
+                        help='widen the scaler min/max to the new samples (the model keeps its old scaling)')
+    update.add_argument('--epochs', type=int, default=1, help='Keras epochs per block')
+    update.add_argument('--rounds', type=int, default=10, help='XGBoost boosting rounds per block')
+
+    eda = sub.add_parser('eda', help='summary statistics and EDA plots of a file of any size, in one pass')
+    eda.add_argument('input', help='CSV or Parquet file with the nine input columns and Potability')
+    eda.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='rows read per block')
+    eda.add_argument('--plot-dir', metavar='DIR', help='save the correlation and boxplot charts here as PNGs')
+    eda.add_argument('--no-cache', action='store_true', help='recompute instead of reusing cached statistics')
+
+    synth = sub.add_parser('synthesize', help='write a synthetic dataset of any size fitted to the real one')
+    synth.add_argument('output', help='CSV or Parquet file to write')
+    synth.add_argument('--rows', type=int, required=True, help='number of rows to generate')
+    synth.add_argument('--data', default=DEFAULT_DATASET_PATH, help='real dataset to fit the generator to')
+    synth.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='rows generated per block')
+    synth.add_argument('--seed', type=int, default=0)
+
+    bench = sub.add_parser('benchmark', help='benchmark the models and compare benchmark runs')
+    actions = bench.add_subparsers(dest='action', required=True)
+    bench_run = actions.add_parser('run', help='train, evaluate and time every model, each in a fresh process')
+    bench_run.add_argument('--data', default=DEFAULT_DATASET_PATH, help='path to water_potability.csv')
+    bench_run.add_argument('--models', nargs='+', choices=model_keys(), metavar='MODEL',
+                           help='model keys to run (default: all)')
+    bench_run.add_argument('--out', default='benchmark.json', help='results file (.json or .csv)')
+    bench_run.add_argument('--latency-calls', type=int, default=100, help='single-row predictions timed per model')
+    bench_run.add_argument('--batch-rows', type=int, default=10_000, help='batch size for the throughput test')
+    bench_run.add_argument('--use-cache', action='store_true', help='allow cached fits (see cache.py)')
+    bench_plot = actions.add_parser('plot', help='draw the comparison charts from a results file')
+    bench_plot.add_argument('results', help='results file written by benchmark run')
+    bench_plot.add_argument('--out-dir', help='save the charts as PNGs here instead of showing them')
+    bench_compare = actions.add_parser('compare', help='flag regressions between two results files')
+    bench_compare.add_argument('baseline')
+    bench_compare.add_argument('current')
+    bench_compare.add_argument('--score-tolerance', type=float, default=0.01,
+                               help='largest tolerated absolute drop in accuracy, precision, recall or F1')
+    bench_compare.add_argument('--cost-tolerance', type=float, default=0.20,
+                               help='largest tolerated relative worsening of a time, throughput or memory cost')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    if args.command == 'train':
+        from .pipeline import run
+        run(args.data, models=args.models, plot=args.plot, checkpoint=args.checkpoint,
+            n_jobs=args.jobs or None, export_hybrid=args.export_hybrid, save=args.save,
+            imputer_method=args.imputer, export_dir=args.export_dir, export_format=args.export_format)
+    elif args.command == 'cv':
+        cross_validate(args)
+    elif args.command == 'tune':
+        search(args)
+    elif args.command == 'score':
+        from .score import score_file
+
+        rows, seconds = score_file(args.input, args.output, args.artifacts, args.model,
+                                   chunksize=args.chunksize, n_jobs=args.jobs or os.cpu_count())
+        print(f'{rows:,} rows in {seconds:.2f}s ({rows / seconds:,.0f} rows/sec)', file=sys.stderr)
+    elif args.command == 'serve':
+        from .serve import serve
+
+        serve(args.artifacts, args.model, args.host, args.port, max_batch=args.max_batch,
+              batch_window=args.batch_window_ms / 1e3, compile_trees=args.compile)
+    elif args.command == 'update':
+        from .online import update_artifacts
+
+        start = time.perf_counter()
+        try:
+            rows = update_artifacts(args.input, args.artifacts, args.model, args.output, chunksize=args.chunksize,
+                                    update_scaler=args.update_scaler, epochs=args.epochs,
+                                    update_rounds=args.rounds)
+        except ValueError as error:
+            # e.g. updating in place a bundle that holds other models
+            parser.error(f'update: {error}')
+        print(f'{args.model} updated with {rows:,} rows in {time.perf_counter() - start:.2f}s', file=sys.stderr)
+    elif args.command == 'eda':
+        explore_file(args)
+    elif args.command == 'synthesize':
+        from .data import load_dataset
+        from .synthetic import SyntheticGenerator, write_synthetic
+
+        start = time.perf_counter()
+        generator = SyntheticGenerator().fit(load_dataset(args.data))
+        rows = write_synthetic(generator, args.output, args.rows, chunksize=args.chunksize, seed=args.seed)
+        seconds = time.perf_counter() - start
+        print(f'{rows:,} rows in {seconds:.2f}s ({rows / seconds:,.0f} rows/sec)', file=sys.stderr)
+    elif args.command == 'benchmark':
+        return benchmark(args)
+    return 0
+
+
+def cross_validate(args):
+    import pandas as pd
+
+    from . import crossval
+    from .data import load_dataset
+
+    start = time.perf_counter()
+    folds = crossval.cross_validate(load_dataset(args.data), models=args.models, n_splits=args.folds,
+                                    n_repeats=args.repeats, n_jobs=args.jobs or None)
+    if args.out:
+        folds.to_csv(args.out, index=False)
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(crossval.summarize(folds).round(4))
+    print(f'{len(folds)} fits in {time.perf_counter() - start:.1f}s', file=sys.stderr)
+
+
+def search(args):
+    import pandas as pd
+
+    from . import tuning
+    from .data import load_dataset
+    from .pipeline import preprocess
+
+    data, _ = preprocess(load_dataset(args.data))
+    start = time.perf_counter()
+    # Tuned on the training rows only; the test rows stay unseen
+    trials = tuning.tune(data.X_train, data.y_train, models=args.models, n_trials=args.trials,
+                         n_splits=args.folds, metric=args.metric, prune=not args.no_prune,
+                         n_jobs=args.jobs or None)
+    if args.out:
+        tuning.save_best(trials, args.out)
+    with pd.option_context('display.width', 200, 'display.max_columns', None, 'display.max_colwidth', 80):
+        print(tuning.summarize(trials).round(4))
+    print(f'{len(trials)} trials in {time.perf_counter() - start:.1f}s', file=sys.stderr)
+
+
+def explore_file(args):
+    import pandas as pd
+
+    from .cache import DEFAULT_CACHE_DIR
+    from .eda import stats_from_file
+
+    start = time.perf_counter()
+    stats = stats_from_file(args.input, chunksize=args.chunksize,
+                            cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(stats.value_counts())
+        print(stats.describe())
+        print(stats.correlation().round(3))
+    print(f'{stats.rows:,} rows in {time.perf_counter() - start:.2f}s', file=sys.stderr)
+    if args.plot_dir:
+        from . import plotting
+
+        os.makedirs(args.plot_dir, exist_ok=True)
+        for plot, name in [(plotting.plot_correlation_with_potability, 'correlation_potability.png'),
+                           (plotting.plot_correlation_heatmap, 'correlation_heatmap.png'),
+                           (plotting.plot_boxplots, 'boxplots.png')]:
+            plot(stats, os.path.join(args.plot_dir, name))
+
+
+def benchmark(args):
+    from . import benchmark as bench
+
+    if args.action == 'run':
+        def report(result):
+            print(f"{result['name']}: test accuracy {result['test_accuracy']:.4f}, fit {result['fit_time']:.2f}s, "
+                  f"p50 {result['latency_p50_ms']:.2f} ms, {result['throughput_rows_per_s']:,.0f} rows/s, "
+                  f"peak RSS {result['peak_rss_mb'] or float('nan'):.0f} MiB", file=sys.stderr)
+
+        run = bench.run_benchmark(args.data, args.models, latency_calls=args.latency_calls,
+                                  batch_rows=args.batch_rows, use_cache=args.use_cache, callback=report)
+        bench.save_results(run, args.out)
+        print(f'results written to {args.out}', file=sys.stderr)
+    elif args.action == 'plot':
+        bench.plot_results(bench.load_results(args.results), args.out_dir)
+    else:
+        comparison = bench.compare_results(bench.load_results(args.baseline), bench.load_results(args.current),
+                                           args.score_tolerance, args.cost_tolerance)
+        print(comparison.to_string(index=False, float_format='{:.4g}'.format))
+        regressions = comparison[comparison['regression']]
+        if len(regressions):
+            print(f"\n{len(regressions)} regression(s): "
+                  + ', '.join(f'{m}.{k}' for m, k in zip(regressions['model'], regressions['metric'])))
+            return 1
+    return 0
@@ -0,0 +1,147 @@
+"""Repeated stratified k-fold cross-validation of the registered models.
+
+Each fold gets its own preprocessing: the imputer and scaler are fitted on
+the fold's training rows only, and its test rows are imputed without their
+label (with the training medians of the whole column), so nothing about
+the scored rows is learned. The prepared folds are computed once, cached on
+disk (see ``cache``) and shared by every model. All fold matrices are
+copied into one shared memory block and the (model, fold) tasks run in a
+process pool as in ``parallel``; Keras models train in the parent process
+meanwhile.
+
+``cross_validate`` returns one row of metrics and timings per model and
+fold; ``summarize`` reduces them to the mean and spread per model.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from .cache import DEFAULT_CACHE_DIR, cache_key, cached_fit
+from .data import INPUT_COLS, TARGET
+from .evaluation import fit_and_evaluate
+from .imputation import ClassMedianImputer
+from .parallel import IN_PROCESS_FRAMEWORKS, SharedArray, _attach
+from .preprocessing import PreparedData
+from .registry import get_model, model_keys
+
+DEFAULT_SPLITS = 5
+DEFAULT_REPEATS = 2
+
+METRICS = ['train_accuracy', 'test_accuracy', 'precision', 'recall', 'f1']
+TIMINGS = ['preprocess_time', 'fit_time', 'predict_time']
+
+
+def fold_indices(y, n_splits=DEFAULT_SPLITS, n_repeats=DEFAULT_REPEATS, random_state=1):
+    """``(train_idx, test_idx)`` of every fold of ``n_repeats`` stratified ``n_splits``-fold splits."""
+    from sklearn.model_selection import RepeatedStratifiedKFold
+
+    cv = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+    return list(cv.split(np.zeros(len(y)), y))
+
+
+def prepare_fold(dataset, train_idx, test_idx):
+    """Impute and scale one fold, fitted on its training rows; returns ``PreparedData``."""
+    from sklearn.preprocessing import MinMaxScaler
+
+    train = dataset.iloc[train_idx]
+    imputer = ClassMedianImputer().fit(train)
+    X_train = imputer.transform(train)[INPUT_COLS].to_numpy(np.float32)
+    X_test = imputer.transform(dataset.iloc[test_idx].drop(columns=TARGET))[INPUT_COLS].to_numpy(np.float32)
+    scaler = MinMaxScaler().fit(X_train)
+    X = scaler.transform(np.concatenate([X_train, X_test])).astype(np.float32, copy=False)
+    y = dataset[TARGET].to_numpy()[np.concatenate([train_idx, test_idx])]
+    return PreparedData.from_ordered(X, y, train_idx, test_idx, scaler)
+
+
+def prepare_folds(dataset, folds, cache_dir=DEFAULT_CACHE_DIR):
+    """``prepare_fold`` for every fold, cached on disk per fold.
+
+    Returns the prepared folds and the seconds each took (near zero when
+    cached).
+    """
+    raw = [dataset[INPUT_COLS].to_numpy(), dataset[TARGET].to_numpy()]
+    prepared, seconds = [], []
+    for train_idx, test_idx in folds:
+        start = time.perf_counter()
+        prepared.append(cached_fit('cv-fold', cache_key(raw + [train_idx, test_idx], ['impute', 'minmax']),
+                                   lambda: prepare_fold(dataset, train_idx, test_idx), cache_dir=cache_dir))
+        seconds.append(time.perf_counter() - start)
+    return prepared, seconds
+
+
+def _evaluate_shared(key, X_spec, y_spec, fold, train_idx, test_idx, scaler):
+    X_shm, X = _attach(X_spec)
+    y_shm, y = _attach(y_spec)
+    data = PreparedData.from_ordered(X[fold], y[fold], train_idx, test_idx, scaler)
+    try:
+        # Only the metrics go back to the parent, not the fitted model
+        return fit_and_evaluate(get_model(key), data)[1]
+    finally:
+        del data, X, y
+        X_shm.close()
+        y_shm.close()
+
+
+def _evaluate_parallel(tasks, prepared, n_jobs):
+    # Returns {(key, fold): metrics}
+    pooled = [(key, i) for key, i in tasks if get_model(key).framework not in IN_PROCESS_FRAMEWORKS]
+    results = {}
+    # Every fold holds all rows (training rows first), so they stack into one block
+    X_shared = SharedArray(np.stack([data.X for data in prepared]))
+    y_shared = SharedArray(np.stack([data.y for data in prepared]))
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, min(n_jobs or os.cpu_count(), len(pooled))),
+                                 mp_context=get_context('spawn')) as pool:
+            futures = {(key, i): pool.submit(_evaluate_shared, key, X_shared.spec, y_shared.spec, i,
+                                             prepared[i].train_idx, prepared[i].test_idx, prepared[i].scaler)
+                       for key, i in pooled}
+            for key, i in tasks:
+                if (key, i) not in futures:
+                    results[key, i] = fit_and_evaluate(get_model(key), prepared[i])[1]
+            for task, future in futures.items():
+                results[task] = future.result()
+    finally:
+        X_shared.release()
+        y_shared.release()
+    return results
+
+
+def cross_validate(dataset, models=None, n_splits=DEFAULT_SPLITS, n_repeats=DEFAULT_REPEATS, random_state=1,
+                   n_jobs=1, cache_dir=DEFAULT_CACHE_DIR):
+    """Evaluate ``models`` (all by default) on every fold of the raw labelled ``dataset``.
+
+    Folds run in up to ``n_jobs`` worker processes (``None`` for one per
+    CPU). Returns a DataFrame with one row per model and fold: ``model``,
+    ``repeat``, ``fold``, ``METRICS`` and ``TIMINGS`` in seconds.
+    """
+    models = models or model_keys()
+    folds = fold_indices(dataset[TARGET].to_numpy(), n_splits, n_repeats, random_state)
+    prepared, preprocess_times = prepare_folds(dataset, folds, cache_dir)
+
+    tasks = [(key, i) for key in models for i in range(len(folds))]
+    if n_jobs == 1:
+        results = {(key, i): fit_and_evaluate(get_model(key), prepared[i])[1] for key, i in tasks}
+    else:
+        results = _evaluate_parallel(tasks, prepared, n_jobs)
+
+    rows = []
+    for key, i in tasks:
+        metrics = results[key, i]
+        rows.append(dict({'model': key, 'repeat': i // n_splits, 'fold': i % n_splits},
+                         **{name: metrics[name] for name in METRICS},
+                         preprocess_time=preprocess_times[i], fit_time=metrics['fit_time'],
+                         predict_time=metrics['predict_time']))
+    return pd.DataFrame(rows)
+
+
+def summarize(folds, stats=('mean', 'std')):
+    """Per-model ``stats`` (any ``DataFrame.agg`` names, e.g. ``'var'``) of the fold metrics and timings."""
+    summary = folds.groupby('model', sort=False)[METRICS + TIMINGS].agg(list(stats))
+    summary.columns = [f'{column}_{stat}' for column, stat in summary.columns]
+    summary.index = [get_model(key).name for key in summary.index]
+    return summary
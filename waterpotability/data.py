@@ -0,0 +1,142 @@
+"""Reading and writing the water potability dataset."""
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+# The nine water quality parameters used as model inputs
+INPUT_COLS = ['ph', 'Hardness', 'Solids', 'Chloramines', 'Sulfate', 'Conductivity',
+              'Organic_carbon', 'Trihalomethanes', 'Turbidity']
+
+# 1 = potable, 0 = non-potable
+TARGET = 'Potability'
+
+# Columns with missing values, filled by class-conditional medians
+NULL_COLS = ['ph', 'Sulfate', 'Trihalomethanes']
+
+DEFAULT_DATASET_PATH = 'water_potability.csv'
+
+# Explicit dtypes for chunked reads, so pandas does not infer float64 per block
+FEATURE_DTYPES = {col: np.float32 for col in INPUT_COLS}
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def load_dataset(path=DEFAULT_DATASET_PATH):
+    """Read the raw dataset from ``path`` into a DataFrame."""
+    return pd.read_csv(path)
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of the bytes ``[start, end)`` of a file."""
+
+    def __init__(self, path, start, end):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self._file.readinto(memoryview(buffer)[:min(len(buffer), self._remaining)])
+        self._remaining -= n
+        return n
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _line_start(f, offset):
+    """Offset of the first line that starts at or after ``offset``."""
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    f.readline()
+    return f.tell()
+
+
+def csv_byte_ranges(path, n):
+    """Split the data rows of the CSV at ``path`` into ``n`` line-aligned byte ranges."""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.readline()
+        header_end = f.tell()
+        bounds = [header_end] + [max(header_end, _line_start(f, header_end + (size - header_end) * i // n))
+                                 for i in range(1, n)] + [size]
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def iter_chunks(path=DEFAULT_DATASET_PATH, chunksize=DEFAULT_CHUNKSIZE, with_target=True, byte_range=None):
+    """Yield fixed-size blocks of ``INPUT_COLS`` (and ``TARGET``) from the CSV or Parquet file at ``path``.
+
+    Features are read as float32. Only one block of ``chunksize`` rows is
+    held in memory at a time. Set ``with_target=False`` for unlabelled files.
+    ``byte_range`` restricts a CSV to the rows in ``[start, end)`` as returned
+    by ``csv_byte_ranges``, so several processes can share one file.
+    """
+    usecols = INPUT_COLS + [TARGET] if with_target else INPUT_COLS
+    dtype = dict(FEATURE_DTYPES, **({TARGET: np.int8} if with_target else {}))
+
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=usecols):
+            yield batch.to_pandas().astype(dtype)[usecols]
+        return
+
+    if byte_range is None:
+        source, names, header = path, None, 'infer'
+    else:
+        names = pd.read_csv(path, nrows=0).columns.tolist()
+        source, header = io.BufferedReader(_ByteRange(path, *byte_range)), None
+    try:
+        with pd.read_csv(source, names=names, header=header, usecols=usecols, dtype=dtype,
+                         chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk[usecols]
+    finally:
+        if byte_range is not None:
+            source.close()
+
+
+class _CsvWriter:
+
+    def __init__(self, path, header=True):
+        self._file = open(path, 'w', newline='')
+        self._header = header
+
+    def write(self, frame):
+        frame.to_csv(self._file, header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+
+    def __init__(self, path):
+        self._path = path
+        self._writer = None
+
+    def write(self, frame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_writer(path, header=True):
+    """Writer appending DataFrames to the CSV or Parquet file at ``path``; call ``close()`` when done."""
+    return _ParquetWriter(path) if path.endswith('.parquet') else _CsvWriter(path, header)
@@ -0,0 +1,57 @@
+"""Export the RF + DNN hybrid as a single pure-NumPy inference artifact.
+
+The forest is compiled into ``trees.CompiledForest`` arrays and the DNN is
+converted with BatchNormalization folded in and Dropout stripped
+(``mlp.NumpyMLP``). Both are saved in one ``.npz`` file, and scoring from it
+needs neither scikit-learn nor TensorFlow. The DNN may also be any model
+with ``predict_proba`` and ``to_arrays``, such as the TFLite model of
+``export.TFLiteClassifier`` (stored as ``dnn_tflite``).
+"""
+
+import numpy as np
+
+from .mlp import NumpyMLP
+from .trees import CompiledForest
+
+
+class CompiledHybrid:
+
+    def __init__(self, forest, mlp):
+        self.forest = forest
+        self.mlp = mlp
+
+    @classmethod
+    def from_model(cls, model):
+        """Compile a fitted ``models.HybridModel``."""
+        return cls(CompiledForest.from_sklearn(model.rf_model), NumpyMLP.from_keras(model.dnn_model.model))
+
+    def predict_proba(self, X):
+        return self.mlp.predict_proba(self.forest.predict_proba(X))
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+    def to_arrays(self):
+        return {**self.forest.to_arrays('rf_'), **self.mlp.to_arrays('dnn_')}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        if 'dnn_tflite' in arrays:
+            from .export import TFLiteClassifier
+            return cls(CompiledForest.from_arrays(arrays, 'rf_'), TFLiteClassifier.from_arrays(arrays, 'dnn_'))
+        return cls(CompiledForest.from_arrays(arrays, 'rf_'), NumpyMLP.from_arrays(arrays, 'dnn_'))
+
+    def save(self, path):
+        np.savez(path, **self.to_arrays())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            return cls.from_arrays(arrays)
+
+
+def export_hybrid(model, path):
+    """Compile the hybrid ``model`` and save it to ``path`` (``.npz``)."""
+    compiled = CompiledHybrid.from_model(model)
+    compiled.save(path)
+    return compiled
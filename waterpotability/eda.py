@@ -0,0 +1,203 @@
+"""Exploratory data analysis statistics in one streaming pass.
+
+``EDAStats`` accumulates, block by block, everything the EDA tables and
+plots need: row and missing counts, min/max, means, the pairwise
+covariance and Pearson correlation (over the rows where both columns are
+present, like ``DataFrame.corr``), quantiles from a ``QuantileSketch`` per
+column, and the class counts of ``Potability``. Accumulators of disjoint
+blocks can be merged, and only one block is held in memory at a time, so
+files larger than memory can be explored.
+
+The pairwise sums are kept around a per-column shift (the means of the
+first block) so that the variances do not lose precision to large means.
+``stats_from_file`` caches the result on disk, keyed by the file's path,
+size and modification time.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .cache import DEFAULT_CACHE_DIR, cached_fit
+from .data import DEFAULT_CHUNKSIZE, INPUT_COLS, TARGET, iter_chunks
+from .sketch import QuantileSketch
+
+STATS_COLS = INPUT_COLS + [TARGET]
+DEFAULT_EPSILON = 0.001
+
+
+class EDAStats:
+    """Mergeable summary statistics of ``columns``.
+
+    ``pair_count[i, j]`` counts the rows where columns ``i`` and ``j`` are
+    both present; ``pair_sum[i, j]`` and ``pair_sq[i, j]`` are the sums of
+    ``x_i - shift_i`` and its square over those rows, and ``cross[i, j]``
+    the sum of ``(x_i - shift_i) * (x_j - shift_j)``.
+    """
+
+    def __init__(self, columns=STATS_COLS, epsilon=DEFAULT_EPSILON):
+        self.columns = list(columns)
+        self.epsilon = epsilon
+        d = len(self.columns)
+        self.rows = 0
+        self.missing = np.zeros(d, dtype=np.int64)
+        self.min = np.full(d, np.inf)
+        self.max = np.full(d, -np.inf)
+        self.shift = None
+        self.pair_count = np.zeros((d, d), dtype=np.int64)
+        self.pair_sum = np.zeros((d, d))
+        self.pair_sq = np.zeros((d, d))
+        self.cross = np.zeros((d, d))
+        self.sketches = [QuantileSketch(epsilon, seed=j) for j in range(d)]
+        self.class_counts = {}
+
+    def update(self, frame):
+        """Add the rows of a DataFrame block."""
+        X = frame[self.columns].to_numpy(np.float64)
+        present = ~np.isnan(X)
+        if not len(X):
+            return self
+        if self.shift is None:
+            self.shift = np.where(present, X, 0).sum(axis=0) / np.maximum(present.sum(axis=0), 1)
+        Z = np.where(present, X - self.shift, 0.0)
+        P = present.astype(np.float64)
+        self.pair_count += np.rint(P.T @ P).astype(np.int64)
+        self.pair_sum += Z.T @ P
+        self.pair_sq += (Z * Z).T @ P
+        self.cross += Z.T @ Z
+        self.missing += len(X) - present.sum(axis=0)
+        self.min = np.fmin(self.min, np.where(present, X, np.inf).min(axis=0))
+        self.max = np.fmax(self.max, np.where(present, X, -np.inf).max(axis=0))
+        for sketch, values in zip(self.sketches, X.T):
+            sketch.update(values)
+        if TARGET in frame:
+            for k, count in frame[TARGET].value_counts().items():
+                self.class_counts[int(k)] = self.class_counts.get(int(k), 0) + int(count)
+        self.rows += len(X)
+        return self
+
+    def merge(self, other):
+        """Fold ``other`` (statistics of disjoint rows with the same columns) into these."""
+        if other.columns != self.columns:
+            raise ValueError('cannot merge statistics of different columns')
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift.copy()
+        # Re-centre the other sums on this shift: x - a = (x - b) + (b - a)
+        delta = other.shift - self.shift
+        n = other.pair_count
+        s = other.pair_sum
+        self.pair_count += n
+        self.pair_sum += s + delta[:, None] * n
+        self.pair_sq += other.pair_sq + 2 * delta[:, None] * s + delta[:, None] ** 2 * n
+        self.cross += other.cross + delta[None, :] * s + delta[:, None] * s.T + np.outer(delta, delta) * n
+        self.missing += other.missing
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+        for k, count in other.class_counts.items():
+            self.class_counts[k] = self.class_counts.get(k, 0) + count
+        self.rows += other.rows
+        return self
+
+    def _frame(self, values):
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def count(self):
+        return pd.Series(self.rows - self.missing, index=self.columns)
+
+    def missing_counts(self):
+        return pd.Series(self.missing, index=self.columns)
+
+    def value_counts(self):
+        """Rows per ``Potability`` class, largest first, like ``Series.value_counts``."""
+        counts = pd.Series(self.class_counts, name='count', dtype=np.int64).sort_values(ascending=False)
+        counts.index.name = TARGET
+        return counts
+
+    def mean(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return pd.Series(self.shift + np.diag(self.pair_sum) / np.diag(self.pair_count), index=self.columns)
+
+    def covariance(self, ddof=1):
+        """Pairwise covariance over the rows where both columns are present."""
+        n = self.pair_count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = (self.cross - self.pair_sum * self.pair_sum.T / n) / (n - ddof)
+        return self._frame(np.where(n > ddof, cov, np.nan))
+
+    def std(self):
+        return pd.Series(np.sqrt(np.diag(self.covariance())), index=self.columns)
+
+    def correlation(self):
+        """Pairwise Pearson correlation, as ``DataFrame.corr()``."""
+        n = self.pair_count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            centred = self.cross - self.pair_sum * self.pair_sum.T / n
+            var = self.pair_sq - self.pair_sum ** 2 / n
+            corr = np.clip(centred / np.sqrt(var * var.T), -1, 1)
+        return self._frame(np.where(n > 1, corr, np.nan))
+
+    def quantile(self, q):
+        """Approximate ``q`` quantile of every column, within ``epsilon`` in rank."""
+        return pd.Series([sketch.quantile(q) for sketch in self.sketches], index=self.columns)
+
+    def describe(self):
+        """``DataFrame.describe()`` with a ``missing`` column, one row per column."""
+        summary = pd.DataFrame({'count': self.count(), 'missing': self.missing_counts(), 'mean': self.mean(),
+                                'std': self.std(), 'min': self.min})
+        for q in (0.25, 0.5, 0.75):
+            summary[f'{q:.0%}'] = self.quantile(q)
+        summary['max'] = self.max
+        return summary
+
+    def boxplot_stats(self):
+        """Per-column dicts for ``Axes.bxp``: quartiles and 1.5 IQR whiskers.
+
+        Without the individual values, the fliers are the column's min and
+        max when they lie beyond the whiskers.
+        """
+        quartiles = [self.quantile(q) for q in (0.25, 0.5, 0.75)]
+        stats = []
+        for j, column in enumerate(self.columns):
+            q1, median, q3 = (q.iloc[j] for q in quartiles)
+            low = max(self.min[j], q1 - 1.5 * (q3 - q1))
+            high = min(self.max[j], q3 + 1.5 * (q3 - q1))
+            fliers = [v for v in (self.min[j], self.max[j]) if v < low or v > high]
+            stats.append({'label': column, 'q1': q1, 'med': median, 'q3': q3, 'whislo': low, 'whishi': high,
+                          'fliers': fliers})
+        return stats
+
+
+def compute_stats(dataset, epsilon=DEFAULT_EPSILON):
+    """``EDAStats`` of an in-memory DataFrame."""
+    return EDAStats(epsilon=epsilon).update(dataset)
+
+
+def stats_from_chunks(chunks, epsilon=DEFAULT_EPSILON):
+    """``EDAStats`` of a stream of DataFrame blocks."""
+    stats = EDAStats(epsilon=epsilon)
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats
+
+
+def _file_key(path, params):
+    info = os.stat(path)
+    description = json.dumps([os.path.abspath(path), info.st_size, info.st_mtime_ns, params])
+    return hashlib.sha256(description.encode()).hexdigest()[:32]
+
+
+def stats_from_file(path, chunksize=DEFAULT_CHUNKSIZE, epsilon=DEFAULT_EPSILON, cache_dir=DEFAULT_CACHE_DIR):
+    """``EDAStats`` of the CSV or Parquet file at ``path``, read in blocks of ``chunksize`` rows.
+
+    The result is cached under ``cache_dir`` (``None`` disables it) until
+    the file changes.
+    """
+    return cached_fit('eda', _file_key(path, [epsilon]),
+                      lambda: stats_from_chunks(iter_chunks(path, chunksize), epsilon), cache_dir=cache_dir)
@@ -0,0 +1,78 @@
+"""Model evaluation: metrics and the common fit/predict/evaluate harness."""
+
+import time
+
+import numpy as np
+
+
+def confusion(y_true, y_pred):
+    """2x2 confusion matrix (rows: true label, columns: predicted label) in one pass."""
+    y_true = np.asarray(y_true, dtype=np.int64).ravel()
+    y_pred = np.asarray(y_pred, dtype=np.int64).ravel()
+    return np.bincount(2 * y_true + y_pred, minlength=4).reshape(2, 2)
+
+
+def metrics_from_confusion(cm):
+    """Accuracy, precision, recall and F1 of the positive class from a confusion matrix."""
+    (tn, fp), (fn, tp) = cm
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        'accuracy': (tp + tn) / cm.sum(),
+        'precision': precision,
+        'recall': recall,
+        'f1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+    }
+
+
+def evaluate_model(model, X_train, X_test, y_train, y_test):
+    """Score ``model`` on the train and test split.
+
+    Returns a dict with train/test accuracy, precision, recall and F1 on the
+    test data, the test confusion matrix and the test prediction time.
+    """
+    train_cm = confusion(y_train, model.predict(X_train))
+
+    start = time.perf_counter()
+    y_test_pred = model.predict(X_test)
+    predict_time = time.perf_counter() - start
+
+    cm = confusion(y_test, y_test_pred)
+    test = metrics_from_confusion(cm)
+    return {
+        'train_accuracy': metrics_from_confusion(train_cm)['accuracy'],
+        'test_accuracy': test['accuracy'],
+        'precision': test['precision'],
+        'recall': test['recall'],
+        'f1': test['f1'],
+        'confusion_matrix': cm,
+        'predict_time': predict_time,
+    }
+
+
+def fit_and_evaluate(spec, data, **kwargs):
+    """Train the registered model ``spec`` on ``data`` and evaluate it.
+
+    Returns the fitted model and its metrics, including the wall-clock
+    ``fit_time`` and ``predict_time`` in seconds.
+    """
+    start = time.perf_counter()
+    model, split = spec.train(data, **kwargs)
+    fit_time = time.perf_counter() - start
+
+    metrics = evaluate_model(model, *split)
+    metrics['fit_time'] = fit_time
+    return model, metrics
+
+
+def print_metrics(name, metrics):
+    # 'Hybrid Model' already says it
+    name = name if name.endswith(' Model') else f'{name} Model'
+    print(f"{name} Evaluation Metrics:")
+    print("Accuracy of training data:", metrics['train_accuracy'])
+    print("Accuracy of test data:", metrics['test_accuracy'])
+    print("Precision:", metrics['precision'])
+    print("Recall:", metrics['recall'])
+    print("F1-Score:", metrics['f1'])
+    print(f"Confusion Matrix for {name}:\n", metrics['confusion_matrix'])
+    print(f"Fit time: {metrics['fit_time']:.3f}s, predict time: {metrics['predict_time']:.4f}s")
@@ -0,0 +1,173 @@
+"""Export the Keras models (ANN, hybrid DNN, LSTM + MLP) for CPU inference without TensorFlow.
+
+Every model is first converted to ``mlp.NumpyMLP`` (BatchNormalization
+folded, Dropout stripped, the single-step LSTM reduced to an affine map and
+its gates), and written in one of ``FORMATS``:
+
+    numpy        float32 NumPy arrays (``.npz``), scored by ``NumpyMLP``
+    numpy-int8   the same with int8 weights and per-unit scales
+    tflite       a float32 TensorFlow Lite flatbuffer (``.tflite``)
+    tflite-int8  a TensorFlow Lite model with int8 weights and activations in
+                 every op, calibrated on sample rows; input and output stay float32
+
+The TensorFlow Lite graphs are built from the converted layers rather than
+from the Keras model, whose LSTM does not convert to builtin TFLite ops.
+Converting needs TensorFlow; scoring an export needs only NumPy, plus a
+TFLite interpreter (``ai-edge-litert`` or ``tflite-runtime``, falling back
+to ``tensorflow.lite``) for the ``tflite`` formats.
+
+For the hybrid, the forest is saved alongside the DNN as
+``trees.CompiledForest`` arrays in one ``.npz`` (``distill.CompiledHybrid``),
+with the DNN as arrays or as an embedded TFLite flatbuffer.
+"""
+
+import numpy as np
+
+from .distill import CompiledHybrid
+from .mlp import NumpyMLP
+from .trees import CompiledForest
+
+FORMATS = ('numpy', 'numpy-int8', 'tflite', 'tflite-int8')
+CALIBRATION_ROWS = 500
+
+
+def _interpreter(content):
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+    return Interpreter(model_content=content)
+
+
+class TFLiteClassifier:
+    """``predict``/``predict_proba`` of a binary TFLite model with one sigmoid output.
+
+    The input tensor is resized to the batch on each call.
+    """
+
+    def __init__(self, content):
+        self.content = bytes(content)
+        self.interpreter = _interpreter(self.content)
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]['index']
+        self.output = self.interpreter.get_output_details()[0]['index']
+        self._rows = 1
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        X = X.reshape(len(X), -1)
+        if len(X) != self._rows:
+            self.interpreter.resize_tensor_input(self.input, X.shape)
+            self.interpreter.allocate_tensors()
+            self._rows = len(X)
+        self.interpreter.set_tensor(self.input, X)
+        self.interpreter.invoke()
+        p = self.interpreter.get_tensor(self.output).reshape(-1)
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+    def to_arrays(self, prefix=''):
+        return {f'{prefix}tflite': np.frombuffer(self.content, np.uint8)}
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix=''):
+        return cls(np.asarray(arrays[f'{prefix}tflite']).tobytes())
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.content)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+
+def to_tflite(mlp, calibration=None):
+    """Convert a ``NumpyMLP`` to a TFLite flatbuffer.
+
+    With ``calibration`` (2D input rows), weights and activations are
+    quantized to int8 from the ranges seen on those rows, and conversion
+    fails if an op has no int8 kernel. The model still takes and returns
+    float32, quantized and dequantized at the edges.
+    """
+    import tensorflow as tf
+
+    n_features = mlp.layers[0][0].shape[0]
+    weights = [(W.astype(np.float32) * (1 if scale is None else scale), b)
+               for (W, b, _), scale in zip(mlp.layers, mlp.scales)]
+
+    def gates(z, activation):
+        i, _, g, o = tf.split(z, 4, axis=-1)
+        return tf.sigmoid(o) * activation(tf.sigmoid(i) * activation(g))
+
+    functions = {'linear': tf.identity, 'relu': tf.nn.relu, 'sigmoid': tf.sigmoid, 'tanh': tf.tanh}
+
+    @tf.function(input_signature=[tf.TensorSpec([None, n_features], tf.float32)], autograph=False)
+    def forward(x):
+        h = x
+        for (W, b), (_, _, activation) in zip(weights, mlp.layers):
+            z = tf.matmul(h, tf.constant(W)) + tf.constant(np.asarray(b, np.float32))
+            if activation.startswith('lstm_'):
+                h = gates(z, functions[activation[len('lstm_'):]])
+            else:
+                h = functions[activation](z)
+        return h
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([forward.get_concrete_function()], forward)
+    if calibration is not None:
+        rows = np.asarray(calibration, dtype=np.float32).reshape(len(calibration), -1)[:CALIBRATION_ROWS]
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([row[None]] for row in rows)
+        # Fail rather than fall back to float kernels for any op
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    return converter.convert()
+
+
+def _convert_dnn(mlp, fmt, calibration):
+    if fmt == 'numpy':
+        return mlp
+    if fmt == 'numpy-int8':
+        return mlp.quantize()
+    return TFLiteClassifier(to_tflite(mlp, calibration if fmt == 'tflite-int8' else None))
+
+
+def export_model(model, path, fmt='numpy', calibration=None):
+    """Save a fitted ``KerasBinaryClassifier`` or ``HybridModel`` to ``path`` in format ``fmt``.
+
+    ``calibration`` (scaled input rows, e.g. the training rows) is required
+    for ``tflite-int8``. Returns the exported model, ready to score.
+    """
+    from .models import HybridModel
+
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}; choose from {', '.join(FORMATS)}")
+    if fmt == 'tflite-int8' and calibration is None:
+        raise ValueError('tflite-int8 export needs calibration rows')
+    if isinstance(model, HybridModel):
+        if calibration is not None:
+            # The DNN sees the forest's probabilities, not the features
+            calibration = model.rf_model.predict_proba(calibration)
+        exported = CompiledHybrid(CompiledForest.from_sklearn(model.rf_model),
+                                  _convert_dnn(NumpyMLP.from_keras(model.dnn_model.model), fmt, calibration))
+    else:
+        exported = _convert_dnn(NumpyMLP.from_keras(model.model), fmt, calibration)
+    exported.save(path)
+    return exported
+
+
+def load_exported(path):
+    """Load a model written by ``export_model``: a ``.tflite`` file or an ``.npz`` of arrays."""
+    if str(path).endswith('.tflite'):
+        return TFLiteClassifier.load(path)
+    with np.load(path) as arrays:
+        arrays = dict(arrays)
+    if any(name.startswith('rf_') for name in arrays):
+        return CompiledHybrid.from_arrays(arrays)
+    return NumpyMLP.from_arrays(arrays)
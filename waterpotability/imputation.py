@@ -0,0 +1,117 @@
+"""Class-conditional median imputation with reusable, serializable statistics."""
+
+import json
+
+import numpy as np
+
+from .data import NULL_COLS, TARGET
+from .sketch import QuantileSketch
+
+
+class ClassMedianImputer:
+    """Fill nulls with the median of the column for the sample's ``Potability`` class.
+
+    ``fit`` computes every per-class median in one groupby pass together with
+    the global medians, which are used for rows whose class is unknown, e.g.
+    at inference time when ``Potability`` is not in the frame.
+
+    With ``method='sketch'`` the medians are instead estimated by one
+    ``QuantileSketch`` per column and class, with rank error ``epsilon``.
+    ``partial_fit`` then updates them block by block in bounded memory, for
+    histories that do not fit in RAM.
+    """
+
+    def __init__(self, columns=NULL_COLS, method='exact', epsilon=0.01):
+        if method not in ('exact', 'sketch'):
+            raise ValueError(f"method must be 'exact' or 'sketch', got {method!r}")
+        self.columns = list(columns)
+        self.method = method
+        self.epsilon = epsilon
+        self.class_medians_ = None
+        self.global_medians_ = None
+        self.sketches_ = None
+
+    def fit(self, dataset):
+        if self.method == 'sketch':
+            self.sketches_ = None
+            return self.partial_fit(dataset)
+        medians = dataset.groupby(TARGET)[self.columns].median()
+        self.class_medians_ = {col: {int(k): float(medians.at[k, col]) for k in medians.index}
+                               for col in self.columns}
+        self.global_medians_ = {col: float(v) for col, v in dataset[self.columns].median().items()}
+        return self
+
+    def partial_fit(self, dataset):
+        """Update the sketched medians with another block of labelled rows."""
+        if self.method != 'sketch':
+            raise ValueError("partial_fit requires method='sketch'")
+        if self.sketches_ is None:
+            self.sketches_ = {(col, k): QuantileSketch(self.epsilon, seed=k)
+                              for col in self.columns for k in (0, 1)}
+        target = dataset[TARGET].to_numpy()
+        for col in self.columns:
+            values = dataset[col].to_numpy()
+            for k in (0, 1):
+                self.sketches_[col, k].update(values[target == k])
+
+        self.class_medians_ = {col: {k: self.sketches_[col, k].median() for k in (0, 1)}
+                               for col in self.columns}
+        self.global_medians_ = {}
+        for col in self.columns:
+            combined = QuantileSketch(self.epsilon)
+            for k in (0, 1):
+                combined.merge(self.sketches_[col, k])
+            self.global_medians_[col] = combined.median()
+        return self
+
+    def transform(self, dataset):
+        """Return a copy of ``dataset`` with the nulls in ``columns`` filled."""
+        if self.class_medians_ is None:
+            raise ValueError('ClassMedianImputer is not fitted yet; call fit first')
+        dataset = dataset.copy()
+        target = dataset[TARGET].to_numpy() if TARGET in dataset else None
+        for col in self.columns:
+            values = dataset[col].to_numpy()
+            fill = np.full(len(values), self.global_medians_[col], dtype=values.dtype)
+            if target is not None:
+                for k, median in self.class_medians_[col].items():
+                    fill = np.where(target == k, median, fill)
+            dataset[col] = np.where(np.isnan(values), fill, values).astype(values.dtype, copy=False)
+        return dataset
+
+    def fit_transform(self, dataset):
+        return self.fit(dataset).transform(dataset)
+
+    def to_dict(self):
+        state = {
+            'columns': self.columns,
+            'method': self.method,
+            'epsilon': self.epsilon,
+            'class_medians': {col: {str(k): v for k, v in m.items()} for col, m in self.class_medians_.items()},
+            'global_medians': self.global_medians_,
+        }
+        if self.sketches_ is not None:
+            state['sketches'] = {f'{col}:{k}': sketch.to_dict() for (col, k), sketch in self.sketches_.items()}
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        imputer = cls(state['columns'], state.get('method', 'exact'), state.get('epsilon', 0.01))
+        imputer.class_medians_ = {col: {int(k): v for k, v in m.items()}
+                                  for col, m in state['class_medians'].items()}
+        imputer.global_medians_ = dict(state['global_medians'])
+        if 'sketches' in state:
+            imputer.sketches_ = {}
+            for key, sketch in state['sketches'].items():
+                col, k = key.rsplit(':', 1)
+                imputer.sketches_[col, int(k)] = QuantileSketch.from_dict(sketch, seed=int(k))
+        return imputer
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
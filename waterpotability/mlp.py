@@ -0,0 +1,158 @@
+"""Keras multilayer perceptrons as plain NumPy matrices.
+
+``NumpyMLP.from_keras`` converts a ``Sequential`` stack of ``Dense``,
+``BatchNormalization`` and ``Dropout`` layers for inference: Dropout is the
+identity at inference and is dropped, and each BatchNormalization, an
+affine map ``a * x + b`` with frozen statistics, is folded into the weights
+of the following Dense layer. What is left is a short list of
+``(W, b, activation)`` layers evaluated with float32 matrix products.
+
+An ``LSTM`` layer over a single timestep, as in the LSTM + MLP model,
+starts from a zero state, so its recurrent kernel and forget gate have no
+effect: it is the affine map ``x @ kernel + bias`` followed by the gates
+(activation ``lstm_<activation>``) and converts like a Dense layer.
+
+``quantize`` stores each weight matrix as int8 with one float32 scale per
+output unit, a quarter of the size; the products are still computed in
+float32.
+"""
+
+import numpy as np
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'sigmoid': _sigmoid,
+    'tanh': np.tanh,
+}
+
+
+def _lstm_step(activation):
+    # Keras gate order: input, forget, cell, output; the zero initial
+    # cell state makes the forget gate irrelevant
+    def step(z):
+        i, _, g, o = np.split(z, 4, axis=-1)
+        return _sigmoid(o) * activation(_sigmoid(i) * activation(g))
+    return step
+
+
+ACTIVATIONS.update({f'lstm_{name}': _lstm_step(f) for name, f in list(ACTIVATIONS.items())})
+
+
+def _affine(layer):
+    """Kernel, bias and activation name of a Dense or single-step LSTM layer."""
+    weights = layer.get_weights()
+    if type(layer).__name__ == 'Dense':
+        W, bias = weights if layer.use_bias else (weights[0], 0.0)
+        return W, bias, layer.activation.__name__
+    if layer.return_sequences or layer.input.shape[1] != 1:
+        raise ValueError(f'only single-step LSTM layers convert to NumPy, not {layer.name!r}')
+    if layer.recurrent_activation.__name__ != 'sigmoid':
+        raise ValueError(f'unsupported recurrent activation of LSTM layer {layer.name!r}')
+    return weights[0], weights[2] if layer.use_bias else 0.0, 'lstm_' + layer.activation.__name__
+
+
+class NumpyMLP:
+    """``scales[i]`` is the per-unit scale of an int8 ``W`` of layer ``i``, or ``None``."""
+
+    def __init__(self, layers, scales=None):
+        self.layers = layers
+        self.scales = scales or [None] * len(layers)
+
+    @classmethod
+    def from_keras(cls, model):
+        layers = []
+        # Pending affine map (scale, shift) from a BatchNormalization layer
+        scale = shift = None
+        for layer in model.layers:
+            kind = type(layer).__name__
+            if kind in ('InputLayer', 'Dropout'):
+                continue
+            if kind == 'BatchNormalization':
+                weights = iter(layer.get_weights())
+                gamma = next(weights) if layer.scale else 1.0
+                beta = next(weights) if layer.center else 0.0
+                mean, var = next(weights), next(weights)
+                a = gamma / np.sqrt(var + layer.epsilon)
+                b = beta - a * mean
+                # Compose with a preceding pending map, if any
+                scale, shift = (a, b) if scale is None else (scale * a, shift * a + b)
+            elif kind in ('Dense', 'LSTM'):
+                W, bias, activation = _affine(layer)
+                if scale is not None:
+                    # Dense(a * x + b) == x @ (a[:, None] * W) + (b @ W + bias)
+                    bias = bias + shift @ W
+                    W = scale[:, None] * W
+                    scale = shift = None
+                layers.append((np.asarray(W, np.float32), np.asarray(bias, np.float32) + np.zeros(W.shape[1], np.float32),
+                               activation))
+            else:
+                raise ValueError(f'cannot convert {kind} layer {layer.name!r} to NumPy')
+        if scale is not None:
+            # Trailing BatchNormalization: an identity-activation diagonal layer
+            layers.append((np.diag(scale).astype(np.float32), shift.astype(np.float32), 'linear'))
+        for _, _, activation in layers:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f'unsupported activation {activation!r}')
+        return cls(layers)
+
+    def quantize(self):
+        """A copy with int8 weights, scaled symmetrically per output unit."""
+        layers, scales = [], []
+        for (W, b, activation), scale in zip(self.layers, self.scales):
+            if scale is not None:
+                layers.append((W, b, activation))
+                scales.append(scale)
+                continue
+            scale = np.abs(W).max(axis=0) / 127
+            scale = np.where(scale > 0, scale, 1).astype(np.float32)
+            layers.append((np.rint(W / scale).astype(np.int8), b, activation))
+            scales.append(scale)
+        return type(self)(layers, scales)
+
+    def forward(self, X):
+        h = np.asarray(X, dtype=np.float32)
+        if h.ndim == 3:
+            # (samples, 1, features) input of a single-step recurrent model
+            h = h.reshape(len(h), -1)
+        for (W, b, activation), scale in zip(self.layers, self.scales):
+            z = h @ W
+            if scale is not None:
+                z *= scale
+            h = ACTIVATIONS[activation](z + b)
+        return h
+
+    def predict_proba(self, X):
+        p = self.forward(X).reshape(-1)
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+    def to_arrays(self, prefix=''):
+        arrays = {f'{prefix}activations': np.asarray([a for _, _, a in self.layers])}
+        for i, ((W, b, _), scale) in enumerate(zip(self.layers, self.scales)):
+            arrays[f'{prefix}W{i}'] = W
+            arrays[f'{prefix}b{i}'] = b
+            if scale is not None:
+                arrays[f'{prefix}scale{i}'] = scale
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix=''):
+        activations = [str(a) for a in arrays[f'{prefix}activations']]
+        return cls([(arrays[f'{prefix}W{i}'], arrays[f'{prefix}b{i}'], a) for i, a in enumerate(activations)],
+                   [arrays.get(f'{prefix}scale{i}') for i in range(len(activations))])
+
+    def save(self, path):
+        np.savez(path, **self.to_arrays())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            return cls.from_arrays(dict(arrays))
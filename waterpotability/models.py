@@ -0,0 +1,436 @@
+"""Model sections: each trains one classifier on the pre-processed dataset.
+
+Every ``train_*`` function takes the shared ``PreparedData`` (scaled once,
+split once) and returns the fitted model together with the
+``(X_train, X_test, y_train, y_test)`` split it was trained and evaluated on.
+Each one is registered in ``registry.MODELS``, in the order of the original
+analysis. Model frameworks are imported inside the functions so that
+importing this module stays cheap.
+"""
+
+import numpy as np
+
+from .cache import DEFAULT_CACHE_DIR, cache_key, cached_fit
+from .registry import register
+
+
+class KerasBinaryClassifier:
+    """Adapt a Keras model with a sigmoid output to ``predict``/``predict_proba``.
+
+    ``timesteps`` reshapes 2D input to ``(samples, 1, features)`` for
+    recurrent models. ``history`` is the training history from
+    ``tfdata.fit_keras``, when known.
+    """
+
+    def __init__(self, model, timesteps=False, history=None):
+        self.model = model
+        self.timesteps = timesteps
+        self.history = history
+
+    def _reshape(self, X):
+        X = np.asarray(X)
+        if self.timesteps:
+            return X.reshape((X.shape[0], 1, X.shape[1]))
+        return X
+
+    def predict_proba(self, X):
+        p = self.model.predict(self._reshape(X), verbose=0).reshape(-1)
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X):
+        # Converting probabilities to binary predictions
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+
+class HybridModel:
+    """Random Forest class probabilities fed into a DNN classifier."""
+
+    def __init__(self, rf_model, dnn_model):
+        self.rf_model = rf_model
+        self.dnn_model = dnn_model
+
+    def predict_proba(self, X):
+        return self.dnn_model.predict_proba(self.rf_model.predict_proba(X))
+
+    def predict(self, X):
+        return self.dnn_model.predict(self.rf_model.predict_proba(X))
+
+
+class ApproximateKernelSVM:
+    """Linear SVM on random features approximating the RBF kernel.
+
+    The kernel is approximated by ``Nystroem`` (``kernel='nystroem'``,
+    landmarks drawn from the data) or ``RBFSampler`` (``kernel='rbf_sampler'``,
+    random Fourier features) with ``n_components`` features, and an
+    averaged hinge-loss ``SGDClassifier`` is trained on them in mini-batches.
+    Fitting costs O(n * n_components) instead of the O(n^2)-O(n^3) of
+    ``SVC``, and ``partial_fit`` trains on blocks streamed from disk. ``gamma=None``
+    matches ``SVC``'s ``gamma='scale'`` on the data seen first.
+    """
+
+    def __init__(self, kernel='nystroem', n_components=300, gamma=None, alpha=1e-4, batch_size=1024, epochs=5,
+                 random_state=41):
+        if kernel not in ('nystroem', 'rbf_sampler'):
+            raise ValueError(f"kernel must be 'nystroem' or 'rbf_sampler', got {kernel!r}")
+        self.kernel = kernel
+        self.n_components = n_components
+        self.gamma = gamma
+        self.alpha = alpha
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.random_state = random_state
+        self.feature_map_ = None
+        self.classifier_ = None
+
+    def _init(self, X):
+        from sklearn.kernel_approximation import Nystroem, RBFSampler
+        from sklearn.linear_model import SGDClassifier
+
+        gamma = self.gamma if self.gamma is not None else 1 / (X.shape[1] * X.var())
+        if self.kernel == 'nystroem':
+            self.feature_map_ = Nystroem(gamma=gamma, n_components=min(self.n_components, len(X)),
+                                         random_state=self.random_state)
+        else:
+            self.feature_map_ = RBFSampler(gamma=gamma, n_components=self.n_components,
+                                           random_state=self.random_state)
+        self.feature_map_.fit(X)
+        # Averaged SGD: the averaged weights are far less noisy than the last iterate
+        self.classifier_ = SGDClassifier(loss='hinge', alpha=self.alpha, average=True,
+                                         random_state=self.random_state)
+
+    def partial_fit(self, X, y):
+        """Train on one block; the first block also fits the feature map."""
+        X = np.asarray(X, dtype=np.float32)
+        if self.feature_map_ is None:
+            self._init(X)
+        self.classifier_.partial_fit(self.feature_map_.transform(X), y, classes=[0, 1])
+        return self
+
+    def fit(self, X, y):
+        """``epochs`` passes of shuffled ``batch_size`` mini-batches over ``X``."""
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y)
+        rng = np.random.default_rng(self.random_state)
+        self.feature_map_ = None
+        for _ in range(self.epochs):
+            order = rng.permutation(len(X))
+            for start in range(0, len(X), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                self.partial_fit(X[batch], y[batch])
+        return self
+
+    def decision_function(self, X):
+        return self.classifier_.decision_function(self.feature_map_.transform(np.asarray(X, dtype=np.float32)))
+
+    def predict(self, X):
+        return (self.decision_function(X) > 0).astype(int)
+
+
+@register('svm', 'SVM')
+def train_svm(data):
+    from sklearn.svm import SVC
+
+    X_train, X_test, y_train, y_test = data.split()
+
+    # Using RBF kernel (Radial Basis Function) as it's commonly effective for SVM
+    svm_model = SVC(kernel='rbf', random_state=41)
+    svm_model.fit(X_train, y_train)
+    return svm_model, (X_train, X_test, y_train, y_test)
+
+
+@register('svm_approx', 'SVM (approximate RBF)')
+def train_svm_approx(data, kernel='nystroem', n_components=300):
+    X_train, X_test, y_train, y_test = data.split()
+
+    # Random-feature approximation of the RBF kernel with a linear SVM, for
+    # training sets too large for the exact SVC
+    svm_model = ApproximateKernelSVM(kernel=kernel, n_components=n_components)
+    svm_model.fit(X_train, y_train)
+    return svm_model, (X_train, X_test, y_train, y_test)
+
+
+@register('rf', 'Random Forest')
+def train_random_forest(data):
+    from sklearn.ensemble import RandomForestClassifier
+
+    X_train, X_test, y_train, y_test = data.split()
+
+    rf_model = RandomForestClassifier(n_estimators=100, random_state=41, max_depth=10, min_samples_split=3)
+    rf_model.fit(X_train, y_train)
+    return rf_model, (X_train, X_test, y_train, y_test)
+
+
+@register('dt', 'Decision Tree')
+def train_decision_tree(data):
+    from sklearn.tree import DecisionTreeClassifier
+
+    X_train, X_test, y_train, y_test = data.split()
+
+    dt_model = DecisionTreeClassifier(random_state=41, max_depth=10, min_samples_split=3)
+    dt_model.fit(X_train, y_train)
+    return dt_model, (X_train, X_test, y_train, y_test)
+
+
+@register('ann', 'ANN', framework='keras')
+def train_ann(data, batch_size=128, epochs=50, verbose=0):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense, Input
+    from tensorflow.keras.optimizers import Adam
+
+    from .tfdata import describe, fit_keras, scaled_learning_rate, split_validation
+
+    X_train, X_test, y_train, y_test = data.split()
+
+    ann_model = Sequential()
+    ann_model.add(Input(shape=(X_train.shape[1],)))
+    ann_model.add(Dense(16, activation='relu'))  # Input layer with 16 nodes
+    ann_model.add(Dense(8, activation='relu'))  # Hidden layer with 8 nodes
+    ann_model.add(Dense(1, activation='sigmoid'))  # Output layer with 1 node for binary classification
+
+    # The learning rate was tuned for batches of 16
+    ann_model.compile(optimizer=Adam(learning_rate=scaled_learning_rate(0.001, batch_size, 16)),
+                      loss='binary_crossentropy', metrics=['accuracy'])
+    X_fit, X_val, y_fit, y_val = split_validation(X_train, y_train)
+    history = fit_keras(ann_model, X_fit, y_fit, X_val, y_val, epochs=epochs, batch_size=batch_size,
+                        verbose=verbose)
+    if verbose:
+        print('ANN:', describe(history))
+    return KerasBinaryClassifier(ann_model, history=history), (X_train, X_test, y_train, y_test)
+
+
+@register('nb', 'Naive Bayes')
+def train_naive_bayes(data):
+    from sklearn.naive_bayes import GaussianNB
+
+    X_train, X_test, y_train, y_test = data.split()
+
+    nb_model = GaussianNB()
+    nb_model.fit(X_train, y_train)
+    return nb_model, (X_train, X_test, y_train, y_test)
+
+
+# Random Forest search of the hybrid model
+HYBRID_RF_RANDOM_STATE = 41
+HYBRID_RF_SEARCH = {
+    'param_distributions': {
+        'n_estimators': [100, 200, 300],
+        'max_depth': [10, 15, 20, None],
+        'min_samples_split': [2, 3, 5],
+        'max_features': ['sqrt', 'log2', None]
+    },
+    'n_iter': 10,
+    'cv': 3,
+    'random_state': 1,
+}
+
+
+def search_hybrid_forest(X_train, y_train, verbose=0, balance='smote'):
+    """Randomized search for the hybrid's forest; returns the fitted search object.
+
+    ``balance='smote'`` oversamples the training part of each fold (and the
+    refit) with ``balancing.ChunkedSMOTE`` in an ``imblearn`` pipeline, whose
+    best estimator is then ``[('smote', ...), ('rf', forest)]``;
+    ``'class_weight'`` weights the classes instead, and ``None`` does neither.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import RandomizedSearchCV
+
+    from .balancing import BALANCE_METHODS, ChunkedSMOTE
+
+    if balance not in BALANCE_METHODS:
+        raise ValueError(f"balance must be one of {BALANCE_METHODS}, got {balance!r}")
+    rf_model = RandomForestClassifier(random_state=HYBRID_RF_RANDOM_STATE,
+                                      class_weight='balanced' if balance == 'class_weight' else None)
+    search = dict(HYBRID_RF_SEARCH)
+    if balance == 'smote':
+        from imblearn.pipeline import Pipeline
+
+        rf_model = Pipeline([('smote', ChunkedSMOTE()), ('rf', rf_model)])
+        search['param_distributions'] = {f'rf__{name}': values
+                                         for name, values in HYBRID_RF_SEARCH['param_distributions'].items()}
+    random_search = RandomizedSearchCV(rf_model, scoring='accuracy', n_jobs=-1, verbose=verbose, **search)
+    return random_search.fit(X_train, y_train)
+
+
+def _fit_hybrid_forest(X_fit, y_fit, balance, verbose):
+    """The best forest on ``X_fit`` and its out-of-fold class probabilities for ``X_fit``."""
+    from sklearn.model_selection import cross_val_predict
+
+    best = search_hybrid_forest(X_fit, y_fit, verbose=verbose, balance=balance).best_estimator_
+    # Probabilities of rows the forest did not train on, like those it gives new samples
+    features = cross_val_predict(best, X_fit, y_fit, cv=HYBRID_RF_SEARCH['cv'], method='predict_proba',
+                                 n_jobs=-1)
+    return (best.named_steps['rf'] if balance == 'smote' else best), features
+
+
+@register('hybrid', 'Hybrid Model', framework='keras')
+def train_hybrid(data, cache_dir=DEFAULT_CACHE_DIR, verbose=0, balance='smote', batch_size=256, epochs=100):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense, Dropout, BatchNormalization, Input
+    from tensorflow.keras.optimizers import Adam
+
+    from .balancing import ChunkedSMOTE, class_weights
+    from .tfdata import describe, fit_keras, scaled_learning_rate, split_validation
+
+    X_train, X_test, y_train, y_test = data.split()
+
+    # The DNN stops early on a validation fold of real training rows, which
+    # the forest does not see either
+    X_fit, X_val, y_fit, y_val = split_validation(X_train, y_train)
+
+    # Step 1: Train a Random Forest Model with Hyperparameter Tuning on the
+    # fitting rows. The search refits the best forest, which is used as is
+    # and cached on disk, with its out-of-fold probabilities, for reruns with
+    # the same data and parameters.
+    rf_model_best, X_fit_rf_features = cached_fit(
+        'hybrid-rf', cache_key([X_fit, y_fit], [HYBRID_RF_SEARCH, HYBRID_RF_RANDOM_STATE, balance, 'oof']),
+        lambda: _fit_hybrid_forest(X_fit, y_fit, balance, verbose),
+        cache_dir=cache_dir)
+
+    # Step 2: Use Random Forest Model to Generate New Features. The DNN
+    # learns from out-of-fold probabilities and is validated on those of
+    # unseen rows; in-sample probabilities would be near-perfect and leave
+    # early stopping nothing to watch.
+    X_val_rf_features = rf_model_best.predict_proba(X_val)
+
+    # Handling class imbalance on the training rows only, so no synthetic
+    # neighbour of a test row is trained on: SMOTE samples inside every
+    # search fold for the forest and among the DNN's features, or class
+    # weights of the rows the DNN fits on
+    class_weight = class_weights(y_fit) if balance == 'class_weight' else None
+    if balance == 'smote':
+        X_fit_rf_features, y_fit = ChunkedSMOTE().fit_resample(X_fit_rf_features, y_fit)
+
+    # Step 3: Train a Deep Neural Network with the Extracted Features
+    dnn_model = Sequential()
+    dnn_model.add(Input(shape=(X_fit_rf_features.shape[1],)))
+    dnn_model.add(Dense(32, activation='relu'))
+    dnn_model.add(BatchNormalization())
+    dnn_model.add(Dropout(0.3))  # Adding dropout to prevent overfitting
+
+    dnn_model.add(Dense(16, activation='relu'))
+    dnn_model.add(BatchNormalization())
+    dnn_model.add(Dropout(0.3))
+
+    # Output layer for binary classification
+    dnn_model.add(Dense(1, activation='sigmoid'))
+
+    # The learning rate was tuned for batches of 32
+    dnn_model.compile(optimizer=Adam(learning_rate=scaled_learning_rate(0.001, batch_size, 32)),
+                      loss='binary_crossentropy', metrics=['accuracy'])
+    history = fit_keras(dnn_model, X_fit_rf_features, y_fit, X_val_rf_features, y_val, epochs=epochs,
+                        batch_size=batch_size, class_weight=class_weight, verbose=verbose)
+    if verbose:
+        print('Hybrid DNN:', describe(history))
+
+    model = HybridModel(rf_model_best, KerasBinaryClassifier(dnn_model, history=history))
+    return model, (X_train, X_test, y_train, y_test)
+
+
+# The exhaustive grid of the original analysis: 108 combinations x 3 folds
+XGB_PARAM_GRID = {
+    'n_estimators': [50, 100, 150],
+    'max_depth': [3, 5, 7],
+    'learning_rate': [0.01, 0.1, 0.2],
+    'subsample': [0.8, 1.0],
+    'colsample_bytree': [0.8, 1.0]
+}
+
+# Halving search: the number of trees is left to early stopping instead
+XGB_HALVING_GRID = {key: values for key, values in XGB_PARAM_GRID.items() if key != 'n_estimators'}
+XGB_MAX_ESTIMATORS = 500
+XGB_EARLY_STOPPING_ROUNDS = 20
+
+
+def search_xgboost(X_train, y_train, search='halving', verbose=0):
+    """Tune an ``XGBClassifier`` and return the fitted search object.
+
+    ``search='grid'`` is the exhaustive ``GridSearchCV`` over
+    ``XGB_PARAM_GRID``. ``search='halving'`` runs ``HalvingGridSearchCV``:
+    all candidates start on a small sample, and only the best third moves
+    on to three times as many rows in each round. Each fit stops boosting
+    once the log loss on a held-out 15% validation fold of ``X_train`` has
+    not improved for ``XGB_EARLY_STOPPING_ROUNDS`` rounds, so the search and
+    its refit train on the remaining 85%. Both use ``tree_method='hist'``
+    and refit the best estimator, which is then used as is.
+    """
+    import xgboost as xgb
+    from sklearn.model_selection import GridSearchCV, train_test_split
+
+    if search == 'grid':
+        xgb_clf = xgb.XGBClassifier(eval_metric='logloss', tree_method='hist')
+        grid_search = GridSearchCV(estimator=xgb_clf, param_grid=XGB_PARAM_GRID, cv=3, scoring='accuracy',
+                                   verbose=verbose, n_jobs=-1)
+        return grid_search.fit(X_train, y_train)
+    if search != 'halving':
+        raise ValueError(f"search must be 'grid' or 'halving', got {search!r}")
+
+    from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+    from sklearn.model_selection import HalvingGridSearchCV
+
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.15, stratify=y_train,
+                                                  random_state=1)
+    xgb_clf = xgb.XGBClassifier(n_estimators=XGB_MAX_ESTIMATORS, eval_metric='logloss', tree_method='hist',
+                                early_stopping_rounds=XGB_EARLY_STOPPING_ROUNDS)
+    halving_search = HalvingGridSearchCV(estimator=xgb_clf, param_grid=XGB_HALVING_GRID, factor=3, cv=3,
+                                         scoring='accuracy', random_state=1, verbose=verbose, n_jobs=-1)
+    return halving_search.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+
+
+@register('xgb', 'XGBoost', framework='xgboost')
+def train_xgboost(data, search='halving', verbose=0):
+    X_train, X_test, y_train, y_test = data.split()
+
+    # Hyperparameter tuning; the search already refits the best estimator
+    xgb_search = search_xgboost(X_train, y_train, search=search, verbose=verbose)
+    print("Best Hyperparameters:", xgb_search.best_params_)
+    return xgb_search.best_estimator_, (X_train, X_test, y_train, y_test)
+
+
+@register('qda', 'QDA')
+def train_qda(data):
+    from sklearn.discriminant_analysis import QuadraticDiscriminantAnalysis
+
+    X_train, X_test, y_train, y_test = data.split()
+
+    qda_model = QuadraticDiscriminantAnalysis()
+    qda_model.fit(X_train, y_train)
+    return qda_model, (X_train, X_test, y_train, y_test)
+
+
+@register('lstm_mlp', 'Hybrid LSTM + MLP', framework='keras')
+def train_lstm_mlp(data, batch_size=128, epochs=50, verbose=0):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense, LSTM, Input
+    from tensorflow.keras.optimizers import Adam
+
+    from .tfdata import describe, fit_keras, scaled_learning_rate, split_validation
+
+    X_train, X_test, y_train, y_test = data.split()
+    X_fit, X_val, y_fit, y_val = split_validation(X_train, y_train)
+
+    # LSTM expects data in 3D shape: (samples, timesteps, features)
+    X_fit_3d = X_fit.reshape((X_fit.shape[0], 1, X_fit.shape[1]))
+    X_val_3d = X_val.reshape((X_val.shape[0], 1, X_val.shape[1]))
+
+    model = Sequential()
+    model.add(Input(shape=(1, X_train.shape[1])))
+
+    # LSTM layer for extracting features
+    model.add(LSTM(64, activation='relu', return_sequences=False))
+
+    # Connect to MLP layers
+    model.add(Dense(32, activation='relu'))
+    model.add(Dense(16, activation='relu'))
+
+    # Output layer for binary classification
+    model.add(Dense(1, activation='sigmoid'))
+
+    # The learning rate was tuned for batches of 16
+    model.compile(optimizer=Adam(learning_rate=scaled_learning_rate(0.001, batch_size, 16)),
+                  loss='binary_crossentropy', metrics=['accuracy'])
+    history = fit_keras(model, X_fit_3d, y_fit, X_val_3d, y_val, epochs=epochs, batch_size=batch_size,
+                        verbose=verbose)
+    if verbose:
+        print('LSTM + MLP:', describe(history))
+    return KerasBinaryClassifier(model, timesteps=True, history=history), (X_train, X_test, y_train, y_test)
@@ -0,0 +1,119 @@
+"""Online learning: update saved models with newly arrived labelled samples.
+
+``OnlineLearner.update`` takes a block of new rows and updates, in time
+proportional to that block:
+
+- the imputer's per-class medians, when it was fitted with
+  ``method='sketch'`` (exact medians need the full history and stay fixed);
+- with ``update_scaler=True``, the scaler's min/max (``partial_fit``), so
+  new extremes widen the range;
+- the model: ``partial_fit`` for GaussianNB and the SGD-based models
+  (``svm_approx``), further epochs from the current weights for Keras
+  models, and ``update_rounds`` more boosting rounds for XGBoost
+  (``xgb_model=``). Random Forest, Decision Tree, SVC, QDA and the hybrid
+  cannot be updated incrementally and must be retrained.
+
+The block is transformed with the already updated statistics before the
+model sees it. The scaler stays fixed by default: a widened min/max shifts
+the scaled values of old and new rows alike, while the model keeps what it
+learned in the old scaling (GaussianNB means and variances, SGD and Keras
+weights), so the two would no longer match.
+"""
+
+import os
+
+import numpy as np
+
+from .data import DEFAULT_CHUNKSIZE, INPUT_COLS, TARGET, iter_chunks
+from .persistence import load_artifacts, save_artifacts, saved_models
+
+DEFAULT_EPOCHS = 1
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_UPDATE_ROUNDS = 10
+
+
+def _update_keras(model, X, y, epochs, batch_size):
+    model.model.fit(model._reshape(X), y, epochs=epochs, batch_size=batch_size, verbose=0)
+    return model
+
+
+def _update_xgboost(model, X, y, rounds):
+    import xgboost as xgb
+
+    booster = model.get_booster()
+    best_iteration = booster.attr('best_iteration')
+    if best_iteration is not None:
+        # predict only uses trees up to the best iteration; drop the rest so
+        # the new rounds are not ignored
+        booster = booster[:int(best_iteration) + 1]
+    params = dict(model.get_params(), n_estimators=rounds, early_stopping_rounds=None)
+    return xgb.XGBClassifier(**params).fit(X, y, xgb_model=booster)
+
+
+class OnlineLearner:
+    """A fitted imputer, scaler and model that are updated block by block."""
+
+    def __init__(self, imputer, scaler, model, update_scaler=False, epochs=DEFAULT_EPOCHS,
+                 batch_size=DEFAULT_BATCH_SIZE, update_rounds=DEFAULT_UPDATE_ROUNDS):
+        from .models import KerasBinaryClassifier
+
+        if not (hasattr(model, 'partial_fit') or hasattr(model, 'get_booster')
+                or isinstance(model, KerasBinaryClassifier)):
+            raise TypeError(f'{type(model).__name__} cannot be updated incrementally; retrain it instead')
+        self.imputer = imputer
+        self.scaler = scaler
+        self.model = model
+        self.update_scaler = update_scaler
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.update_rounds = update_rounds
+        self.rows_seen = 0
+
+    @classmethod
+    def from_artifacts(cls, directory, key, **kwargs):
+        return cls(*load_artifacts(directory, key, mmap=False), **kwargs)
+
+    def update(self, chunk):
+        """Update the statistics and the model with a labelled DataFrame block."""
+        if self.imputer.method == 'sketch':
+            self.imputer.partial_fit(chunk)
+        if self.update_scaler:
+            self.scaler.partial_fit(chunk[INPUT_COLS].to_numpy())
+        chunk = self.imputer.transform(chunk)
+        X = self.scaler.transform(chunk[INPUT_COLS].to_numpy()).astype(np.float32, copy=False)
+        y = chunk[TARGET].to_numpy()
+
+        if hasattr(self.model, 'get_booster'):
+            self.model = _update_xgboost(self.model, X, y, self.update_rounds)
+        elif hasattr(self.model, 'partial_fit'):
+            self.model.partial_fit(X, y)
+        else:
+            _update_keras(self.model, X, y, self.epochs, self.batch_size)
+        self.rows_seen += len(chunk)
+        return self
+
+    def predict(self, chunk):
+        chunk = self.imputer.transform(chunk)
+        return self.model.predict(self.scaler.transform(chunk[INPUT_COLS].to_numpy()).astype(np.float32))
+
+    def save(self, directory, key):
+        save_artifacts(directory, self.imputer, self.scaler, {key: self.model})
+
+
+def update_artifacts(path, directory, key, output=None, chunksize=DEFAULT_CHUNKSIZE, **kwargs):
+    """Update the saved model ``key`` in ``directory`` with the labelled file at ``path``.
+
+    The updated imputer, scaler and model are saved to ``output`` (by
+    default back to ``directory``). Returns the number of rows learned from.
+    """
+    output = output or directory
+    others = [k for k in saved_models(directory) if k != key]
+    if os.path.abspath(output) == os.path.abspath(directory) and others:
+        # The imputer and scaler are shared by every model in the bundle
+        raise ValueError(f"{directory} also holds {', '.join(others)}, whose preprocessing would change; "
+                         f"save the updated model to another directory")
+    learner = OnlineLearner.from_artifacts(directory, key, **kwargs)
+    for chunk in iter_chunks(path, chunksize):
+        learner.update(chunk)
+    learner.save(output, key)
+    return learner.rows_seen
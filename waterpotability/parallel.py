@@ -0,0 +1,90 @@
+"""Train independent models concurrently in a process pool.
+
+The scaled feature matrix and target are copied once into
+``multiprocessing.shared_memory`` and every worker maps the same block, so
+only a small descriptor is pickled per task rather than the training data.
+Keras models stay in the parent process (TensorFlow does not share well
+across processes) and train while the pool works through the rest.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from .evaluation import fit_and_evaluate
+from .preprocessing import PreparedData
+from .registry import get_model
+
+# Frameworks whose models are trained in the parent process
+IN_PROCESS_FRAMEWORKS = ('keras',)
+
+
+class SharedArray:
+    """A numpy array copied into a named shared memory block."""
+
+    def __init__(self, array):
+        array = np.ascontiguousarray(array)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.spec = (self.shm.name, array.shape, array.dtype.str)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf)[...] = array
+
+    def release(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _train_shared(key, X_spec, y_spec, train_idx, test_idx, scaler):
+    X_shm, X = _attach(X_spec)
+    y_shm, y = _attach(y_spec)
+    data = PreparedData.from_ordered(X, y, train_idx, test_idx, scaler)
+    try:
+        return fit_and_evaluate(get_model(key), data)
+    finally:
+        # Drop every view into the blocks before closing them
+        del data, X, y
+        X_shm.close()
+        y_shm.close()
+
+
+def train_parallel(data, models, n_jobs=None, callback=None):
+    """Train and evaluate ``models`` on ``data`` using up to ``n_jobs`` worker processes.
+
+    Returns a dict of model key -> ``(model, metrics)`` in the order of
+    ``models``. ``callback(key, model, metrics)`` is called as each model
+    finishes.
+    """
+    n_jobs = n_jobs or os.cpu_count()
+    pooled = [key for key in models if get_model(key).framework not in IN_PROCESS_FRAMEWORKS]
+    local = [key for key in models if key not in pooled]
+
+    results = {}
+
+    def done(key, result):
+        results[key] = result
+        if callback:
+            callback(key, *result)
+
+    X_shared, y_shared = SharedArray(data.X), SharedArray(data.y)
+    try:
+        # spawn rather than fork: the parent may already hold TensorFlow threads
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(pooled)) or 1,
+                                 mp_context=get_context('spawn')) as pool:
+            futures = {key: pool.submit(_train_shared, key, X_shared.spec, y_shared.spec,
+                                        data.train_idx, data.test_idx, data.scaler)
+                       for key in pooled}
+            for key in local:
+                done(key, fit_and_evaluate(get_model(key), data))
+            for key, future in futures.items():
+                done(key, future.result())
+    finally:
+        X_shared.release()
+        y_shared.release()
+    return {key: results[key] for key in models}
@@ -0,0 +1,193 @@
+"""Saving and loading trained artifacts for scoring.
+
+An artifacts directory is a versioned bundle holding everything needed to
+score new samples:
+
+    manifest.json           format version, feature order, library versions
+                            and one entry per saved model
+    imputer.json            ClassMedianImputer medians
+    scaler.json             MinMaxScaler min_ and scale_
+    models/<key>.joblib     sklearn and xgboost estimators
+    models/<key>.keras      Keras models
+    models/<key>.arrays/    one .npy file per array of a compiled model
+
+Tree models (Random Forest, Decision Tree, XGBoost) are saved twice: the
+fitted estimator, and its ``trees.CompiledForest`` arrays. The hybrid is
+saved only as its compiled arrays (``distill.CompiledHybrid``). Compiled
+arrays are memory-mapped on load, so opening a bundle reads only the small
+JSON files, and scoring them needs neither scikit-learn, xgboost nor
+TensorFlow. The preprocessing is loaded as plain NumPy arrays
+(``preprocessing.MinMaxTransform``), and each framework is only imported
+when a model that needs it is requested.
+"""
+
+import datetime
+import json
+import os
+import shutil
+import sys
+from importlib import metadata
+
+import numpy as np
+
+from .data import INPUT_COLS
+from .imputation import ClassMedianImputer
+from .preprocessing import MinMaxTransform
+
+MANIFEST = 'manifest.json'
+
+FORMAT_VERSION = 2
+
+# Packages whose versions are recorded for each framework
+_DISTRIBUTIONS = {
+    'sklearn': ('scikit-learn',),
+    'xgboost': ('xgboost', 'scikit-learn'),
+    'keras': ('tensorflow', 'tensorflow-cpu', 'keras'),
+}
+
+
+def _model_entry(model):
+    from .models import HybridModel, KerasBinaryClassifier
+
+    if isinstance(model, HybridModel):
+        return {'format': 'hybrid', 'file': '.arrays'}
+    if isinstance(model, KerasBinaryClassifier):
+        return {'format': 'keras', 'file': '.keras', 'timesteps': model.timesteps}
+    entry = {'format': 'joblib', 'file': '.joblib'}
+    if hasattr(model, 'get_booster') or hasattr(model, 'tree_') or hasattr(model, 'estimators_'):
+        entry['compiled'] = '.arrays'
+    return entry
+
+
+def library_versions(frameworks):
+    """Versions of Python, NumPy and the packages behind ``frameworks``, read without importing them."""
+    versions = {'python': sys.version.split()[0], 'numpy': np.__version__}
+    for framework in sorted(frameworks):
+        for distribution in _DISTRIBUTIONS.get(framework, (framework,)):
+            try:
+                versions[distribution] = metadata.version(distribution)
+            except metadata.PackageNotFoundError:
+                pass
+    return versions
+
+
+def save_arrays(path, arrays):
+    """Save a dict of arrays as one ``.npy`` file per array in the directory ``path``."""
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, name + '.npy'), array)
+
+
+def load_arrays(path):
+    """Memory-map the arrays written by ``save_arrays``."""
+    return {name[:-len('.npy')]: np.load(os.path.join(path, name), mmap_mode='r')
+            for name in os.listdir(path) if name.endswith('.npy')}
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    version = manifest.get('format_version', 1)
+    if version != FORMAT_VERSION:
+        raise ValueError(f'{directory} holds format version {version}, expected {FORMAT_VERSION}; '
+                         f'save the models again with train --save')
+    if manifest['input_cols'] != INPUT_COLS:
+        raise ValueError(f"{directory} was saved for features {manifest['input_cols']}, expected {INPUT_COLS}")
+    return manifest
+
+
+def save_artifacts(directory, imputer, scaler, models):
+    """Save the imputer, scaler and ``models`` (a dict of key -> fitted model) to ``directory``.
+
+    Models already saved in ``directory`` under other keys are kept.
+    """
+    from .registry import get_model
+
+    os.makedirs(os.path.join(directory, 'models'), exist_ok=True)
+    imputer.save(os.path.join(directory, 'imputer.json'))
+    with open(os.path.join(directory, 'scaler.json'), 'w') as f:
+        json.dump(MinMaxTransform.from_scaler(scaler).to_dict(), f)
+
+    try:
+        entries = read_manifest(directory)['models']
+    except (FileNotFoundError, ValueError):
+        entries = {}
+    for key, model in models.items():
+        entry = _model_entry(model)
+        try:
+            spec = get_model(key)
+            entry.update(name=spec.name, framework=spec.framework)
+        except KeyError:
+            pass
+        for field in ('file', 'compiled'):
+            if field in entry:
+                entry[field] = os.path.join('models', key + entry[field])
+        path = os.path.join(directory, entry['file'])
+        if entry['format'] == 'hybrid':
+            from .distill import CompiledHybrid
+            save_arrays(path, CompiledHybrid.from_model(model).to_arrays())
+        elif entry['format'] == 'keras':
+            model.model.save(path)
+        else:
+            import joblib
+            joblib.dump(model, path)
+        if 'compiled' in entry:
+            from .trees import compile_model
+            save_arrays(os.path.join(directory, entry['compiled']), compile_model(model).to_arrays())
+        entries[key] = entry
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'input_cols': INPUT_COLS,
+        'versions': library_versions({entry.get('framework', 'sklearn') for entry in entries.values()}),
+        'models': entries,
+    }
+    with open(os.path.join(directory, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def saved_models(directory):
+    return list(read_manifest(directory)['models'])
+
+
+def load_model(directory, key, compiled=False, mmap=True):
+    """Load the saved model ``key``.
+
+    With ``compiled=True``, tree models are returned as their memory-mapped
+    ``CompiledForest`` rather than the fitted estimator; other models are
+    unaffected. ``mmap=False`` loads joblib models into writable memory, for
+    models that will be updated in place.
+    """
+    models = read_manifest(directory)['models']
+    if key not in models:
+        raise KeyError(f"no saved model {key!r} in {directory}; saved: {', '.join(models)}")
+    entry = models[key]
+    path = os.path.join(directory, entry['file'])
+    if compiled and 'compiled' in entry:
+        from .trees import CompiledForest
+        return CompiledForest.from_arrays(load_arrays(os.path.join(directory, entry['compiled'])))
+    if entry['format'] == 'hybrid':
+        from .distill import CompiledHybrid
+        return CompiledHybrid.from_arrays(load_arrays(path))
+    if entry['format'] == 'keras':
+        from tensorflow import keras
+        from .models import KerasBinaryClassifier
+        return KerasBinaryClassifier(keras.models.load_model(path), timesteps=entry['timesteps'])
+    import joblib
+    return joblib.load(path, mmap_mode='r' if mmap else None)
+
+
+def load_preprocessing(directory):
+    """Return the saved ``(imputer, scaler)``."""
+    imputer = ClassMedianImputer.load(os.path.join(directory, 'imputer.json'))
+    with open(os.path.join(directory, 'scaler.json')) as f:
+        scaler = MinMaxTransform.from_dict(json.load(f))
+    return imputer, scaler
+
+
+def load_artifacts(directory, key, compiled=False, mmap=True):
+    """Return ``(imputer, scaler, model)`` for the saved model ``key``."""
+    return (*load_preprocessing(directory), load_model(directory, key, compiled, mmap))
@@ -0,0 +1,147 @@
+"""End-to-end pipeline: load -> impute -> scale -> train -> evaluate."""
+
+import os
+
+import pandas as pd
+
+from .data import DEFAULT_DATASET_PATH, load_dataset
+from .checkpoint import checkpoint_source, load_checkpoint, save_checkpoint
+from .evaluation import fit_and_evaluate, print_metrics
+from .imputation import ClassMedianImputer
+from .preprocessing import prepare
+from .registry import get_model, model_keys
+
+
+def explore(dataset, plot=False):
+    """Print the data exploration summaries and optionally draw the EDA plots.
+
+    The statistics are computed in one pass (see ``eda``) and shared by the
+    tables and plots; they are returned.
+    """
+    from .eda import compute_stats
+
+    stats = compute_stats(dataset)
+    print(stats.value_counts())
+    print(stats.missing_counts())
+    if plot:
+        from . import plotting
+        plotting.plot_correlation_with_potability(stats)
+        plotting.plot_correlation_heatmap(stats)
+        plotting.plot_boxplots(stats)
+    return stats
+
+
+def impute(dataset, checkpoint=None, imputer_method='exact', source=None):
+    """Fit the imputer and fill ``dataset``; returns the imputed frame and imputer.
+
+    With a ``checkpoint`` path the result is also saved there in a binary
+    format (see ``checkpoint.save_frame``), recording ``source``
+    (``checkpoint.checkpoint_source``). ``imputer_method='sketch'``
+    estimates the medians with quantile sketches, which can later be
+    updated with new samples (see ``online``).
+    """
+    imputer = ClassMedianImputer(method=imputer_method).fit(dataset)
+    dataset = imputer.transform(dataset)
+    if checkpoint:
+        save_checkpoint(dataset, imputer, checkpoint, source)
+    return dataset, imputer
+
+
+def preprocess(dataset, checkpoint=None, imputer_method='exact', source=None):
+    """Impute ``dataset``, then scale and split it once for all models.
+
+    Returns the shared ``PreparedData`` and the fitted imputer.
+    """
+    dataset, imputer = impute(dataset, checkpoint, imputer_method, source)
+    return prepare(dataset), imputer
+
+
+def train_and_evaluate(data, models=None, plot=False, n_jobs=1):
+    """Run the registered models named in ``models`` (all by default) on ``data``.
+
+    With ``n_jobs`` other than 1, independent models are trained in a pool
+    of that many processes (``None`` for one per CPU).
+
+    Returns a dict of model key -> ``(model, metrics)``.
+    """
+    models = models or model_keys()
+    if n_jobs != 1:
+        from .parallel import train_parallel
+
+        results = train_parallel(data, models, n_jobs)
+    else:
+        results = {key: fit_and_evaluate(get_model(key), data) for key in models}
+
+    for key, (_, metrics) in results.items():
+        name = get_model(key).name
+        print_metrics(name, metrics)
+        if plot:
+            from .plotting import plot_confusion_matrix
+            plot_confusion_matrix(metrics['confusion_matrix'], f'Confusion Matrix for {name}')
+    return results
+
+
+def compare(results, plot=False):
+    """Print (and optionally chart) the metrics of every model in ``results``."""
+    names = [get_model(key).name for key in results]
+    metrics = [m for _, m in results.values()]
+    summary = pd.DataFrame(
+        [{k: v for k, v in m.items() if k != 'confusion_matrix'} for m in metrics], index=names)
+    print(summary.to_string())
+    if plot:
+        from . import plotting
+        plotting.plot_accuracy_comparison(names, summary['train_accuracy'], summary['test_accuracy'])
+        plotting.plot_score_comparison(names, summary['precision'], summary['recall'], summary['f1'])
+    return summary
+
+
+def export_keras_models(results, data, directory, fmt='numpy'):
+    """Export the Keras models among ``results`` to ``directory``, calibrated on the training rows."""
+    from .export import export_model
+
+    os.makedirs(directory, exist_ok=True)
+    for key in ('ann', 'hybrid', 'lstm_mlp'):
+        if key in results:
+            extension = '.tflite' if fmt.startswith('tflite') and key != 'hybrid' else '.npz'
+            path = os.path.join(directory, key + extension)
+            export_model(results[key][0], path, fmt, calibration=data.X_train)
+            print(f'{get_model(key).name} exported to {path}')
+
+
+def run(path=DEFAULT_DATASET_PATH, models=None, plot=False, checkpoint=None, n_jobs=1, export_hybrid=None,
+        save=None, imputer_method='exact', export_dir=None, export_format='numpy'):
+    """Run the full pipeline on the CSV at ``path``.
+
+    If ``checkpoint`` names an existing checkpoint made from the same CSV and
+    ``imputer_method``, loading, exploration and imputation are skipped and
+    the imputed frame is read from it; otherwise the imputed frame is
+    written there. With ``export_hybrid`` the trained
+    hybrid model is saved there as a NumPy inference artifact. With ``save``
+    the imputer, scaler and trained models are saved to that directory for
+    scoring. ``imputer_method`` is passed to ``impute``. With ``export_dir``
+    the trained Keras models (ANN, hybrid, LSTM + MLP) are exported there in
+    ``export_format`` (see ``export``).
+    """
+    source = checkpoint_source(path, imputer_method)
+    restored = load_checkpoint(checkpoint, source) if checkpoint else None
+    if restored is None:
+        if checkpoint and os.path.exists(checkpoint):
+            print(f'{checkpoint} was made from other data or with another imputer; rebuilding it')
+        dataset = load_dataset(path)
+        explore(dataset, plot=plot)
+        data, imputer = preprocess(dataset, checkpoint, imputer_method, source)
+    else:
+        dataset, imputer = restored
+        data = prepare(dataset)
+    results = train_and_evaluate(data, models=models, plot=plot, n_jobs=n_jobs)
+    if export_hybrid and 'hybrid' in results:
+        from .distill import export_hybrid as export
+
+        export(results['hybrid'][0], export_hybrid)
+    if export_dir:
+        export_keras_models(results, data, export_dir, export_format)
+    if save:
+        from .persistence import save_artifacts
+
+        save_artifacts(save, imputer, data.scaler, {key: model for key, (model, _) in results.items()})
+    return compare(results, plot=plot)
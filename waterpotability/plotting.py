@@ -0,0 +1,133 @@
+"""Optional plots. matplotlib and seaborn are imported on first use."""
+
+import numpy as np
+
+from .data import TARGET
+
+
+def _pyplot():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    sns.set(style='darkgrid')
+    return plt, sns
+
+
+def _finish(plt, path):
+    # Save to ``path`` when given, otherwise show
+    if path:
+        plt.savefig(path, dpi=120)
+        plt.close()
+    else:
+        plt.show()
+
+
+def _stats(data):
+    # The EDA plots take ``eda.EDAStats`` or a DataFrame to compute them from
+    from .eda import EDAStats, compute_stats
+
+    return data if isinstance(data, EDAStats) else compute_stats(data)
+
+
+def plot_correlation_with_potability(data, path=None):
+    plt, _ = _pyplot()
+    correlation_with_potability = _stats(data).correlation()[TARGET].sort_values(ascending=False)
+    plt.figure(figsize=(10, 6))
+    correlation_with_potability.drop(TARGET).plot(kind='bar', color='red')
+    plt.title('Correlation of Features with Potability')
+    plt.xlabel('Features')
+    plt.ylabel('Correlation Coefficient')
+    plt.xticks(rotation=45, ha='right')
+    _finish(plt, path)
+
+
+def plot_correlation_heatmap(data, path=None):
+    plt, sns = _pyplot()
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(_stats(data).correlation(), annot=True, linewidths=0.5)
+    plt.title('Correlation Between Various Attributes', fontsize=18)
+    _finish(plt, path)
+
+
+def plot_boxplots(data, path=None):
+    # Individual boxplots for each feature to show outliers more clearly,
+    # drawn from the quartiles; the fliers are the extremes beyond the whiskers
+    plt, _ = _pyplot()
+
+    plt.figure(figsize=(20, 20))
+    for i, box in enumerate(_stats(data).boxplot_stats(), 1):
+        ax = plt.subplot(4, 3, i)
+        ax.bxp([box], showfliers=True)
+        ax.set_title(f"Boxplot of {box['label']}")
+        ax.set_ylabel('Value')
+    plt.tight_layout()
+    _finish(plt, path)
+
+
+def plot_confusion_matrix(cm, title):
+    plt, sns = _pyplot()
+    plt.figure(figsize=(8, 6))
+    sns.heatmap(cm, annot=True, cmap='Blues', fmt='g')
+    plt.title(title)
+    plt.xlabel('Predicted Label')
+    plt.ylabel('True Label')
+    plt.show()
+
+
+def plot_accuracy_comparison(models, train_accuracies, test_accuracies, path=None):
+    # Bar chart of training and testing accuracies for each model
+    plt, _ = _pyplot()
+    plt.figure(figsize=(14, 8))
+    bar_width = 0.35
+    x = range(len(models))
+
+    plt.bar(x, train_accuracies, width=bar_width, color='blue', alpha=0.6, label='Training Accuracy')
+    plt.bar([p + bar_width for p in x], test_accuracies, width=bar_width, color='orange', alpha=0.6,
+            label='Test Accuracy')
+
+    plt.xlabel('Models', fontsize=14)
+    plt.ylabel('Accuracy', fontsize=14)
+    plt.title('Training and Testing Accuracy of Different Models', fontsize=16, weight='bold')
+    plt.xticks([p + bar_width / 2 for p in x], models, rotation=45, ha='right')
+    plt.legend()
+    plt.tight_layout()
+    _finish(plt, path)
+
+
+def plot_score_comparison(models, precisions, recalls, f1_scores, path=None):
+    # Precision, Recall and F1 Scores for each model
+    plt, _ = _pyplot()
+    bar_width = 0.2
+    index = np.arange(len(models))
+
+    plt.figure(figsize=(15, 6))
+    plt.bar(index - bar_width, precisions, bar_width, label='Precision', color='green')
+    plt.bar(index, recalls, bar_width, label='Recall', color='orange')
+    plt.bar(index + bar_width, f1_scores, bar_width, label='F1-Score', color='red')
+
+    plt.xticks(index, models, rotation=45, ha='right')
+    plt.ylabel('Scores')
+    plt.title('Precision, Recall, and F1-Scores of Different Models')
+    plt.legend()
+    plt.tight_layout()
+    _finish(plt, path)
+
+
+def plot_cost_comparison(models, results, path=None):
+    # Fit time, latency, throughput and memory for each model, from a benchmark results table
+    plt, _ = _pyplot()
+    panels = [
+        ('fit_time', 'Fit time (s)', 'steelblue'),
+        ('latency_p50_ms', 'Predict latency, 1 row, p50 (ms)', 'purple'),
+        ('throughput_rows_per_s', 'Throughput (rows/s)', 'seagreen'),
+        ('peak_rss_mb', 'Peak RSS (MiB)', 'gray'),
+    ]
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+    for ax, (column, title, color) in zip(axes.ravel(), panels):
+        ax.bar(models, results[column], color=color)
+        ax.set_title(title)
+        ax.tick_params(axis='x', rotation=45)
+        if column in ('fit_time', 'throughput_rows_per_s'):
+            ax.set_yscale('log')
+    fig.suptitle('Cost of Different Models', fontsize=16, weight='bold')
+    plt.tight_layout()
+    _finish(plt, path)
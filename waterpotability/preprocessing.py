@@ -0,0 +1,153 @@
+"""Data pre-processing: missing value imputation, scaling and splitting."""
+
+import numpy as np
+
+from .data import INPUT_COLS, TARGET
+from .imputation import ClassMedianImputer
+
+
+def impute_missing(dataset, imputer=None):
+    """Fill nulls in ``ph``, ``Sulfate`` and ``Trihalomethanes``.
+
+    Since the features are skewed and have outliers, the missing values are
+    filled with the median of the column for potable and non-potable water
+    separately. A ``ClassMedianImputer`` is fitted on ``dataset`` unless a
+    fitted one is given. Returns a new DataFrame.
+    """
+    if imputer is None:
+        imputer = ClassMedianImputer().fit(dataset)
+    return imputer.transform(dataset)
+
+
+def scale_features(dataset, scaler=None):
+    """Min/Max scale ``INPUT_COLS`` of ``dataset``.
+
+    A new ``MinMaxScaler`` is fitted unless ``scaler`` is given. Returns the
+    scaled copy of the frame and the scaler.
+    """
+    from sklearn.preprocessing import MinMaxScaler
+
+    if scaler is None:
+        scaler = MinMaxScaler()
+        scaler.fit(dataset[INPUT_COLS])
+    dataset = dataset.copy()
+    dataset[INPUT_COLS] = scaler.transform(dataset[INPUT_COLS])
+    return dataset, scaler
+
+
+class MinMaxTransform:
+    """The ``X * scale_ + min_`` transform of a fitted ``MinMaxScaler``, without scikit-learn.
+
+    Applied in the input precision (float32 stays float32) with the same
+    operation order as the scaler, so the results are identical. The data
+    min/max are kept for ``partial_fit``: they cannot be recovered from
+    ``scale_`` for a column that had zero range.
+    """
+
+    def __init__(self, min_, scale_, data_min=None, data_max=None):
+        self.min_ = np.asarray(min_, dtype=np.float64)
+        self.scale_ = np.asarray(scale_, dtype=np.float64)
+        if data_min is None:
+            # Transforms saved before the data min/max were stored
+            data_min = -self.min_ / self.scale_
+            data_max = data_min + 1 / self.scale_
+        self.data_min_ = np.asarray(data_min, dtype=np.float64)
+        self.data_max_ = np.asarray(data_max, dtype=np.float64)
+
+    @classmethod
+    def from_scaler(cls, scaler):
+        return cls(scaler.min_, scaler.scale_, scaler.data_min_, scaler.data_max_)
+
+    def transform(self, X):
+        X = np.asarray(X)
+        X = np.array(X, dtype=X.dtype if X.dtype in (np.float32, np.float64) else np.float64)
+        X *= self.scale_
+        X += self.min_
+        return X
+
+    def partial_fit(self, X):
+        """Widen the fitted min/max to cover the rows of ``X`` (nulls ignored), like ``MinMaxScaler``."""
+        X = np.asarray(X, dtype=np.float64)
+        self.data_min_ = np.fmin(self.data_min_, np.nanmin(X, axis=0))
+        self.data_max_ = np.fmax(self.data_max_, np.nanmax(X, axis=0))
+        data_range = self.data_max_ - self.data_min_
+        self.scale_ = 1 / np.where(data_range == 0, 1, data_range)
+        self.min_ = -self.data_min_ * self.scale_
+        return self
+
+    def to_dict(self):
+        return {'min': self.min_.tolist(), 'scale': self.scale_.tolist(), 'data_min': self.data_min_.tolist(),
+                'data_max': self.data_max_.tolist()}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['min'], state['scale'], state.get('data_min'), state.get('data_max'))
+
+
+class PreparedData:
+    """Scaled float32 features, target and the train/test split shared by every model.
+
+    ``X`` is stored with the training rows first, so ``X_train`` and
+    ``X_test`` are views rather than copies. ``train_idx``/``test_idx`` are
+    the original row positions of each part.
+    """
+
+    def __init__(self, X, y, train_idx, test_idx, scaler):
+        self.order = np.concatenate([train_idx, test_idx])
+        self.X = X[self.order]
+        self.y = y[self.order]
+        self.train_idx = train_idx
+        self.test_idx = test_idx
+        self.scaler = scaler
+        self.n_train = len(train_idx)
+
+    @classmethod
+    def from_ordered(cls, X, y, train_idx, test_idx, scaler):
+        """Wrap ``X``/``y`` that are already stored training rows first, without copying."""
+        data = cls.__new__(cls)
+        data.order = np.concatenate([train_idx, test_idx])
+        data.X = X
+        data.y = y
+        data.train_idx = train_idx
+        data.test_idx = test_idx
+        data.scaler = scaler
+        data.n_train = len(train_idx)
+        return data
+
+    @property
+    def X_train(self):
+        return self.X[:self.n_train]
+
+    @property
+    def X_test(self):
+        return self.X[self.n_train:]
+
+    @property
+    def y_train(self):
+        return self.y[:self.n_train]
+
+    @property
+    def y_test(self):
+        return self.y[self.n_train:]
+
+    def original(self):
+        """Copies of ``(X, y)`` in the row order of the input frame."""
+        inverse = np.argsort(self.order)
+        return self.X[inverse], self.y[inverse]
+
+    def split(self):
+        """``(X_train, X_test, y_train, y_test)``, as returned by ``train_test_split``."""
+        return self.X_train, self.X_test, self.y_train, self.y_test
+
+
+def prepare(dataset, test_size=0.25, random_state=1):
+    """Scale ``INPUT_COLS`` once and draw the train/test split used by all models."""
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import MinMaxScaler
+
+    scaler = MinMaxScaler()
+    X = scaler.fit_transform(dataset[INPUT_COLS].to_numpy(np.float32)).astype(np.float32, copy=False)
+    y = dataset[TARGET].to_numpy()
+
+    train_idx, test_idx = train_test_split(np.arange(len(y)), test_size=test_size, random_state=random_state)
+    return PreparedData(X, y, train_idx, test_idx, scaler)
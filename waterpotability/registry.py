@@ -0,0 +1,49 @@
+"""Registry of the models compared by the pipeline.
+
+Each model is one ``ModelSpec`` registered with ``@register``. Its
+``train`` function takes the shared ``PreparedData`` and returns the fitted
+model and the ``(X_train, X_test, y_train, y_test)`` split it used; the
+fitted model only needs a ``predict`` method. ``framework`` names the
+library the model depends on, so callers can decide what to import or
+parallelise without importing it.
+"""
+
+MODELS = {}
+
+
+class ModelSpec:
+
+    def __init__(self, key, name, train, framework):
+        self.key = key
+        self.name = name
+        self.train = train
+        self.framework = framework
+
+    def __repr__(self):
+        return f'ModelSpec({self.key!r}, {self.name!r}, framework={self.framework!r})'
+
+
+def register(key, name, framework='sklearn'):
+    """Decorator adding a ``train`` function to ``MODELS`` under ``key``."""
+    def decorator(train):
+        if key in MODELS:
+            raise ValueError(f'model {key!r} is already registered')
+        MODELS[key] = ModelSpec(key, name, train, framework)
+        return train
+    return decorator
+
+
+def get_model(key):
+    # Model sections register themselves on import
+    from . import models  # noqa: F401
+
+    try:
+        return MODELS[key]
+    except KeyError:
+        raise KeyError(f"unknown model {key!r}; choose from {', '.join(MODELS)}") from None
+
+
+def model_keys():
+    from . import models  # noqa: F401
+
+    return list(MODELS)
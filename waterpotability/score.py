@@ -0,0 +1,103 @@
+"""Batch scoring of large sample files with saved artifacts.
+
+The input (CSV or Parquet with the nine ``INPUT_COLS``) is streamed in
+blocks through the saved imputer, scaler and model, and predictions are
+appended to the output (CSV or Parquet) block by block, so memory use
+depends on the block size and not on the file size. With several jobs a
+CSV input is split into line-aligned byte ranges, each scored by its own
+process into a part file; the parts are then concatenated in order.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from .data import DEFAULT_CHUNKSIZE, INPUT_COLS, csv_byte_ranges, iter_chunks, open_writer
+from .persistence import load_artifacts
+
+
+def _scores(prediction, probability=None):
+    frame = {'prediction': np.asarray(prediction, dtype=np.int8)}
+    if probability is not None:
+        frame['probability'] = np.asarray(probability, dtype=np.float32)
+    return pd.DataFrame(frame)
+
+
+def score_chunks(chunks, imputer, scaler, model):
+    """Yield a frame of ``prediction`` (and ``probability`` of potable water) per block."""
+    for chunk in chunks:
+        if chunk.empty:
+            # e.g. a byte range holding only blank lines
+            continue
+        X = scaler.transform(imputer.transform(chunk)[INPUT_COLS].to_numpy()).astype(np.float32, copy=False)
+        if hasattr(model, 'predict_proba'):
+            probability = model.predict_proba(X)[:, 1]
+            yield _scores(probability > 0.5, probability)
+        else:
+            yield _scores(model.predict(X))
+
+
+def _score(input_path, output_path, artifacts, model_key, chunksize, byte_range=None, header=True):
+    imputer, scaler, model = load_artifacts(artifacts, model_key)
+    chunks = iter_chunks(input_path, chunksize, with_target=False, byte_range=byte_range)
+    writer = open_writer(output_path, header)
+    rows = 0
+    try:
+        for frame in score_chunks(chunks, imputer, scaler, model):
+            writer.write(frame)
+            rows += len(frame)
+        if not rows:
+            # No rows in this input or byte range: still write the columns,
+            # so every part (and the output) exists with the same schema
+            writer.write(_scores([], [] if hasattr(model, 'predict_proba') else None))
+    finally:
+        writer.close()
+    return rows
+
+
+def _concatenate(parts, output_path):
+    if output_path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        writer = open_writer(output_path)
+        try:
+            for part in parts:
+                for batch in pq.ParquetFile(part).iter_batches():
+                    writer.write(batch.to_pandas())
+        finally:
+            writer.close()
+        return
+    with open(output_path, 'wb') as out:
+        for part in parts:
+            with open(part, 'rb') as f:
+                shutil.copyfileobj(f, out)
+
+
+def score_file(input_path, output_path, artifacts, model_key, chunksize=DEFAULT_CHUNKSIZE, n_jobs=1):
+    """Score ``input_path`` with the saved ``model_key`` and write predictions to ``output_path``.
+
+    Returns ``(rows, seconds)``. ``n_jobs`` > 1 splits a CSV input by byte
+    ranges across that many processes.
+    """
+    start = time.perf_counter()
+    ranges = [] if n_jobs == 1 or input_path.endswith('.parquet') else csv_byte_ranges(input_path, n_jobs)
+    if len(ranges) <= 1:
+        rows = _score(input_path, output_path, artifacts, model_key, chunksize)
+        return rows, time.perf_counter() - start
+
+    ext = '.parquet' if output_path.endswith('.parquet') else '.csv'
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as tmp:
+        parts = [os.path.join(tmp, f'part{i:05d}{ext}') for i in range(len(ranges))]
+        with ProcessPoolExecutor(max_workers=len(ranges), mp_context=get_context('spawn')) as pool:
+            # Only the first CSV part carries the header
+            futures = [pool.submit(_score, input_path, part, artifacts, model_key, chunksize, byte_range, i == 0)
+                       for i, (part, byte_range) in enumerate(zip(parts, ranges))]
+            rows = sum(future.result() for future in futures)
+        _concatenate(parts, output_path)
+    return rows, time.perf_counter() - start
@@ -0,0 +1,258 @@
+"""Low-latency HTTP prediction service with micro-batching.
+
+A small asyncio HTTP/1.1 server (standard library only) that loads the
+saved imputer, scaler and model once at startup. Concurrent requests are
+queued and gathered into micro-batches: the first request of a batch waits
+at most ``batch_window`` seconds for others to join (up to ``max_batch``
+samples), then the whole batch goes through a single ``predict_proba`` call
+(``predict`` for models without probabilities, such as the SVMs).
+
+Endpoints:
+
+    POST /predict   {"ph": 7.0, "Hardness": 204.9, ...}           one sample
+                    {"samples": [{...}, {...}]}                     several
+                    -> {"prediction": 1, "probability": 0.73} or a list;
+                       the probability is null for models without one
+    GET  /metrics   latency percentiles, throughput and batch counters
+    GET  /health    "ok"
+"""
+
+import asyncio
+import collections
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .data import INPUT_COLS
+from .persistence import load_artifacts
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_BATCH_WINDOW = 0.002
+
+# Request latencies kept for the percentiles
+LATENCY_WINDOW = 10_000
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class Predictor:
+    """Imputer, scaler and model applied to a batch of raw samples."""
+
+    def __init__(self, imputer, scaler, model):
+        self.imputer = imputer
+        self.scaler = scaler
+        self.model = model
+
+    @classmethod
+    def load(cls, artifacts, model_key, compile_trees=False):
+        predictor = cls(*load_artifacts(artifacts, model_key, compiled=compile_trees))
+        # Warm up on the loading thread: the first call pays JIT compilation
+        # (numba, Keras graph tracing), and numba's parallel runtime must be
+        # initialised outside the batching thread. The row is finite: the
+        # imputer only fills the columns that had nulls in training, and
+        # models such as the SVMs reject NaN
+        predictor.predict([[0.0] * len(INPUT_COLS)])
+        return predictor
+
+    def predict(self, samples):
+        """``(samples, 2)`` array of the predictions and probabilities of potable water.
+
+        The probability is NaN for models without ``predict_proba``, as in
+        ``score.score_chunks``.
+        """
+        frame = pd.DataFrame(samples, columns=INPUT_COLS, dtype=np.float32)
+        X = self.scaler.transform(self.imputer.transform(frame).to_numpy()).astype(np.float32, copy=False)
+        if hasattr(self.model, 'predict_proba'):
+            probability = self.model.predict_proba(X)[:, 1]
+            return np.column_stack([probability > 0.5, probability])
+        return np.column_stack([self.model.predict(X), np.full(len(X), np.nan)])
+
+
+class Metrics:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.samples = 0
+        self.batches = 0
+        self.errors = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def snapshot(self):
+        uptime = time.perf_counter() - self.started
+        latencies = np.asarray(self.latencies) * 1e3
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (None, None)
+        return {
+            'uptime_s': uptime,
+            'requests': self.requests,
+            'samples': self.samples,
+            'errors': self.errors,
+            'batches': self.batches,
+            'mean_batch_size': self.samples / self.batches if self.batches else None,
+            'throughput_samples_per_s': self.samples / uptime if uptime else None,
+            'latency_p50_ms': p50,
+            'latency_p99_ms': p99,
+        }
+
+
+class MicroBatcher:
+    """Gathers concurrently submitted samples into batches for ``predictor``."""
+
+    def __init__(self, predictor, metrics, max_batch=DEFAULT_MAX_BATCH, batch_window=DEFAULT_BATCH_WINDOW):
+        self.predictor = predictor
+        self.metrics = metrics
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.queue = asyncio.Queue()
+        # One thread for the model, so batches never run concurrently
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._executor.shutdown()
+
+    async def submit(self, samples):
+        """Queue a list of samples; resolves to their rows of ``Predictor.predict``."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((samples, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.batch_window
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            samples = [sample for batch, _ in pending for sample in batch]
+            try:
+                # Keep the event loop free to accept requests while the model runs
+                results = await loop.run_in_executor(self._executor, self.predictor.predict, samples)
+            except Exception as exc:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.metrics.batches += 1
+            start = 0
+            for batch, future in pending:
+                if not future.done():
+                    future.set_result(results[start:start + len(batch)])
+                start += len(batch)
+
+
+def _parse_samples(body):
+    payload = json.loads(body)
+    single = 'samples' not in payload
+    samples = [payload] if single else payload['samples']
+    missing = [col for col in INPUT_COLS if any(col not in sample for sample in samples)]
+    if missing:
+        raise ValueError(f"missing fields: {', '.join(missing)} (use null for unmeasured values)")
+    rows = [[np.nan if sample[col] is None else float(sample[col]) for col in INPUT_COLS] for sample in samples]
+    return rows, single
+
+
+class PredictionServer:
+
+    def __init__(self, predictor, max_batch=DEFAULT_MAX_BATCH, batch_window=DEFAULT_BATCH_WINDOW):
+        self.metrics = Metrics()
+        self.batcher = MicroBatcher(predictor, self.metrics, max_batch, batch_window)
+
+    async def _respond(self, writer, status, payload):
+        body = json.dumps(payload).encode()
+        writer.write(f'HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(body)}\r\n\r\n'.encode() + body)
+        await writer.drain()
+
+    async def _predict(self, body):
+        start = time.perf_counter()
+        rows, single = _parse_samples(body)
+        predictions = await self.batcher.submit(rows)
+        results = [{'prediction': int(prediction), 'probability': None if np.isnan(p) else float(p)}
+                   for prediction, p in predictions]
+        self.metrics.requests += 1
+        self.metrics.samples += len(rows)
+        self.metrics.latencies.append(time.perf_counter() - start)
+        return results[0] if single else results
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                if path == '/predict':
+                    if method != 'POST':
+                        await self._respond(writer, 405, {'error': 'use POST'})
+                        continue
+                    try:
+                        await self._respond(writer, 200, await self._predict(body))
+                    except (ValueError, TypeError, KeyError) as exc:
+                        self.metrics.errors += 1
+                        await self._respond(writer, 400, {'error': str(exc)})
+                    except Exception as exc:
+                        self.metrics.errors += 1
+                        await self._respond(writer, 500, {'error': str(exc)})
+                elif path == '/metrics':
+                    await self._respond(writer, 200, self.metrics.snapshot())
+                elif path == '/health':
+                    await self._respond(writer, 200, 'ok')
+                else:
+                    await self._respond(writer, 404, {'error': f'no route {path}'})
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, asyncio.CancelledError):
+            # Malformed request, client gone or server shutting down
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8000, ready=None):
+        """Serve until cancelled. ``ready`` (an ``asyncio.Event``) is set once listening."""
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        try:
+            async with server:
+                if ready is not None:
+                    ready.set()
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+
+def serve(artifacts, model_key, host='127.0.0.1', port=8000, max_batch=DEFAULT_MAX_BATCH,
+          batch_window=DEFAULT_BATCH_WINDOW, compile_trees=False):
+    predictor = Predictor.load(artifacts, model_key, compile_trees)
+    print(f'serving {model_key} on http://{host}:{port}')
+    asyncio.run(PredictionServer(predictor, max_batch, batch_window).serve(host, port))
@@ -0,0 +1,102 @@
+"""Bounded-memory quantile sketch for medians over data larger than memory.
+
+``QuantileSketch`` is a KLL-style sketch: values go into a stack of sorted
+compactors, and whenever a level exceeds its capacity half of its items are
+promoted, with doubled weight, to the level above. Memory stays below
+``3 * k`` items however many values are added, and the rank error of any
+quantile is about ``epsilon`` (a fraction of the number of values).
+Sketches of disjoint data can be merged.
+"""
+
+import math
+
+import numpy as np
+
+# Capacity decay per level, as in the KLL paper
+_DECAY = 2 / 3
+
+
+class QuantileSketch:
+
+    def __init__(self, epsilon=0.01, seed=None):
+        if not 0 < epsilon < 1:
+            raise ValueError(f'epsilon must be in (0, 1), got {epsilon}')
+        self.epsilon = epsilon
+        self.k = max(8, math.ceil(2 / epsilon))
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, h):
+        depth = len(self.levels) - 1 - h
+        return max(2, math.ceil(self.k * _DECAY ** depth))
+
+    def update(self, values):
+        """Add an array of values; NaNs are ignored."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold ``other`` (a sketch of disjoint data) into this sketch."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays on this level
+                keep = items[:len(items) % 2]
+                items = items[len(keep):]
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantile(self, q):
+        if not self.count:
+            return np.nan
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=np.int64)
+                                  for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        cum = np.cumsum(weights[order])
+        i = np.searchsorted(cum, q * cum[-1], side='left')
+        return float(items[order][min(i, len(items) - 1)])
+
+    def median(self):
+        return self.quantile(0.5)
+
+    @property
+    def size(self):
+        """Number of items retained."""
+        return sum(len(level) for level in self.levels)
+
+    def to_dict(self):
+        return {
+            'epsilon': self.epsilon,
+            'count': self.count,
+            'levels': [level.tolist() for level in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, state, seed=None):
+        sketch = cls(state['epsilon'], seed=seed)
+        sketch.count = state['count']
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in state['levels']]
+        return sketch
@@ -0,0 +1,90 @@
+"""Chunked processing for datasets that do not fit in memory.
+
+Each function consumes an iterable of blocks as yielded by
+``data.iter_chunks`` and keeps at most one block (plus small fitted
+statistics) in memory, so files can be processed in a fixed footprint.
+Passes that need statistics first (``fit_chunks``) and then apply them
+(``transform_chunks``, ``predict_chunks``) read the file twice.
+"""
+
+import numpy as np
+
+from .data import DEFAULT_CHUNKSIZE, INPUT_COLS, NULL_COLS, TARGET, iter_chunks
+from .imputation import ClassMedianImputer
+
+
+def fit_scaler_chunks(chunks, scaler=None):
+    """Fit a ``MinMaxScaler`` block by block with ``partial_fit``.
+
+    Nulls are ignored, and median imputation cannot move a column's min or
+    max, so the scaler can be fitted on the raw blocks.
+    """
+    from sklearn.preprocessing import MinMaxScaler
+
+    if scaler is None:
+        scaler = MinMaxScaler()
+    for chunk in chunks:
+        scaler.partial_fit(chunk[INPUT_COLS].to_numpy())
+    return scaler
+
+
+def fit_imputer_chunks(chunks, method='exact', epsilon=0.01):
+    """Fit a ``ClassMedianImputer`` over all blocks.
+
+    Exact medians keep the non-null values of the three imputed columns, as
+    float32, rather than the whole frame. ``method='sketch'`` estimates them
+    with quantile sketches instead, in memory independent of the row count.
+    """
+    if method == 'sketch':
+        imputer = ClassMedianImputer(NULL_COLS, method='sketch', epsilon=epsilon)
+        for chunk in chunks:
+            imputer.partial_fit(chunk)
+        return imputer
+
+    values = {(col, k): [] for col in NULL_COLS for k in (0, 1)}
+    for chunk in chunks:
+        for k in (0, 1):
+            rows = chunk[chunk[TARGET] == k]
+            for col in NULL_COLS:
+                values[col, k].append(rows[col].dropna().to_numpy(np.float32))
+
+    imputer = ClassMedianImputer(NULL_COLS)
+    imputer.class_medians_ = {col: {} for col in NULL_COLS}
+    imputer.global_medians_ = {}
+    for col in NULL_COLS:
+        per_class = {k: np.concatenate(values[col, k]) for k in (0, 1)}
+        imputer.class_medians_[col] = {k: float(np.median(v)) for k, v in per_class.items()}
+        imputer.global_medians_[col] = float(np.median(np.concatenate(list(per_class.values()))))
+    return imputer
+
+
+def fit_chunks(path, chunksize=DEFAULT_CHUNKSIZE, method='exact', epsilon=0.01):
+    """Fit the imputer and the scaler in a single pass over ``path``."""
+    from sklearn.preprocessing import MinMaxScaler
+
+    scaler = MinMaxScaler()
+
+    def tee(chunks):
+        for chunk in chunks:
+            scaler.partial_fit(chunk[INPUT_COLS].to_numpy())
+            yield chunk
+
+    imputer = fit_imputer_chunks(tee(iter_chunks(path, chunksize)), method, epsilon)
+    return imputer, scaler
+
+
+def transform_chunks(chunks, imputer, scaler):
+    """Yield ``(X, y)`` per block: imputed, scaled float32 features and the target.
+
+    ``y`` is None for blocks without a ``Potability`` column.
+    """
+    for chunk in chunks:
+        chunk = imputer.transform(chunk)
+        X = scaler.transform(chunk[INPUT_COLS].to_numpy()).astype(np.float32, copy=False)
+        yield X, chunk[TARGET].to_numpy() if TARGET in chunk else None
+
+
+def predict_chunks(model, chunks, imputer, scaler):
+    """Yield ``model`` predictions block by block."""
+    for X, _ in transform_chunks(chunks, imputer, scaler):
+        yield model.predict(X)
@@ -0,0 +1,139 @@
+"""Synthetic water samples at any scale, fitted to the real dataset.
+
+Each ``Potability`` class is modelled by a Gaussian copula: the empirical
+marginal of every feature (a quantile table), joined by the correlation of
+the features' normal scores. Sampling draws correlated normals, maps them
+to uniforms and reads each feature off its quantile table, so per-class
+marginals, class balance and the rank correlation between features follow
+the real data. Values are then blanked independently per feature with the
+class's observed missing rate, which keeps the nulls in ``ph``, ``Sulfate``
+and ``Trihalomethanes``.
+
+``write_synthetic`` writes any number of rows block by block, each block
+drawn from its own seeded generator, so the output is reproducible and
+memory use depends on the block size only.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from .data import DEFAULT_CHUNKSIZE, INPUT_COLS, TARGET, open_writer
+
+DEFAULT_QUANTILES = 1001
+
+# Smallest eigenvalue kept when repairing a pairwise correlation matrix
+_MIN_EIGENVALUE = 1e-6
+
+
+def _normal_scores(values):
+    from scipy.special import ndtri
+
+    ranks = pd.Series(values).rank().to_numpy()
+    return ndtri(ranks / (np.count_nonzero(~np.isnan(values)) + 1))
+
+
+def _nearest_correlation(corr):
+    # Pairwise-complete correlations need not be positive definite; clip the
+    # eigenvalues and rescale to a unit diagonal
+    corr = np.nan_to_num(corr)
+    values, vectors = np.linalg.eigh((corr + corr.T) / 2)
+    corr = vectors @ np.diag(np.maximum(values, _MIN_EIGENVALUE)) @ vectors.T
+    d = np.sqrt(np.diag(corr))
+    return corr / np.outer(d, d)
+
+
+class SyntheticGenerator:
+    """Per-class Gaussian copula over ``INPUT_COLS`` with missing values.
+
+    Fitted attributes, per class: ``class_prior_``, ``quantiles_`` (an
+    ``(n_quantiles, 9)`` table of each feature's observed values),
+    ``correlation_`` (9x9, of the normal scores) and ``missing_rate_``.
+    """
+
+    def __init__(self, n_quantiles=DEFAULT_QUANTILES):
+        self.n_quantiles = n_quantiles
+        self.class_prior_ = None
+        self.quantiles_ = None
+        self.correlation_ = None
+        self.missing_rate_ = None
+
+    def fit(self, dataset):
+        probs = np.linspace(0, 1, self.n_quantiles)
+        prior = dataset[TARGET].value_counts(normalize=True).sort_index()
+        self.class_prior_ = {int(k): float(p) for k, p in prior.items()}
+        self.quantiles_, self.correlation_, self.missing_rate_ = {}, {}, {}
+        for k in self.class_prior_:
+            X = dataset.loc[dataset[TARGET] == k, INPUT_COLS].to_numpy(np.float64)
+            self.quantiles_[k] = np.column_stack([np.quantile(col[~np.isnan(col)], probs) for col in X.T])
+            scores = pd.DataFrame(np.column_stack([_normal_scores(col) for col in X.T]))
+            self.correlation_[k] = _nearest_correlation(scores.corr().to_numpy())
+            self.missing_rate_[k] = np.isnan(X).mean(axis=0)
+        return self
+
+    def sample(self, n, random_state=None):
+        """Draw ``n`` labelled rows as a DataFrame of float32 ``INPUT_COLS`` and ``Potability``."""
+        from scipy.special import ndtr
+
+        if self.class_prior_ is None:
+            raise ValueError('SyntheticGenerator is not fitted yet; call fit first')
+        rng = np.random.default_rng(random_state)
+        classes = np.array(list(self.class_prior_))
+        y = rng.choice(classes, size=n, p=list(self.class_prior_.values())).astype(np.int8)
+        X = np.empty((n, len(INPUT_COLS)), dtype=np.float32)
+        probs = np.linspace(0, 1, self.n_quantiles)
+        for k in classes:
+            rows = np.flatnonzero(y == k)
+            z = rng.standard_normal((len(rows), len(INPUT_COLS))) @ np.linalg.cholesky(self.correlation_[k]).T
+            u = ndtr(z)
+            values = np.column_stack([np.interp(u[:, j], probs, self.quantiles_[k][:, j])
+                                      for j in range(len(INPUT_COLS))])
+            values[rng.random(values.shape) < self.missing_rate_[k]] = np.nan
+            X[rows] = values
+        frame = pd.DataFrame(X, columns=INPUT_COLS)
+        frame[TARGET] = y
+        return frame
+
+    def iter_samples(self, rows, chunksize=DEFAULT_CHUNKSIZE, seed=0):
+        """Yield ``rows`` rows in blocks of ``chunksize``; block ``i`` is drawn with seed ``(seed, i)``."""
+        for i, start in enumerate(range(0, rows, chunksize)):
+            yield self.sample(min(chunksize, rows - start), random_state=[seed, i])
+
+    def to_dict(self):
+        return {
+            'n_quantiles': self.n_quantiles,
+            'class_prior': {str(k): p for k, p in self.class_prior_.items()},
+            'quantiles': {str(k): q.tolist() for k, q in self.quantiles_.items()},
+            'correlation': {str(k): c.tolist() for k, c in self.correlation_.items()},
+            'missing_rate': {str(k): m.tolist() for k, m in self.missing_rate_.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        generator = cls(state['n_quantiles'])
+        generator.class_prior_ = {int(k): p for k, p in state['class_prior'].items()}
+        generator.quantiles_ = {int(k): np.asarray(q) for k, q in state['quantiles'].items()}
+        generator.correlation_ = {int(k): np.asarray(c) for k, c in state['correlation'].items()}
+        generator.missing_rate_ = {int(k): np.asarray(m) for k, m in state['missing_rate'].items()}
+        return generator
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def write_synthetic(generator, path, rows, chunksize=DEFAULT_CHUNKSIZE, seed=0):
+    """Write ``rows`` synthetic rows to the CSV or Parquet file at ``path``, one block at a time."""
+    writer = open_writer(path)
+    try:
+        for frame in generator.iter_samples(rows, chunksize, seed):
+            writer.write(frame)
+    finally:
+        writer.close()
+    return rows
@@ -0,0 +1,86 @@
+"""Training input for the Keras models: ``tf.data`` pipelines, larger batches and early stopping.
+
+``fit_keras`` feeds a model from a cached, shuffled and prefetched
+``tf.data.Dataset`` of float32 arrays instead of NumPy arrays, so each step
+no longer converts and slices its batch in Python. Batches are larger than
+in the original analysis (16 or 32 rows) and ``scaled_learning_rate``
+raises the learning rate with them. Training stops once the loss on a
+validation fold held out from the training rows has not improved for
+``patience`` epochs, and the weights of the best epoch are restored.
+Per-epoch wall-clock time and samples/sec are recorded in the returned
+``history``.
+"""
+
+import time
+
+import numpy as np
+
+DEFAULT_PATIENCE = 10
+DEFAULT_VALIDATION_FRACTION = 0.15
+
+
+def scaled_learning_rate(learning_rate, batch_size, base_batch_size, rule='sqrt'):
+    """``learning_rate`` tuned at ``base_batch_size``, scaled for ``batch_size``.
+
+    ``rule='linear'`` scales by the batch ratio, ``'sqrt'`` (better suited
+    to Adam) by its square root, and ``None`` keeps it.
+    """
+    ratio = batch_size / base_batch_size
+    if rule is None:
+        return learning_rate
+    if rule == 'sqrt':
+        return learning_rate * np.sqrt(ratio)
+    if rule == 'linear':
+        return learning_rate * ratio
+    raise ValueError(f"rule must be 'sqrt', 'linear' or None, got {rule!r}")
+
+
+def split_validation(X, y, fraction=DEFAULT_VALIDATION_FRACTION, random_state=1):
+    """Stratified ``(X_fit, X_val, y_fit, y_val)`` with ``fraction`` of the rows held out."""
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(X, y, test_size=fraction, stratify=y, random_state=random_state)
+
+
+def make_dataset(X, y, batch_size, shuffle=True, seed=1):
+    """Cached, optionally shuffled, batched and prefetched ``tf.data.Dataset`` of ``(X, y)`` in float32."""
+    import tensorflow as tf
+
+    dataset = tf.data.Dataset.from_tensor_slices((np.asarray(X, dtype=np.float32),
+                                                  np.asarray(y, dtype=np.float32))).cache()
+    if shuffle:
+        # After cache(), so every epoch is shuffled differently
+        dataset = dataset.shuffle(len(X), seed=seed, reshuffle_each_iteration=True)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def fit_keras(model, X_fit, y_fit, X_val, y_val, epochs, batch_size, patience=DEFAULT_PATIENCE, class_weight=None,
+              verbose=0):
+    """Train a compiled Keras ``model`` from ``tf.data`` pipelines with early stopping on ``X_val``.
+
+    Returns the ``History.history`` dict with ``epoch_time`` (seconds,
+    including validation) and ``samples_per_sec`` added per epoch.
+    """
+    from tensorflow.keras.callbacks import EarlyStopping, LambdaCallback
+
+    started = {}
+    epoch_times = []
+    timer = LambdaCallback(
+        on_epoch_begin=lambda epoch, logs: started.update(epoch=time.perf_counter()),
+        on_epoch_end=lambda epoch, logs: epoch_times.append(time.perf_counter() - started['epoch']))
+    stopping = EarlyStopping(monitor='val_loss', patience=patience, restore_best_weights=True)
+
+    history = model.fit(make_dataset(X_fit, y_fit, batch_size), epochs=epochs, verbose=verbose,
+                        validation_data=make_dataset(X_val, y_val, batch_size, shuffle=False),
+                        callbacks=[timer, stopping], class_weight=class_weight).history
+    history['epoch_time'] = epoch_times
+    history['samples_per_sec'] = [len(X_fit) / seconds for seconds in epoch_times]
+    return history
+
+
+def describe(history):
+    """One-line summary of a ``fit_keras`` history."""
+    epoch_times = history['epoch_time']
+    best = int(np.argmin(history['val_loss'])) + 1
+    return (f'{len(epoch_times)} epochs (best {best}), {np.mean(epoch_times):.3f}s/epoch, '
+            f"{np.mean(history['samples_per_sec']):,.0f} samples/sec")
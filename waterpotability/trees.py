@@ -0,0 +1,260 @@
+"""Array-backed tree ensembles for fast, dependency-free scoring.
+
+A fitted Random Forest, Decision Tree or XGBoost model is flattened into
+contiguous node arrays shared by all trees: split feature, threshold, left
+and right child (as global node indices), the default direction for missing
+values and the leaf value of each node. Scoring then needs only NumPy, and
+avoids the per-call Python overhead of sklearn and xgboost, which dominates
+with only nine features.
+
+Two backends walk the trees. The NumPy backend moves a batch of rows down
+every tree at once, one vectorized step per level; (row, tree) pairs that
+reach a leaf drop out of the active set, so deep but unbalanced trees cost
+what their typical path length costs, not their maximum depth. The Numba
+backend, used when numba is installed, compiles the walk into a loop over
+blocks of rows run in parallel, visiting one tree at a time per block so
+its nodes stay in cache.
+"""
+
+import json
+
+import numpy as np
+
+# Rows scored per step of the NumPy backend; bounds the (rows x trees) index arrays
+BATCH_ROWS = 4096
+
+# Rows per parallel block of the Numba backend
+NUMBA_BLOCK_ROWS = 256
+
+_ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'roots', 'default_left')
+
+_numba_kernel = None
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+def numba_available():
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _get_numba_kernel():
+    global _numba_kernel
+    if _numba_kernel is None:
+        from numba import njit, prange
+
+        @njit(parallel=True, cache=True)
+        def kernel(X, feature, threshold, left, right, value, roots, default_left, is_leaf, strict):
+            n = X.shape[0]
+            out = np.zeros(n)
+            # Blocks of rows in parallel; within a block, one tree at a time so
+            # its nodes stay in cache
+            for block in prange((n + NUMBA_BLOCK_ROWS - 1) // NUMBA_BLOCK_ROWS):
+                stop = min(n, (block + 1) * NUMBA_BLOCK_ROWS)
+                for root in roots:
+                    for i in range(block * NUMBA_BLOCK_ROWS, stop):
+                        node = root
+                        while not is_leaf[node]:
+                            x = X[i, feature[node]]
+                            if np.isnan(x):
+                                go_left = default_left[node]
+                            elif strict:
+                                go_left = x < threshold[node]
+                            else:
+                                go_left = x <= threshold[node]
+                            node = left[node] if go_left else right[node]
+                        out[i] += value[node]
+            return out
+
+        _numba_kernel = kernel
+    return _numba_kernel
+
+
+class CompiledForest:
+    """A tree ensemble in flat arrays.
+
+    ``aggregate='mean'`` averages per-tree positive-class probabilities
+    (sklearn forests); ``aggregate='logistic'`` sums per-tree margins with
+    ``base_margin`` and applies the sigmoid (XGBoost). ``strict`` selects
+    ``x < threshold`` (XGBoost) instead of ``x <= threshold`` (sklearn) for
+    the left branch.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, default_left,
+                 aggregate='mean', strict=False, base_margin=0.0):
+        if aggregate not in ('mean', 'logistic'):
+            raise ValueError(f"aggregate must be 'mean' or 'logistic', got {aggregate!r}")
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.default_left = default_left
+        self.aggregate = aggregate
+        self.strict = strict
+        self.base_margin = base_margin
+        self.is_leaf = left == np.arange(len(left))
+
+    @classmethod
+    def _from_trees(cls, trees, **kwargs):
+        # trees: (feature, threshold, left, right, value, default_left) per tree,
+        # with leaves marked by left == -1 and node ids local to the tree
+        columns = [[] for _ in range(6)]
+        roots, offset = [], 0
+        for feature, threshold, left, right, value, default_left in trees:
+            ids = np.arange(len(left))
+            is_leaf = left == -1
+            roots.append(offset)
+            columns[0].append(np.where(is_leaf, 0, feature))
+            columns[1].append(threshold)
+            # Leaves point to themselves
+            columns[2].append(np.where(is_leaf, ids, left) + offset)
+            columns[3].append(np.where(is_leaf, ids, right) + offset)
+            columns[4].append(value)
+            columns[5].append(default_left)
+            offset += len(left)
+        feature, threshold, left, right, value, default_left = (np.concatenate(c) for c in columns)
+        return cls(feature.astype(np.int32), threshold.astype(np.float64), left.astype(np.int32),
+                   right.astype(np.int32), value.astype(np.float64), np.asarray(roots, dtype=np.int32),
+                   default_left.astype(bool), **kwargs)
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Compile a fitted binary ``RandomForestClassifier`` or ``DecisionTreeClassifier``."""
+        trees = []
+        for estimator in getattr(forest, 'estimators_', [forest]):
+            tree = estimator.tree_
+            counts = tree.value[:, 0, :]
+            default_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count))
+            # sklearn compares float32 inputs to float64 thresholds
+            trees.append((tree.feature, tree.threshold, tree.children_left, tree.children_right,
+                          counts[:, 1] / counts.sum(axis=1), default_left))
+        return cls._from_trees(trees, aggregate='mean', strict=False)
+
+    @classmethod
+    def from_xgboost(cls, model):
+        """Compile a fitted binary ``XGBClassifier`` (or its ``Booster``).
+
+        Only the trees up to the best iteration are kept when the model was
+        trained with early stopping, matching ``predict_proba``.
+        """
+        booster = model.get_booster() if hasattr(model, 'get_booster') else model
+        config = json.loads(booster.save_config())
+        objective = config['learner']['objective']['name']
+        if objective != 'binary:logistic':
+            raise ValueError(f'only binary:logistic boosters are supported, got {objective!r}')
+        base_score = float(config['learner']['learner_model_param']['base_score'].strip('[]'))
+
+        names = booster.feature_names
+        index = {name: i for i, name in enumerate(names)} if names else None
+        dump = booster.get_dump(dump_format='json')
+        best_iteration = booster.attr('best_iteration')
+        if best_iteration is not None:
+            dump = dump[:int(best_iteration) + 1]
+
+        trees = []
+        for text in dump:
+            nodes = []
+            stack = [json.loads(text)]
+            while stack:
+                node = stack.pop()
+                nodes.append(node)
+                stack.extend(node.get('children', ()))
+            size = max(node['nodeid'] for node in nodes) + 1
+            feature = np.zeros(size, dtype=np.int64)
+            threshold = np.zeros(size, dtype=np.float32)
+            left = np.full(size, -1)
+            right = np.full(size, -1)
+            value = np.zeros(size, dtype=np.float32)
+            default_left = np.zeros(size, dtype=bool)
+            for node in nodes:
+                i = node['nodeid']
+                if 'leaf' in node:
+                    value[i] = node['leaf']
+                    continue
+                split = node['split']
+                feature[i] = index[split] if index else int(split.lstrip('f'))
+                threshold[i] = node['split_condition']
+                left[i], right[i] = node['yes'], node['no']
+                default_left[i] = node['missing'] == node['yes']
+            trees.append((feature, threshold, left, right, value, default_left))
+        return cls._from_trees(trees, aggregate='logistic', strict=True,
+                               base_margin=float(np.log(base_score / (1 - base_score))))
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def _leaves(self, X):
+        n, n_features = X.shape
+        # One entry per (row, tree) pair, indexing into the flattened X
+        nodes = np.tile(self.roots, n)
+        offsets = np.repeat(np.arange(n, dtype=np.int64) * n_features, self.n_trees)
+        X = X.ravel()
+        active = np.flatnonzero(~self.is_leaf[nodes])
+        while active.size:
+            current = nodes[active]
+            x = X[offsets[active] + self.feature[current]]
+            threshold = self.threshold[current]
+            go_left = x < threshold if self.strict else x <= threshold
+            go_left |= np.isnan(x) & self.default_left[current]
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+            active = active[~self.is_leaf[current]]
+        return nodes.reshape(n, self.n_trees)
+
+    def _leaf_sums(self, X, backend):
+        if backend == 'auto':
+            backend = 'numba' if numba_available() else 'numpy'
+        if backend == 'numba':
+            kernel = _get_numba_kernel()
+            return kernel(X, self.feature, self.threshold, self.left, self.right, self.value,
+                          self.roots, self.default_left, self.is_leaf, self.strict)
+        if backend != 'numpy':
+            raise ValueError(f"backend must be 'auto', 'numpy' or 'numba', got {backend!r}")
+        total = np.empty(len(X))
+        for start in range(0, len(X), BATCH_ROWS):
+            total[start:start + BATCH_ROWS] = self.value[self._leaves(X[start:start + BATCH_ROWS])].sum(axis=1)
+        return total
+
+    def predict_proba(self, X, backend='auto'):
+        """Class probabilities ``(n, 2)``, combined over the trees like the source model."""
+        # Both libraries compare float32 inputs
+        X = np.ascontiguousarray(X, dtype=np.float32).astype(np.float64)
+        total = self._leaf_sums(X, backend)
+        if self.aggregate == 'mean':
+            p = total / self.n_trees
+        else:
+            p = _sigmoid(total + self.base_margin)
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X, backend='auto'):
+        return (self.predict_proba(X, backend)[:, 1] > 0.5).astype(int)
+
+    def to_arrays(self, prefix=''):
+        arrays = {f'{prefix}{name}': getattr(self, name) for name in _ARRAYS}
+        arrays[f'{prefix}aggregate'] = np.asarray(self.aggregate)
+        arrays[f'{prefix}strict'] = np.asarray(self.strict)
+        arrays[f'{prefix}base_margin'] = np.asarray(self.base_margin)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix=''):
+        return cls(*(arrays[f'{prefix}{name}'] for name in _ARRAYS),
+                   aggregate=str(arrays[f'{prefix}aggregate']), strict=bool(arrays[f'{prefix}strict']),
+                   base_margin=float(arrays[f'{prefix}base_margin']))
+
+
+def compile_model(model):
+    """Compile a fitted sklearn tree/forest or XGBoost classifier into a ``CompiledForest``."""
+    if hasattr(model, 'get_booster'):
+        return CompiledForest.from_xgboost(model)
+    if hasattr(model, 'tree_') or hasattr(model, 'estimators_'):
+        return CompiledForest.from_sklearn(model)
+    raise TypeError(f'cannot compile {type(model).__name__}; expected a tree ensemble')
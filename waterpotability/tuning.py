@@ -0,0 +1,303 @@
+"""Hyperparameter search for every registered model.
+
+``SEARCH_SPACES`` gives each model key a builder, ``build(params)`` ->
+an unfitted estimator with ``fit``/``predict``, lists of candidate values,
+and whether its trials must run in the parent process (Keras). ``tune``
+samples ``n_trials`` settings per model and scores each by stratified
+k-fold cross-validation on the training rows, one fold per round:
+
+- all (trial, fold) fits of a round, for every model, go to one shared
+  process pool (Keras trials run in the parent meanwhile, as in
+  ``parallel``), over a single shared-memory copy of the training data;
+- each fold result is memoized on disk (see ``cache``), keyed by the data
+  hash, model, parameters and the fold's training and test rows, so an
+  interrupted search resumes where it stopped and a repeated one costs
+  nothing;
+- after each round from ``warmup`` on, a trial whose running mean score is
+  below the median of its model's surviving trials is pruned and gets no
+  further folds.
+
+The hybrid is tuned through its Random Forest stage, whose predictions
+are all its DNN sees, fitted as ``train_hybrid`` fits it: after
+``balancing.ChunkedSMOTE`` on the training rows.
+
+The results are advisory: the train functions keep their own parameters
+and searches, and ``save_best`` only records the best settings found.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from .cache import DEFAULT_CACHE_DIR, cache_key, cached_fit, data_hash
+from .evaluation import confusion, metrics_from_confusion
+from .parallel import SharedArray, _attach
+from .registry import get_model, model_keys
+
+DEFAULT_TRIALS = 20
+DEFAULT_SPLITS = 3
+DEFAULT_WARMUP = 1
+
+
+def _svm(params):
+    from sklearn.svm import SVC
+    return SVC(kernel='rbf', random_state=41, **params)
+
+
+def _svm_approx(params):
+    from .models import ApproximateKernelSVM
+    return ApproximateKernelSVM(**params)
+
+
+def _forest(params):
+    from sklearn.ensemble import RandomForestClassifier
+    return RandomForestClassifier(random_state=41, **params)
+
+
+def _smote_forest(params):
+    from imblearn.pipeline import Pipeline
+
+    from .balancing import ChunkedSMOTE
+    return Pipeline([('smote', ChunkedSMOTE()), ('rf', _forest(params))])
+
+
+def _tree(params):
+    from sklearn.tree import DecisionTreeClassifier
+    return DecisionTreeClassifier(random_state=41, **params)
+
+
+def _naive_bayes(params):
+    from sklearn.naive_bayes import GaussianNB
+    return GaussianNB(**params)
+
+
+def _xgboost(params):
+    import xgboost as xgb
+    return xgb.XGBClassifier(eval_metric='logloss', tree_method='hist', n_jobs=1, **params)
+
+
+def _qda(params):
+    from sklearn.discriminant_analysis import QuadraticDiscriminantAnalysis
+    return QuadraticDiscriminantAnalysis(**params)
+
+
+class KerasTrial:
+    """A Keras model built from trial parameters, trained with ``tfdata.fit_keras``.
+
+    ``units`` are the hidden Dense layer sizes; ``lstm`` adds a first LSTM
+    layer of that size on ``(samples, 1, features)`` input.
+    """
+
+    def __init__(self, units, learning_rate, batch_size, lstm=None, epochs=50):
+        self.units = units
+        self.learning_rate = learning_rate
+        self.batch_size = batch_size
+        self.lstm = lstm
+        self.epochs = epochs
+        self.model_ = None
+
+    def fit(self, X, y):
+        from tensorflow.keras.layers import LSTM, Dense, Input
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.optimizers import Adam
+
+        from .models import KerasBinaryClassifier
+        from .tfdata import fit_keras, split_validation
+
+        wrapper = KerasBinaryClassifier(None, timesteps=self.lstm is not None)
+        layers = [Input(shape=(1, X.shape[1]) if self.lstm else (X.shape[1],))]
+        if self.lstm:
+            layers.append(LSTM(self.lstm, activation='relu'))
+        layers += [Dense(n, activation='relu') for n in self.units] + [Dense(1, activation='sigmoid')]
+        model = Sequential(layers)
+        model.compile(optimizer=Adam(learning_rate=self.learning_rate), loss='binary_crossentropy')
+        X_fit, X_val, y_fit, y_val = split_validation(X, y)
+        fit_keras(model, wrapper._reshape(X_fit), y_fit, wrapper._reshape(X_val), y_val, epochs=self.epochs,
+                  batch_size=self.batch_size)
+        wrapper.model = model
+        self.model_ = wrapper
+        return self
+
+    def predict(self, X):
+        return self.model_.predict(X)
+
+
+def _keras(params):
+    return KerasTrial(**params)
+
+
+SEARCH_SPACES = {
+    'svm': (_svm, {'C': [0.1, 0.3, 1, 3, 10, 30], 'gamma': ['scale', 0.1, 0.3, 1, 3]}, False),
+    'svm_approx': (_svm_approx, {'kernel': ['nystroem', 'rbf_sampler'], 'n_components': [100, 300, 1000],
+                                 'alpha': [1e-5, 1e-4, 1e-3]}, False),
+    'rf': (_forest, {'n_estimators': [100, 200, 300], 'max_depth': [5, 10, 15, 20, None],
+                     'min_samples_split': [2, 3, 5, 10], 'max_features': ['sqrt', 'log2', None]}, False),
+    'dt': (_tree, {'max_depth': [3, 5, 7, 10, 15, None], 'min_samples_split': [2, 3, 5, 10, 20],
+                   'min_samples_leaf': [1, 2, 5, 10], 'criterion': ['gini', 'entropy']}, False),
+    'ann': (_keras, {'units': [(16, 8), (32, 16), (64, 32)], 'learning_rate': [3e-4, 1e-3, 3e-3],
+                     'batch_size': [64, 128, 256]}, True),
+    'nb': (_naive_bayes, {'var_smoothing': [1e-11, 1e-10, 1e-9, 1e-8, 1e-7, 1e-6, 1e-5]}, False),
+    # The hybrid's forest stage; see the module docstring
+    'hybrid': (_smote_forest, {'n_estimators': [100, 200, 300], 'max_depth': [10, 15, 20, None],
+                               'min_samples_split': [2, 3, 5], 'max_features': ['sqrt', 'log2', None]}, False),
+    'xgb': (_xgboost, {'n_estimators': [50, 100, 150, 300], 'max_depth': [3, 5, 7],
+                       'learning_rate': [0.01, 0.05, 0.1, 0.2], 'subsample': [0.8, 1.0],
+                       'colsample_bytree': [0.8, 1.0]}, False),
+    'qda': (_qda, {'reg_param': [0.0, 0.01, 0.03, 0.1, 0.3, 0.5]}, False),
+    'lstm_mlp': (_keras, {'lstm': [32, 64], 'units': [(32, 16), (16,)], 'learning_rate': [3e-4, 1e-3, 3e-3],
+                          'batch_size': [64, 128, 256]}, True),
+}
+
+
+def sample_trials(key, n_trials=DEFAULT_TRIALS, random_state=1):
+    """Up to ``n_trials`` distinct parameter settings drawn from the space of model ``key``."""
+    import warnings
+
+    from sklearn.model_selection import ParameterSampler
+
+    if key not in SEARCH_SPACES:
+        raise KeyError(f'no search space for model {key!r}')
+    with warnings.catch_warnings():
+        # A grid smaller than n_trials is simply enumerated
+        warnings.simplefilter('ignore', UserWarning)
+        return list(ParameterSampler(SEARCH_SPACES[key][1], n_trials, random_state=random_state))
+
+
+def _score(y_true, y_pred, metric):
+    return metrics_from_confusion(confusion(y_true, y_pred))[metric]
+
+
+def run_fold(key, params, X, y, train_idx, test_idx, metric):
+    """Fit model ``key`` with ``params`` on one fold; returns the score and fit seconds."""
+    start = time.perf_counter()
+    model = SEARCH_SPACES[key][0](params).fit(X[train_idx], y[train_idx])
+    fit_time = time.perf_counter() - start
+    return {'score': _score(y[test_idx], model.predict(X[test_idx]), metric), 'fit_time': fit_time}
+
+
+def _cached_fold(key, params, X, y, train_idx, test_idx, metric, digest, cache_dir):
+    computed = []
+
+    def fit():
+        computed.append(True)
+        return run_fold(key, params, X, y, train_idx, test_idx, metric)
+
+    # Keyed by the fold's rows, not its position, so folds made differently never collide
+    result = cached_fit(f'tune-{key}', cache_key([train_idx, test_idx], [digest, key, params, metric]), fit,
+                        cache_dir=cache_dir)
+    return dict(result, cached=not computed)
+
+
+def _cached_fold_shared(key, params, X_spec, y_spec, train_idx, test_idx, metric, digest, cache_dir):
+    import warnings
+    warnings.filterwarnings('ignore')
+
+    X_shm, X = _attach(X_spec)
+    y_shm, y = _attach(y_spec)
+    try:
+        return _cached_fold(key, params, X, y, train_idx, test_idx, metric, digest, cache_dir)
+    finally:
+        del X, y
+        X_shm.close()
+        y_shm.close()
+
+
+def tune(X, y, models=None, n_trials=DEFAULT_TRIALS, n_splits=DEFAULT_SPLITS, metric='accuracy', prune=True,
+         warmup=DEFAULT_WARMUP, n_jobs=None, cache_dir=DEFAULT_CACHE_DIR, random_state=1):
+    """Search the parameters of ``models`` (all by default) on the training rows ``X``/``y``.
+
+    ``metric`` is ``'accuracy'``, ``'precision'``, ``'recall'`` or ``'f1'``.
+    Returns a DataFrame with one row per trial: ``model``, ``trial``,
+    ``params``, ``folds`` evaluated, mean ``score``, ``pruned``,
+    ``fit_time`` (seconds spent fitting, excluding memoized folds) and
+    ``cached_folds``.
+    """
+    from sklearn.model_selection import StratifiedKFold
+
+    models = models or model_keys()
+    X = np.ascontiguousarray(X)
+    y = np.ascontiguousarray(y)
+    folds = list(StratifiedKFold(n_splits, shuffle=True, random_state=random_state).split(X, y))
+    digest = data_hash(X, y)
+    trials = [{'model': key, 'trial': i, 'params': params, 'scores': [], 'fit_time': 0.0, 'cached_folds': 0,
+               'pruned': False}
+              for key in models for i, params in enumerate(sample_trials(key, n_trials, random_state))]
+
+    X_shared, y_shared = SharedArray(X), SharedArray(y)
+    try:
+        # spawn rather than fork: the parent may already hold TensorFlow threads
+        with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count(), mp_context=get_context('spawn')) as pool:
+            for fold, (train_idx, test_idx) in enumerate(folds):
+                alive = [trial for trial in trials if not trial['pruned']]
+                futures = {}
+                for trial in alive:
+                    if not SEARCH_SPACES[trial['model']][2]:
+                        futures[id(trial)] = pool.submit(
+                            _cached_fold_shared, trial['model'], trial['params'], X_shared.spec,
+                            y_shared.spec, train_idx, test_idx, metric, digest, cache_dir)
+                for trial in alive:
+                    if id(trial) in futures:
+                        continue
+                    _record(trial, _cached_fold(trial['model'], trial['params'], X, y, train_idx, test_idx,
+                                                metric, digest, cache_dir))
+                for trial in alive:
+                    if id(trial) in futures:
+                        _record(trial, futures[id(trial)].result())
+                if prune and fold + 1 >= warmup and fold + 1 < len(folds):
+                    _prune(alive)
+    finally:
+        X_shared.release()
+        y_shared.release()
+
+    return pd.DataFrame([{'model': t['model'], 'trial': t['trial'], 'params': t['params'],
+                          'folds': len(t['scores']), 'score': np.mean(t['scores']), 'pruned': t['pruned'],
+                          'fit_time': t['fit_time'], 'cached_folds': t['cached_folds']} for t in trials])
+
+
+def _record(trial, result):
+    trial['scores'].append(result['score'])
+    if result['cached']:
+        trial['cached_folds'] += 1
+    else:
+        trial['fit_time'] += result['fit_time']
+
+
+def _prune(alive):
+    # Median rule, per model: drop the trials below the median running score
+    for key in {trial['model'] for trial in alive}:
+        group = [trial for trial in alive if trial['model'] == key]
+        median = np.median([np.mean(trial['scores']) for trial in group])
+        for trial in group:
+            if np.mean(trial['scores']) < median:
+                trial['pruned'] = True
+
+
+def summarize(trials):
+    """Per model: best completed trial's score and parameters, and the cost of the search."""
+    rows = []
+    for key, group in trials.groupby('model', sort=False):
+        complete = group[~group['pruned']]
+        best = complete.loc[complete['score'].idxmax()]
+        rows.append({'model': key, 'best_score': best['score'], 'best_params': best['params'],
+                     'trials': len(group), 'pruned': int(group['pruned'].sum()), 'fits': int(group['folds'].sum()),
+                     'cached_fits': int(group['cached_folds'].sum()), 'fit_time': group['fit_time'].sum()})
+    summary = pd.DataFrame(rows).set_index('model')
+    summary.index = [get_model(key).name for key in summary.index]
+    return summary
+
+
+def save_best(trials, path):
+    """Write ``{model key: best parameters}`` to ``path`` as JSON.
+
+    Nothing reads the file back; it records the settings to adopt by hand.
+    """
+    best = {}
+    for key, group in trials[~trials['pruned']].groupby('model', sort=False):
+        best[key] = group.loc[group['score'].idxmax(), 'params']
+    with open(path, 'w') as f:
+        json.dump(best, f, indent=2, default=str)